@@ -1,4 +1,5 @@
 """HelpVia API - Main application package"""
+
 __version__ = "1.0.0"
 __author__ = "David Crosby"
 __email__ = "bing@bing-bong.co.uk"
@@ -0,0 +1,117 @@
+"""Reports API"""
+
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import CurrentUser, get_current_active_user
+from app.core.config import settings
+from app.core.database import get_read_db
+from app.models.ticket import TicketPriority
+from app.models.ticket_report import UNASSIGNED
+from app.repositories.report_repository import ReportRepository, close_time_percentile
+from app.schemas.report import BacklogReport, TimeToCloseReport, VolumeReport
+
+router = APIRouter()
+
+
+def report_range(
+    since: Optional[date] = Query(
+        None, description="First day, inclusive; defaults to 30 days before until"
+    ),
+    until: Optional[date] = Query(None, description="Last day, inclusive; defaults to today (UTC)"),
+) -> tuple[date, date]:
+    until = until or datetime.utcnow().date()
+    since = since or until - timedelta(days=29)
+    if since > until:
+        raise HTTPException(status_code=400, detail="since must not be after until")
+    if (until - since).days >= settings.REPORT_MAX_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"A report covers at most {settings.REPORT_MAX_DAYS} days"
+        )
+    return since, until
+
+
+def _each_day(since: date, until: date) -> Iterator[date]:
+    for n in range((until - since).days + 1):
+        yield since + timedelta(days=n)
+
+
+def _hours(seconds: Optional[float]) -> float:
+    return round((seconds or 0) / 3600, 2)
+
+
+@router.get("/volume", response_model=VolumeReport)
+async def ticket_volume(
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    dates: Annotated[tuple[date, date], Depends(report_range)],
+    db: AsyncSession = Depends(get_read_db),
+    priority: Optional[list[TicketPriority]] = Query(
+        None, description="Repeat to count several priorities"
+    ),
+):
+    """Tickets opened and closed per day; days without activity are listed as zeros."""
+    since, until = dates
+    repo = ReportRepository(db)
+    counts = {
+        day: (opened, closed) for day, opened, closed in await repo.volume(since, until, priority)
+    }
+    days = [
+        {"day": day, "opened": counts.get(day, (0, 0))[0], "closed": counts.get(day, (0, 0))[1]}
+        for day in _each_day(since, until)
+    ]
+    return VolumeReport(since=since, until=until, refreshed_at=await repo.refreshed_at(), days=days)
+
+
+@router.get("/backlog", response_model=BacklogReport)
+async def ticket_backlog(
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    dates: Annotated[tuple[date, date], Depends(report_range)],
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Tickets opened but not yet closed at the end of each day, by priority."""
+    since, until = dates
+    repo = ReportRepository(db)
+    opening, moves = await repo.backlog(since, until)
+    moves_by_day = defaultdict(list)
+    for day, priority, opened, closed in moves:
+        moves_by_day[day].append((priority, opened - closed))
+    running = {priority.value: opening.get(priority, 0) for priority in TicketPriority}
+    days = []
+    for day in _each_day(since, until):
+        for priority, change in moves_by_day[day]:
+            running[priority.value] += change
+        days.append({"day": day, "total": sum(running.values()), "by_priority": dict(running)})
+    return BacklogReport(
+        since=since, until=until, refreshed_at=await repo.refreshed_at(), days=days
+    )
+
+
+@router.get("/time-to-close", response_model=TimeToCloseReport)
+async def time_to_close(
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    dates: Annotated[tuple[date, date], Depends(report_range)],
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Per assignee, tickets closed in the range and how long they took from creation, busiest first."""
+    since, until = dates
+    repo = ReportRepository(db)
+    assignees = [
+        {
+            "assigned_to_id": None if assigned_to_id == UNASSIGNED else assigned_to_id,
+            "closed": closed,
+            "mean_hours": _hours(close_seconds / closed),
+            "p50_hours": _hours(close_time_percentile(buckets, 0.5)),
+            "p90_hours": _hours(close_time_percentile(buckets, 0.9)),
+        }
+        for assigned_to_id, closed, close_seconds, *buckets in await repo.time_to_close(
+            since, until
+        )
+    ]
+    return TimeToCloseReport(
+        since=since, until=until, refreshed_at=await repo.refreshed_at(), assignees=assignees
+    )
@@ -1,73 +1,796 @@
 """Tickets API"""
+
+import asyncio
+import dataclasses
+import json
 import logging
 import math
+from collections.abc import AsyncIterator
 from datetime import datetime
-from typing import Annotated, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Annotated, Any, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.auth import get_current_active_user
-from app.core.database import get_db
-from app.models.ticket import Ticket, TicketStatus
-from app.models.user import User
-from app.repositories.ticket_repository import TicketRepository
-from app.schemas.ticket import TicketCreate, TicketUpdate, TicketResponse, TicketListResponse, TicketAction
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.auth import (
+    CurrentUser,
+    get_current_active_user,
+    get_current_active_user_for_write,
+    get_current_user,
+)
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.etag import is_fresh, make_etag, not_modified, parse_ticket_etag, ticket_etag
+from app.core.events import broadcaster, sse_stream
+from app.core.export import csv_lines, ndjson_lines
+from app.core.pagination import InvalidCursorError, decode_cursor
+from app.core.serialization import json_response, ticket_dict, ticket_dicts
+from app.models.ticket import EXPANDABLE_RELATIONSHIPS, Ticket, TicketPriority, TicketStatus
+from app.repositories.ticket_action_repository import TicketActionRepository
+from app.repositories.ticket_counter_repository import ASSIGNEE, STATUS, TicketCounterRepository
+from app.repositories.ticket_repository import (
+    SORTS,
+    TicketListFilter,
+    TicketRepository,
+    VersionConflict,
+)
+from app.repositories.ticket_search_repository import TicketSearchRepository
+from app.schemas.ticket import (
+    BulkMutationResponse,
+    BulkTicketResponse,
+    BulkTicketResult,
+    TicketAction,
+    TicketActionListResponse,
+    TicketActionResponse,
+    TicketBatchRequest,
+    TicketBatchResponse,
+    TicketBulkDelete,
+    TicketBulkUpdate,
+    TicketCreate,
+    TicketDetailResponse,
+    TicketListResponse,
+    TicketResponse,
+    TicketSearchHit,
+    TicketSearchResponse,
+    TicketSelection,
+    TicketStatsResponse,
+    TicketUpdate,
+)
 
 logger = logging.getLogger("helpvia")
 router = APIRouter()
 
+
 @router.post("/", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
-async def create_ticket(ticket_data: TicketCreate, current_user: Annotated[User, Depends(get_current_active_user)], db: AsyncSession = Depends(get_db)):
-    ticket = Ticket(summary=ticket_data.summary, description=ticket_data.description, status=ticket_data.status, priority=ticket_data.priority, created_by_id=current_user.id)
+async def create_ticket(
+    ticket_data: TicketCreate,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user_for_write)],
+    db: AsyncSession = Depends(get_db),
+):
+    ticket = Ticket(
+        summary=ticket_data.summary,
+        description=ticket_data.description,
+        status=ticket_data.status,
+        priority=ticket_data.priority,
+        created_by_id=current_user.id,
+    )
     return await TicketRepository(db).create(ticket)
 
-@router.get("/", response_model=TicketListResponse)
-async def get_all_tickets(current_user: Annotated[User, Depends(get_current_active_user)], db: AsyncSession = Depends(get_db), page: int = Query(1, ge=1), page_size: int = Query(20, ge=1, le=100), status: Optional[TicketStatus] = None):
+
+async def _iter_ndjson(request: Request) -> AsyncIterator[Any]:
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _parse_json_line(line)
+    if buffer.strip():
+        yield _parse_json_line(buffer)
+
+
+def _parse_json_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return ValueError("Invalid JSON")
+
+
+async def _iter_json_array(request: Request) -> AsyncIterator[Any]:
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON") from None
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON") from None
+    for record in body:
+        yield record
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()
+    )
+
+
+@router.post("/bulk", response_model=BulkTicketResponse)
+async def bulk_create_tickets(
+    request: Request,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user_for_write)],
+    db: AsyncSession = Depends(get_db),
+):
+    """Create tickets from a JSON array or a streamed NDJSON body (Content-Type: application/x-ndjson)."""
     repo = TicketRepository(db)
-    skip = (page - 1) * page_size
-    tickets = await repo.get_all(skip=skip, limit=page_size, status=status)
-    total = await repo.count_all(status=status)
-    return TicketListResponse(total=total, items=tickets, page=page, page_size=page_size, total_pages=math.ceil(total / page_size))
+    is_ndjson = "ndjson" in request.headers.get("content-type", "")
+    records = _iter_ndjson(request) if is_ndjson else _iter_json_array(request)
+    results: list[BulkTicketResult] = []
+    batch: list[tuple] = []
+
+    async def flush():
+        ids = await repo.bulk_create([row for _, row in batch])
+        results.extend(
+            BulkTicketResult(index=index, id=ticket_id) for (index, _), ticket_id in zip(batch, ids)
+        )
+        batch.clear()
+
+    index = 0
+    async for record in records:
+        if index >= settings.BULK_MAX_ROWS:
+            results.append(
+                BulkTicketResult(
+                    index=index,
+                    error=f"Row limit of {settings.BULK_MAX_ROWS} exceeded; remaining rows ignored",
+                )
+            )
+            break
+        if isinstance(record, ValueError):
+            results.append(BulkTicketResult(index=index, error=str(record)))
+        else:
+            try:
+                data = TicketCreate.model_validate(record)
+                batch.append((index, {**data.model_dump(), "created_by_id": current_user.id}))
+            except ValidationError as e:
+                results.append(BulkTicketResult(index=index, error=_validation_message(e)))
+        if len(batch) >= settings.BULK_INSERT_BATCH_SIZE:
+            await flush()
+        index += 1
+    if batch:
+        await flush()
+    results.sort(key=lambda r: r.index)
+    created = sum(1 for r in results if r.id is not None)
+    logger.info(f"Bulk created {created} tickets for {current_user.username}")
+    return BulkTicketResponse(created=created, failed=len(results) - created, results=results)
+
+
+def _selection(selection: TicketSelection) -> dict:
+    if selection.ids is not None:
+        if len(selection.ids) > settings.BULK_MUTATION_MAX_IDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {settings.BULK_MUTATION_MAX_IDS} ids per request",
+            )
+        return {"ids": selection.ids}
+    return selection.filter.model_dump(exclude_none=True)
+
+
+@router.post("/bulk-update", response_model=BulkMutationResponse)
+async def bulk_update_tickets(
+    body: TicketBulkUpdate,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user_for_write)],
+    db: AsyncSession = Depends(get_db),
+):
+    changes = body.changes.model_dump(exclude_unset=True)
+    affected = await TicketRepository(db).bulk_update(
+        changes,
+        current_user.username,
+        chunk_size=settings.BULK_MUTATION_CHUNK_SIZE,
+        **_selection(body),
+    )
+    logger.info(f"Bulk updated {affected} tickets for {current_user.username}")
+    return BulkMutationResponse(affected=affected)
+
+
+@router.post("/bulk-delete", response_model=BulkMutationResponse)
+async def bulk_delete_tickets(
+    body: TicketBulkDelete,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user_for_write)],
+    db: AsyncSession = Depends(get_db),
+):
+    affected = await TicketRepository(db).bulk_delete(
+        chunk_size=settings.BULK_MUTATION_CHUNK_SIZE, **_selection(body)
+    )
+    logger.info(f"Bulk deleted {affected} tickets for {current_user.username}")
+    return BulkMutationResponse(affected=affected)
+
+
+def _decode_cursor(cursor: Optional[str], filters: TicketListFilter = TicketListFilter()):
+    if cursor is None:
+        return None
+    try:
+        after = decode_cursor(cursor)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    if not filters.accepts_cursor(after):
+        raise HTTPException(status_code=400, detail="Cursor was issued for a different sort")
+    return after
+
+
+def list_filter(
+    status: Optional[list[TicketStatus]] = Query(
+        None, description="Repeat to match any of several statuses"
+    ),
+    priority: Optional[list[TicketPriority]] = Query(
+        None, description="Repeat to match any of several priorities"
+    ),
+    assigned_to_id: Optional[int] = None,
+    created_since: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    updated_since: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    sort: str = Query("created_at", pattern=f"^({'|'.join(SORTS)})$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+) -> TicketListFilter:
+    return TicketListFilter(
+        statuses=tuple(dict.fromkeys(status or ())),
+        priorities=tuple(dict.fromkeys(priority or ())),
+        assigned_to_id=assigned_to_id,
+        created_since=created_since,
+        created_before=created_before,
+        updated_since=updated_since,
+        updated_before=updated_before,
+        sort=sort,
+        descending=order == "desc",
+    )
+
+
+EXPAND_QUERY = Query(
+    None,
+    description=f"Comma-separated related users to embed: {', '.join(EXPANDABLE_RELATIONSHIPS)}",
+)
+ARCHIVED_QUERY = Query(
+    False, description="Also list closed tickets that have been moved to the archive"
+)
+
+
+def _parse_expand(expand: Optional[str]) -> tuple[str, ...]:
+    if not expand:
+        return ()
+    requested = tuple(sorted({part.strip() for part in expand.split(",") if part.strip()}))
+    unknown = set(requested) - set(EXPANDABLE_RELATIONSHIPS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Cannot expand: {', '.join(sorted(unknown))}")
+    return requested
+
+
+def _list_response(
+    tickets: list[Ticket],
+    total: int,
+    page: int,
+    page_size: int,
+    cursor_mode: bool,
+    etag: str,
+    expand: tuple[str, ...] = (),
+    filters: TicketListFilter = TicketListFilter(),
+):
+    # Repositories are asked for page_size + 1 rows so we know whether another page follows
+    has_more = len(tickets) > page_size
+    tickets = tickets[:page_size]
+    next_cursor = filters.cursor(tickets[-1]) if has_more else None
+    page_fields = {
+        "page": None,
+        "page_size": page_size,
+        "total_pages": None,
+        "next_cursor": next_cursor,
+    }
+    if not cursor_mode:
+        page_fields.update(page=page, total_pages=math.ceil(total / page_size))
+    if settings.FAST_LIST_SERIALIZATION:
+        return json_response(
+            {"total": total, "items": ticket_dicts(tickets, expand), **page_fields},
+            headers={"ETag": etag},
+        )
+    return TicketListResponse(total=total, items=ticket_dicts(tickets, expand), **page_fields)
+
+
+async def _list_etag(
+    request: Request, db: AsyncSession, filters: Optional[TicketListFilter] = None
+) -> str:
+    version = await TicketCounterRepository(db).collection_version()
+    # The filter carries what the query string does not, such as whose tickets /mine lists
+    return make_etag(
+        "list", request.url.path, version, sorted(request.query_params.multi_items()), filters
+    )
+
+
+async def _filtered_list(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    filters: TicketListFilter,
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    expand: Optional[str],
+    include_archived: bool = False,
+):
+    repo = TicketRepository(db)
+    after = _decode_cursor(cursor, filters)
+    relationships = _parse_expand(expand)
+    etag = await _list_etag(request, db, filters)
+    if is_fresh(request, etag):
+        return not_modified(etag)
+    tickets = await repo.find(
+        filters,
+        skip=(page - 1) * page_size,
+        limit=page_size + 1,
+        after=after,
+        expand=relationships,
+        include_archived=include_archived,
+    )
+    total = await repo.count_matching(filters, include_archived=include_archived)
+    response.headers["ETag"] = etag
+    return _list_response(
+        tickets,
+        total,
+        page,
+        page_size,
+        cursor_mode=after is not None,
+        etag=etag,
+        expand=relationships,
+        filters=filters,
+    )
+
+
+@router.get("/", response_model=TicketListResponse)
+async def get_all_tickets(
+    request: Request,
+    response: Response,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    filters: Annotated[TicketListFilter, Depends(list_filter)],
+    db: AsyncSession = Depends(get_read_db),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Opaque next_cursor from a previous page; overrides page"
+    ),
+    expand: Optional[str] = EXPAND_QUERY,
+    include_archived: bool = ARCHIVED_QUERY,
+):
+    return await _filtered_list(
+        request, response, db, filters, page, page_size, cursor, expand, include_archived
+    )
+
+
+@router.get("/mine", response_model=TicketListResponse)
+async def get_my_tickets(
+    request: Request,
+    response: Response,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    filters: Annotated[TicketListFilter, Depends(list_filter)],
+    db: AsyncSession = Depends(get_read_db),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Opaque next_cursor from a previous page; overrides page"
+    ),
+    expand: Optional[str] = EXPAND_QUERY,
+    include_archived: bool = ARCHIVED_QUERY,
+):
+    """Tickets assigned to or created by the caller, with the same filters and sorts as the full list."""
+    return await _filtered_list(
+        request,
+        response,
+        db,
+        dataclasses.replace(filters, involving_user_id=current_user.id),
+        page,
+        page_size,
+        cursor,
+        expand,
+        include_archived,
+    )
+
 
 @router.get("/open", response_model=TicketListResponse)
-async def get_open_tickets(current_user: Annotated[User, Depends(get_current_active_user)], db: AsyncSession = Depends(get_db), page: int = Query(1, ge=1), page_size: int = Query(20, ge=1, le=100)):
+async def get_open_tickets(
+    request: Request,
+    response: Response,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_read_db),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Opaque next_cursor from a previous page; overrides page"
+    ),
+    expand: Optional[str] = EXPAND_QUERY,
+):
     repo = TicketRepository(db)
+    after = _decode_cursor(cursor)
+    relationships = _parse_expand(expand)
+    etag = await _list_etag(request, db)
+    if is_fresh(request, etag):
+        return not_modified(etag)
     skip = (page - 1) * page_size
-    tickets = await repo.get_open_tickets(skip=skip, limit=page_size)
-    total = await repo.count_all(TicketStatus.OPEN) + await repo.count_all(TicketStatus.IN_PROGRESS)
-    return TicketListResponse(total=total, items=tickets, page=page, page_size=page_size, total_pages=math.ceil(total / page_size))
+    tickets = await repo.get_open_tickets(
+        skip=skip, limit=page_size + 1, after=after, expand=relationships
+    )
+    total = await repo.count_statuses([TicketStatus.OPEN, TicketStatus.IN_PROGRESS])
+    response.headers["ETag"] = etag
+    return _list_response(
+        tickets,
+        total,
+        page,
+        page_size,
+        cursor_mode=after is not None,
+        etag=etag,
+        expand=relationships,
+    )
+
+
+async def _batch_response(db: AsyncSession, ids: list[int], expand: Optional[str]):
+    if len(ids) > settings.BATCH_GET_MAX_IDS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.BATCH_GET_MAX_IDS} ids per batch"
+        )
+    relationships = _parse_expand(expand)
+    tickets = await TicketRepository(db).get_many(list(dict.fromkeys(ids)), expand=relationships)
+    items = [
+        (
+            {
+                "id": ticket_id,
+                "found": True,
+                "ticket": ticket_dict(tickets[ticket_id], relationships),
+            }
+            if ticket_id in tickets
+            else {"id": ticket_id, "found": False, "ticket": None}
+        )
+        for ticket_id in ids
+    ]
+    missing = [ticket_id for ticket_id in ids if ticket_id not in tickets]
+    payload = {"found": len(ids) - len(missing), "missing": missing, "items": items}
+    if settings.FAST_LIST_SERIALIZATION:
+        return json_response(payload)
+    return TicketBatchResponse(**payload)
+
+
+@router.get("/batch", response_model=TicketBatchResponse)
+async def get_ticket_batch(
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_read_db),
+    ids: str = Query(..., description="Comma-separated ticket ids"),
+    expand: Optional[str] = EXPAND_QUERY,
+):
+    """Up to BATCH_GET_MAX_IDS tickets (archived included) in request order; unknown ids come back with found=false."""
+    try:
+        ticket_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="ids must be comma-separated integers"
+        ) from None
+    if not ticket_ids:
+        raise HTTPException(status_code=400, detail="ids must not be empty")
+    return await _batch_response(db, ticket_ids, expand)
+
+
+@router.post("/batch", response_model=TicketBatchResponse)
+async def post_ticket_batch(
+    body: TicketBatchRequest,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_read_db),
+    expand: Optional[str] = EXPAND_QUERY,
+):
+    """Same as GET /batch, for id lists too long for a query string."""
+    return await _batch_response(db, body.ids, expand)
+
+
+@router.get("/search", response_model=TicketSearchResponse)
+async def search_tickets(
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_read_db),
+    q: str = Query(..., min_length=1, max_length=200),
+    status: Optional[TicketStatus] = None,
+    priority: Optional[TicketPriority] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+):
+    q = q.strip()
+    if not q:
+        # Whitespace would pass min_length and then reach FTS5 as an empty MATCH
+        raise HTTPException(status_code=400, detail="q needs at least one search term")
+    repo = TicketSearchRepository(db)
+    hits = await repo.search(
+        q, status=status, priority=priority, skip=(page - 1) * page_size, limit=page_size
+    )
+    total = await repo.count(q, status=status, priority=priority)
+    items = [
+        TicketSearchHit(**TicketResponse.model_validate(ticket).model_dump(), score=score)
+        for ticket, score in hits
+    ]
+    return TicketSearchResponse(
+        total=total,
+        items=items,
+        page=page,
+        page_size=page_size,
+        total_pages=math.ceil(total / page_size),
+    )
+
+
+@router.get("/stats", response_model=TicketStatsResponse)
+async def get_ticket_stats(
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_read_db),
+):
+    counters = TicketCounterRepository(db)
+    by_status = await counters.get_scope(STATUS)
+    return TicketStatsResponse(
+        total=sum(by_status.values()),
+        by_status=by_status,
+        by_assignee=await counters.get_scope(ASSIGNEE),
+        archived=await counters.archived_total(),
+    )
+
+
+@router.get("/export")
+async def export_tickets(
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    filters: Annotated[TicketListFilter, Depends(list_filter)],
+    db: AsyncSession = Depends(get_read_db),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+):
+    """Every ticket the list would show for the same filters and sort, in that order."""
+    rows = TicketRepository(db).stream_for_export(filters, batch_size=settings.EXPORT_BATCH_SIZE)
+
+    async def body():
+        try:
+            async for chunk in (csv_lines(rows) if format == "csv" else ndjson_lines(rows)):
+                yield chunk
+        finally:
+            # The stream can outlive the session dependency, so release the connection ourselves
+            await db.close()
+
+    if format == "csv":
+        return StreamingResponse(
+            body(),
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=tickets.csv"},
+        )
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.get("/events")
+async def ticket_events(
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_read_db),
+    last_event_id: Optional[int] = Query(None),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID"),
+):
+    """Server-Sent Events feed of ticket changes; reconnect with Last-Event-ID (or ?last_event_id=) to catch up."""
+    # Auth was the only query; don't hold a pooled connection for the life of the stream
+    await db.close()
+    subscription = broadcaster.subscribe(
+        last_event_id_header if last_event_id_header is not None else last_event_id
+    )
+
+    async def body():
+        try:
+            async for chunk in sse_stream(subscription, settings.EVENT_HEARTBEAT_SECONDS):
+                yield chunk
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
-@router.get("/{ticket_id}", response_model=TicketResponse)
-async def get_ticket(ticket_id: int, current_user: Annotated[User, Depends(get_current_active_user)], db: AsyncSession = Depends(get_db)):
-    ticket = await TicketRepository(db).get_by_id(ticket_id)
+@router.websocket("/events/ws")
+async def ticket_events_ws(
+    websocket: WebSocket,
+    token: str = Query(...),
+    last_event_id: Optional[int] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """WebSocket variant of /events; browsers cannot set headers here, so the bearer token is a query parameter."""
+    try:
+        current_user = await get_current_user(token, db)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    finally:
+        await db.close()
+    if not current_user.is_active:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    subscription = broadcaster.subscribe(last_event_id)
+
+    async def forward():
+        async for event in subscription.events():
+            await websocket.send_text(event.payload().decode())
+        # Dropped as a slow consumer: the client should reconnect with its last event id
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+    async def until_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(forward()), asyncio.create_task(until_disconnect())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        broadcaster.unsubscribe(subscription)
+
+
+@router.get("/{ticket_id}", response_model=TicketDetailResponse)
+async def get_ticket(
+    ticket_id: int,
+    request: Request,
+    response: Response,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_read_db),
+    include_actions: bool = False,
+    expand: Optional[str] = EXPAND_QUERY,
+):
+    relationships = _parse_expand(expand)
+    repo = TicketRepository(db)
+    # Check freshness against the version column before paying for the full row
+    located = await repo.locate(ticket_id)
+    if located is None:
+        raise HTTPException(status_code=404, detail=f"Ticket {ticket_id} not found")
+    version, archived = located
+    actions_repo = TicketActionRepository(db, archived=archived)
+    last_action_id = await actions_repo.last_id(ticket_id) if include_actions else None
+    etag = ticket_etag(ticket_id, version, include_actions, last_action_id, relationships)
+    if is_fresh(request, etag):
+        return not_modified(etag)
+    ticket = await repo.get_by_id(ticket_id, expand=relationships)
     if not ticket:
         raise HTTPException(status_code=404, detail=f"Ticket {ticket_id} not found")
-    return ticket
+    result = TicketDetailResponse(**ticket_dict(ticket, relationships))
+    if include_actions:
+        result.actions = await actions_repo.get_for_ticket(ticket_id, limit=None)
+    response.headers["ETag"] = ticket_etag(
+        ticket_id, ticket.version, include_actions, last_action_id, relationships
+    )
+    return result
+
+
+async def _not_writable(repo: TicketRepository, ticket_id: int) -> HTTPException:
+    # Only consulted after a miss on the live table, so writes to live tickets never touch the archive
+    if await repo.is_archived(ticket_id):
+        return HTTPException(
+            status_code=409, detail=f"Ticket {ticket_id} is archived and read-only"
+        )
+    return HTTPException(status_code=404, detail=f"Ticket {ticket_id} not found")
+
 
 @router.put("/{ticket_id}", response_model=TicketResponse)
-async def update_ticket(ticket_id: int, ticket_data: TicketUpdate, current_user: Annotated[User, Depends(get_current_active_user)], db: AsyncSession = Depends(get_db)):
+async def update_ticket(
+    ticket_id: int,
+    ticket_data: TicketUpdate,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user_for_write)],
+    db: AsyncSession = Depends(get_db),
+):
     repo = TicketRepository(db)
-    ticket = await repo.get_by_id(ticket_id)
+    ticket = await repo.get_by_id(ticket_id, include_archived=False)
     if not ticket:
-        raise HTTPException(status_code=404, detail=f"Ticket {ticket_id} not found")
+        raise await _not_writable(repo, ticket_id)
     update_data = ticket_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(ticket, field, value)
     if "status" in update_data:
-        ticket.add_action(f"Status changed to {update_data['status'].value}", current_user.username)
+        TicketActionRepository(db).log(
+            ticket_id, f"Status changed to {update_data['status'].value}", current_user.username
+        )
         if update_data["status"] == TicketStatus.CLOSED:
             ticket.closed_at = datetime.utcnow()
-    return await repo.update(ticket)
+    try:
+        return await repo.update(ticket)
+    except StaleDataError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409, detail=f"Ticket {ticket_id} was modified concurrently"
+        ) from None
 
-@router.post("/{ticket_id}/actions", response_model=TicketResponse)
-async def add_ticket_action(ticket_id: int, action_data: TicketAction, current_user: Annotated[User, Depends(get_current_active_user)], db: AsyncSession = Depends(get_db)):
+
+@router.patch("/{ticket_id}", response_model=TicketResponse)
+async def patch_ticket(
+    ticket_id: int,
+    ticket_data: TicketUpdate,
+    request: Request,
+    response: Response,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user_for_write)],
+    db: AsyncSession = Depends(get_db),
+):
+    """Partial update in a single UPDATE ... RETURNING; send the ticket's ETag as If-Match to guard against lost updates."""
+    expected_version = None
+    if_match = request.headers.get("if-match")
+    if if_match and if_match.strip() != "*":
+        parsed = parse_ticket_etag(if_match)
+        if parsed is None or parsed[0] != ticket_id:
+            raise HTTPException(status_code=400, detail="If-Match must be an ETag of this ticket")
+        expected_version = parsed[1]
     repo = TicketRepository(db)
-    ticket = await repo.get_by_id(ticket_id)
-    if not ticket:
+    try:
+        row = await repo.patch(
+            ticket_id,
+            ticket_data.model_dump(exclude_unset=True),
+            current_user.username,
+            expected_version=expected_version,
+        )
+    except VersionConflict:
+        raise HTTPException(
+            status_code=409, detail=f"Ticket {ticket_id} was modified by another request"
+        ) from None
+    if row is None:
+        raise await _not_writable(repo, ticket_id)
+    response.headers["ETag"] = ticket_etag(row.id, row.version)
+    return row._mapping
+
+
+@router.post(
+    "/{ticket_id}/actions", response_model=TicketActionResponse, status_code=status.HTTP_201_CREATED
+)
+async def add_ticket_action(
+    ticket_id: int,
+    action_data: TicketAction,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user_for_write)],
+    db: AsyncSession = Depends(get_db),
+):
+    repo = TicketRepository(db)
+    if not await repo.exists(ticket_id):
+        raise await _not_writable(repo, ticket_id)
+    return await TicketActionRepository(db).create(
+        ticket_id, action_data.action, current_user.username
+    )
+
+
+@router.get("/{ticket_id}/actions", response_model=TicketActionListResponse)
+async def get_ticket_actions(
+    ticket_id: int,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
+    db: AsyncSession = Depends(get_read_db),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+):
+    located = await TicketRepository(db).locate(ticket_id)
+    if located is None:
         raise HTTPException(status_code=404, detail=f"Ticket {ticket_id} not found")
-    ticket.add_action(action_data.action, current_user.username)
-    return await repo.update(ticket)
+    repo = TicketActionRepository(db, archived=located[1])
+    actions = await repo.get_for_ticket(ticket_id, skip=(page - 1) * page_size, limit=page_size)
+    total = await repo.count_for_ticket(ticket_id)
+    return TicketActionListResponse(
+        total=total,
+        items=actions,
+        page=page,
+        page_size=page_size,
+        total_pages=math.ceil(total / page_size),
+    )
+
 
 @router.delete("/{ticket_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_ticket(ticket_id: int, current_user: Annotated[User, Depends(get_current_active_user)], db: AsyncSession = Depends(get_db)):
-    if not await TicketRepository(db).delete(ticket_id):
-        raise HTTPException(status_code=404, detail=f"Ticket {ticket_id} not found")
+async def delete_ticket(
+    ticket_id: int,
+    current_user: Annotated[CurrentUser, Depends(get_current_active_user_for_write)],
+    db: AsyncSession = Depends(get_db),
+):
+    repo = TicketRepository(db)
+    if not await repo.delete(ticket_id):
+        raise await _not_writable(repo, ticket_id)
@@ -0,0 +1,165 @@
+"""Admission control: cap concurrent requests per route class and shed the excess early
+
+Each class (read, write, auth) has a concurrency limit and a bounded FIFO of waiting requests. A
+request that finds the queue full, or is still queued when the deadline passes, gets 503 with
+Retry-After straight away instead of piling up on the connection pool until the client times out.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+from pydantic_core import to_json
+
+from app.core.config import settings
+
+READ = "read"
+WRITE = "write"
+AUTH = "auth"
+QUEUE_FULL = "queue_full"
+QUEUE_TIMEOUT = "queue_timeout"
+# Probes and scrapes must answer while the API is saturated; the event feed releases its session
+# before streaming and would otherwise hold a slot for as long as the client stays connected
+EXEMPT_PATHS = frozenset({"/health", "/metrics", f"{settings.API_V1_PREFIX}/tickets/events"})
+READ_METHODS = frozenset({"GET", "HEAD"})
+AUTH_PREFIX = f"{settings.API_V1_PREFIX}/auth/"
+# POSTed only because the id list can outgrow a query string
+READ_POSTS = frozenset({f"{settings.API_V1_PREFIX}/tickets/batch"})
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionGate:
+    """Counting limiter with a bounded wait queue; a released slot goes straight to the oldest waiter."""
+
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.admitted = 0
+        self.queued = 0
+        self.queue_seconds = 0.0
+        self.rejected: dict[str, int] = {QUEUE_FULL: 0, QUEUE_TIMEOUT: 0}
+        self._active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            self.rejected[QUEUE_FULL] += 1
+            raise AdmissionRejected(QUEUE_FULL)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        start = time.perf_counter()
+        try:
+            # wait_for rather than asyncio.timeout, which needs Python 3.11; it cancels the waiter on timeout
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over as the deadline hit; pass it on rather than leak it
+                self.release()
+            else:
+                waiter.cancel()
+                # wait_for yields while cancelling, so release() may have dropped it already
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            # Not the builtin TimeoutError before Python 3.11
+            if isinstance(exc, asyncio.TimeoutError):
+                self.rejected[QUEUE_TIMEOUT] += 1
+                raise AdmissionRejected(QUEUE_TIMEOUT) from None
+            raise
+        finally:
+            self.queue_seconds += time.perf_counter() - start
+        self.admitted += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "in_use": self._active,
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "queue_seconds": self.queue_seconds,
+            "rejected_queue_full": self.rejected[QUEUE_FULL],
+            "rejected_queue_timeout": self.rejected[QUEUE_TIMEOUT],
+        }
+
+
+admission_gates: dict[str, AdmissionGate] = {
+    READ: AdmissionGate(
+        settings.ADMISSION_READ_CONCURRENCY,
+        settings.ADMISSION_READ_QUEUE_SIZE,
+        settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ),
+    WRITE: AdmissionGate(
+        settings.ADMISSION_WRITE_CONCURRENCY,
+        settings.ADMISSION_WRITE_QUEUE_SIZE,
+        settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ),
+    AUTH: AdmissionGate(
+        settings.ADMISSION_AUTH_CONCURRENCY,
+        settings.ADMISSION_AUTH_QUEUE_SIZE,
+        settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ),
+}
+
+
+def admission_stats() -> dict[str, dict[str, float]]:
+    return {name: gate.stats() for name, gate in admission_gates.items()}
+
+
+def route_class(method: str, path: str) -> str:
+    if path.startswith(AUTH_PREFIX):
+        return AUTH
+    return READ if method in READ_METHODS or path in READ_POSTS else WRITE
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware: holds a slot of the request's class until the response is fully sent."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.ADMISSION_CONTROL_ENABLED
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+        gate = admission_gates[route_class(scope["method"], scope["path"])]
+        try:
+            await gate.acquire()
+        except AdmissionRejected:
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+    async def _reject(self, send) -> None:
+        body = to_json({"detail": "Server busy, retry shortly"})
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 503, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -1,31 +1,102 @@
 """Authentication dependencies"""
-from typing import Annotated
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.core.security import decode_access_token
+
+from app.core.cache import token_cache, user_cache
+from app.core.database import get_db, get_read_db
+from app.core.metrics import timed
+from app.core.security import InvalidTokenError, decode_access_token
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
-async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: AsyncSession = Depends(get_db)) -> User:
-    credentials_exception = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    try:
-        payload = decode_access_token(token)
-        username = payload.get("sub")
-        if not username:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    user = await UserRepository(db).get_by_username(username)
-    if not user:
-        raise credentials_exception
-    return user
-
-async def get_current_active_user(current_user: Annotated[User, Depends(get_current_user)]) -> User:
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Detached snapshot of the authenticated user, safe to cache across requests."""
+
+    id: int
+    username: str
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    is_superuser: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)], db: AsyncSession = Depends(get_read_db)
+) -> CurrentUser:
+    with timed("auth"):
+        credentials_exception = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
+        )
+        username = token_cache.get(token)
+        if username is None:
+            try:
+                payload = decode_access_token(token)
+                username = payload.get("sub")
+                if not username:
+                    raise credentials_exception
+            except InvalidTokenError:
+                raise credentials_exception from None
+            # Never cache a token past its own expiry
+            token_cache.set(
+                token, username, ttl=payload["exp"] - time.time() if "exp" in payload else None
+            )
+        current_user = user_cache.get(username)
+        if current_user is None:
+            user = await UserRepository(db).get_by_username(username)
+            if not user:
+                raise credentials_exception
+            current_user = CurrentUser.from_user(user)
+            user_cache.set(username, current_user)
+        return current_user
+
+
+async def get_current_user_for_write(
+    token: Annotated[str, Depends(oauth2_scheme)], db: AsyncSession = Depends(get_db)
+) -> CurrentUser:
+    """get_current_user on the primary session, which the write route's handler shares, so a
+    write request holds one connection instead of a replica one as well."""
+    return await get_current_user(token, db)
+
+
+def _require_active(current_user: CurrentUser) -> CurrentUser:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+async def get_current_active_user(
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+) -> CurrentUser:
+    return _require_active(current_user)
+
+
+async def get_current_active_user_for_write(
+    current_user: Annotated[CurrentUser, Depends(get_current_user_for_write)],
+) -> CurrentUser:
+    return _require_active(current_user)
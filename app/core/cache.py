@@ -0,0 +1,57 @@
+"""In-process TTL + LRU caches"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Optional
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """Bounded LRU mapping whose entries also expire after a time-to-live."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None or item[0] <= time.monotonic():
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+# Decoded bearer token -> username, and username -> active user snapshot
+token_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+user_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def auth_cache_stats() -> dict[str, dict[str, int]]:
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
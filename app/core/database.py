@@ -1,16 +1,63 @@
 """Database configuration"""
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+
+from collections.abc import AsyncGenerator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base
+
 from app.core.config import settings
 
-engine = create_async_engine(settings.async_database_url, echo=settings.DEBUG, pool_pre_ping=True)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers proceed while a writer holds the lock
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
+
+
+def create_engine(url: str) -> AsyncEngine:
+    kwargs = {"echo": settings.DB_ECHO, "pool_pre_ping": True}
+    if ":memory:" not in url:
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    new_engine = create_async_engine(url, **kwargs)
+    if new_engine.dialect.name == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return new_engine
+
+
+engine = create_engine(settings.async_database_url)
+read_engine = create_engine(settings.READ_REPLICA_URL) if settings.READ_REPLICA_URL else engine
 AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
 Base = declarative_base()
 
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints; served by the replica when READ_REPLICA_URL is set."""
+    async with AsyncReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
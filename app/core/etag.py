@@ -0,0 +1,38 @@
+"""ETag helpers for conditional requests"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def ticket_etag(ticket_id: int, version: int, *variant: Any) -> str:
+    """Readable "<id>.<version>[.<variant hash>]" tag, so If-Match can recover the version."""
+    suffix = "." + make_etag(*variant).strip('"')[:8] if any(part for part in variant) else ""
+    return f'"{ticket_id}.{version}{suffix}"'
+
+
+def parse_ticket_etag(value: str) -> Optional[tuple[int, int]]:
+    parts = value.strip().removeprefix("W/").strip('"').split(".")
+    try:
+        return int(parts[0]), int(parts[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def is_fresh(request: Request, etag: str) -> bool:
+    """True when the client's If-None-Match already names this representation."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
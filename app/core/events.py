@@ -0,0 +1,140 @@
+"""In-process ticket change feed
+
+Repositories publish after they commit; each SSE/WebSocket client holds a bounded queue. A client
+that falls a full queue behind is disconnected rather than allowed to slow publishers or grow memory,
+and can reconnect with its last event id to replay what it missed from the recent history.
+
+Only writes made by this process are seen, so run a single worker (or one feed worker behind a
+sticky route) until events go through a shared bus."""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from pydantic_core import to_json
+
+from app.core.config import settings
+
+TICKET_CREATED = "ticket.created"
+TICKET_UPDATED = "ticket.updated"
+TICKET_DELETED = "ticket.deleted"
+TICKET_ACTION = "ticket.action"
+TICKETS_BULK_CREATED = "tickets.bulk_created"
+TICKETS_BULK_UPDATED = "tickets.bulk_updated"
+TICKETS_BULK_DELETED = "tickets.bulk_deleted"
+TICKETS_ARCHIVED = "tickets.archived"
+TICKETS_SLA_BREACHED = "tickets.sla_breached"
+# Sent instead of a replay when the requested id has left the history; clients should refetch
+RESYNC = "resync"
+
+
+@dataclass(frozen=True)
+class TicketEvent:
+    id: int
+    type: str
+    data: dict[str, Any]
+
+    def payload(self) -> bytes:
+        return to_json({"id": self.id, "type": self.type, "data": self.data})
+
+
+@dataclass(eq=False)
+class Subscription:
+    queue: "asyncio.Queue[Optional[TicketEvent]]"
+    dropped: bool = False
+
+    async def events(self) -> AsyncIterator[TicketEvent]:
+        """Yields until the broadcaster drops this subscriber (None is the end marker)."""
+        while True:
+            event = await self.queue.get()
+            if event is None:
+                return
+            yield event
+
+
+@dataclass
+class EventBroadcaster:
+    queue_size: int
+    history_size: int
+    published: int = 0
+    slow_consumers_dropped: int = 0
+    _subscribers: set[Subscription] = field(default_factory=set)
+    _history: deque[TicketEvent] = field(default_factory=deque)
+    # Microseconds since the epoch, so ids keep increasing across restarts and a stale Last-Event-ID resyncs
+    _last_id: int = field(default_factory=lambda: time.time_ns() // 1000)
+
+    def publish(self, type: str, data: dict[str, Any]) -> TicketEvent:
+        self._last_id += 1
+        event = TicketEvent(self._last_id, type, data)
+        self.published += 1
+        self._history.append(event)
+        if len(self._history) > self.history_size:
+            self._history.popleft()
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+        return event
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """Register a client; with last_event_id, queue the history it missed first."""
+        subscription = Subscription(asyncio.Queue(maxsize=self.queue_size))
+        if last_event_id is not None and last_event_id < self._last_id:
+            missed = self._replay(last_event_id)
+            for event in missed[-self.queue_size :]:
+                subscription.queue.put_nowait(event)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def _replay(self, last_event_id: int) -> list[TicketEvent]:
+        oldest = self._history[0].id if self._history else self._last_id + 1
+        if last_event_id < oldest - 1:
+            return [TicketEvent(self._last_id, RESYNC, {"reason": "history exhausted"})]
+        missed = [event for event in self._history if event.id > last_event_id]
+        if len(missed) > self.queue_size:
+            return [TicketEvent(self._last_id, RESYNC, {"reason": "too far behind"})]
+        return missed
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def _drop(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        subscription.dropped = True
+        self.slow_consumers_dropped += 1
+        # Discard the backlog and end the stream; the client catches up by resuming from its last event id
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "slow_consumers_dropped": self.slow_consumers_dropped,
+        }
+
+
+broadcaster = EventBroadcaster(settings.EVENT_QUEUE_SIZE, settings.EVENT_HISTORY_SIZE)
+
+
+def sse_message(event: TicketEvent) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event.id, event.type.encode(), event.payload())
+
+
+async def sse_stream(subscription: Subscription, heartbeat: float) -> AsyncIterator[bytes]:
+    """Server-Sent Events framing, with a comment line whenever the feed is idle for `heartbeat` seconds."""
+    yield b"retry: 3000\n\n"
+    while True:
+        try:
+            event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+        except asyncio.TimeoutError:
+            yield b": keep-alive\n\n"
+            continue
+        if event is None:
+            return
+        yield sse_message(event)
@@ -0,0 +1,47 @@
+"""Ticket export encoders"""
+
+import csv
+import enum
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any
+
+EXPORT_COLUMNS = (
+    "id",
+    "summary",
+    "description",
+    "status",
+    "priority",
+    "created_at",
+    "updated_at",
+    "closed_at",
+    "assigned_to_id",
+    "created_by_id",
+)
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+async def ndjson_lines(rows: AsyncIterator[Sequence[Any]]) -> AsyncIterator[str]:
+    async for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, map(_plain, row)))) + "\n"
+
+
+async def csv_lines(rows: AsyncIterator[Sequence[Any]]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    async for row in rows:
+        writer.writerow(["" if value is None else _plain(value) for value in row])
+        # Hand each line off immediately so the buffer never grows past one row
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -1,20 +1,192 @@
-"""Logging configuration"""
+"""Logging configuration
+
+Records are enqueued on the event loop and written by a QueueListener thread, so file and stdout
+I/O never blocks a request."""
+
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
+
 from app.core.config import settings
 
+REQUEST_ID_HEADER = b"x-request-id"
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp the current request id, and keep only a sample of DEBUG records."""
+
+    def __init__(self, debug_sample_rate: float = 1.0):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if (
+            record.levelno <= logging.DEBUG
+            and self.debug_sample_rate < 1.0
+            and random.random() >= self.debug_sample_rate
+        ):
+            return False
+        # Runs on the producing side, where the request's context variables are visible
+        record.request_id = request_id.get() or "-"
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Drops (and counts) records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message and traceback now (args may change before the listener gets to them), but
+        # leave formatting to the listener's handlers so text and JSON both see the bare message
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.stack_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def _file_handler(path: Path) -> logging.Handler:
+    if settings.LOG_ROTATE_WHEN:
+        return logging.handlers.TimedRotatingFileHandler(
+            path,
+            when=settings.LOG_ROTATE_WHEN,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True,
+        )
+    return logging.handlers.RotatingFileHandler(
+        path,
+        maxBytes=settings.LOG_MAX_BYTES,
+        backupCount=settings.LOG_BACKUP_COUNT,
+        encoding="utf-8",
+        delay=True,
+    )
+
+
 def setup_logging() -> logging.Logger:
-    log_dir = Path("logs")
+    global _listener
+    stop_logging()
+    log_dir = Path(settings.LOG_DIR)
     log_dir.mkdir(exist_ok=True)
+    if settings.LOG_FORMAT == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+        )
+    handlers: list[logging.Handler] = [
+        logging.StreamHandler(sys.stdout),
+        _file_handler(log_dir / "helpvia_api.log"),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter(settings.LOG_DEBUG_SAMPLE_RATE))
     logger = logging.getLogger("helpvia")
     logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper()))
     logger.handlers.clear()
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-    console = logging.StreamHandler(sys.stdout)
-    console.setFormatter(formatter)
-    logger.addHandler(console)
-    file_handler = logging.FileHandler(log_dir / "helpvia_api.log")
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    logger.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     return logger
+
+
+def stop_logging() -> None:
+    """Flush queued records and close the handlers; called at shutdown."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def dropped_records() -> int:
+    return sum(getattr(handler, "dropped", 0) for handler in logging.getLogger("helpvia").handlers)
+
+
+class RequestContextMiddleware:
+    """Tags each request with an id (the caller's X-Request-ID, or a fresh one), echoes it back,
+    and writes a DEBUG access record."""
+
+    def __init__(self, app):
+        self.app = app
+        self.logger = logging.getLogger("helpvia.access")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rid = (
+            dict(scope["headers"]).get(REQUEST_ID_HEADER, b"").decode("latin-1")[:64]
+            or uuid.uuid4().hex
+        )
+        token = request_id.set(rid)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (REQUEST_ID_HEADER, rid.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "%s %s -> %d in %.1f ms",
+                    scope["method"],
+                    scope["path"],
+                    status,
+                    (time.perf_counter() - start) * 1000,
+                )
+            request_id.reset(token)
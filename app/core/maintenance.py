@@ -0,0 +1,149 @@
+"""Maintenance jobs
+
+python -m app.core.maintenance reconcile-counters
+"""
+
+import asyncio
+import logging
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.scheduler import ScheduledJob
+from app.models.ticket import TicketPriority
+from app.repositories.report_repository import ReportRepository
+from app.repositories.ticket_counter_repository import TicketCounterRepository
+from app.repositories.ticket_repository import TicketRepository
+from app.repositories.ticket_search_repository import TicketSearchRepository
+
+logger = logging.getLogger("helpvia")
+# Recorded as the user on the ticket history the scheduled jobs write
+SYSTEM_USER = "system"
+
+
+async def reconcile_ticket_counters(session_factory: async_sessionmaker) -> None:
+    """Rebuild ticket_counters from a full scan of tickets, repairing any drift."""
+    async with session_factory() as db:
+        await TicketCounterRepository(db).rebuild()
+
+
+async def rebuild_search_index(session_factory: async_sessionmaker) -> None:
+    """Repopulate the SQLite FTS5 table from tickets; a no-op on MySQL, whose FULLTEXT index is native."""
+    async with session_factory() as db:
+        await TicketSearchRepository(db).rebuild()
+
+
+async def analyze_tables(session_factory: async_sessionmaker) -> None:
+    """Refresh the planner's statistics. Without them SQLite guesses every indexed equality is equally
+    selective, and picks the status index over the far narrower assignee/creator ones for /tickets/mine.
+    """
+    async with session_factory() as db:
+        if db.get_bind().dialect.name == "mysql":
+            await db.execute(text("ANALYZE TABLE tickets, ticket_actions"))
+        else:
+            await db.execute(text("ANALYZE"))
+        await db.commit()
+
+
+async def archive_closed_tickets(session_factory: async_sessionmaker) -> int:
+    """Move tickets closed more than ARCHIVE_AFTER_DAYS ago into tickets_archive, ARCHIVE_BATCH_SIZE per transaction."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    async with session_factory() as db:
+        archived = await TicketRepository(db).archive_closed(
+            cutoff, chunk_size=settings.ARCHIVE_BATCH_SIZE
+        )
+    if archived:
+        logger.info(f"Archived {archived} tickets closed before {cutoff:%Y-%m-%d}")
+    return archived
+
+
+async def refresh_reports(session_factory: async_sessionmaker) -> int:
+    """Recompute the report rollups for the days that changed since the last refresh."""
+    async with session_factory() as db:
+        days = await ReportRepository(db).refresh()
+    if days:
+        logger.info(f"Refreshed report rollups for {days} days")
+    return days
+
+
+async def rebuild_reports(session_factory: async_sessionmaker) -> None:
+    """Recompute the report rollups for every day, e.g. after restoring tickets from a backup."""
+    async with session_factory() as db:
+        await ReportRepository(db).refresh(full=True)
+
+
+async def close_resolved_tickets(session_factory: async_sessionmaker) -> int:
+    """Close tickets left RESOLVED, with no further change, for AUTO_CLOSE_RESOLVED_AFTER_DAYS."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.AUTO_CLOSE_RESOLVED_AFTER_DAYS)
+    async with session_factory() as db:
+        closed = await TicketRepository(db).close_resolved(
+            cutoff,
+            SYSTEM_USER,
+            chunk_size=settings.SCHEDULER_BATCH_SIZE,
+            pause=settings.SCHEDULER_CHUNK_PAUSE_SECONDS,
+        )
+    if closed:
+        logger.info(f"Closed {closed} tickets resolved before {cutoff:%Y-%m-%d}")
+    return closed
+
+
+async def flag_sla_breaches(session_factory: async_sessionmaker) -> int:
+    """Stamp sla_breached_at on open tickets older than their priority's SLA_HOURS_* target."""
+    targets = {
+        TicketPriority.CRITICAL: timedelta(hours=settings.SLA_HOURS_CRITICAL),
+        TicketPriority.HIGH: timedelta(hours=settings.SLA_HOURS_HIGH),
+        TicketPriority.MEDIUM: timedelta(hours=settings.SLA_HOURS_MEDIUM),
+        TicketPriority.LOW: timedelta(hours=settings.SLA_HOURS_LOW),
+    }
+    async with session_factory() as db:
+        flagged = await TicketRepository(db).flag_sla_breaches(
+            targets,
+            SYSTEM_USER,
+            chunk_size=settings.SCHEDULER_BATCH_SIZE,
+            pause=settings.SCHEDULER_CHUNK_PAUSE_SECONDS,
+        )
+    if flagged:
+        logger.info(f"Flagged {flagged} tickets past their SLA")
+    return flagged
+
+
+JOBS = {
+    "reconcile-counters": reconcile_ticket_counters,
+    "rebuild-search-index": rebuild_search_index,
+    "analyze": analyze_tables,
+    "archive-closed": archive_closed_tickets,
+    "refresh-reports": refresh_reports,
+    "rebuild-reports": rebuild_reports,
+    "close-resolved": close_resolved_tickets,
+    "flag-sla-breaches": flag_sla_breaches,
+}
+
+
+def scheduled_jobs() -> list[ScheduledJob]:
+    """The JOBS the in-process scheduler runs, at their configured intervals; 0 leaves a job to this command."""
+    intervals = {
+        "archive-closed": settings.ARCHIVE_INTERVAL_SECONDS,
+        "refresh-reports": settings.REPORT_REFRESH_INTERVAL_SECONDS,
+        "close-resolved": settings.AUTO_CLOSE_INTERVAL_SECONDS,
+        "flag-sla-breaches": settings.SLA_CHECK_INTERVAL_SECONDS,
+    }
+    return [
+        ScheduledJob(name, JOBS[name], interval) for name, interval in intervals.items() if interval
+    ]
+
+
+async def main(job: str) -> None:
+    from app.core.database import AsyncSessionLocal, engine
+
+    await JOBS[job](AsyncSessionLocal)
+    print(f"{job}: done")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in JOBS:
+        sys.exit(f"usage: python -m app.core.maintenance {{{','.join(JOBS)}}}")
+    asyncio.run(main(sys.argv[1]))
@@ -0,0 +1,377 @@
+"""Request and database metrics, exposed in Prometheus text format"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.admission import admission_stats
+from app.core.cache import auth_cache_stats
+from app.core.config import settings
+from app.core.events import broadcaster
+from app.core.logging_config import dropped_records
+from app.core.scheduler import scheduler_stats
+from app.core.security import password_hasher
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TIMING_PHASES = ("auth", "db", "serialize")
+DEBUG_TIMING_HEADER = b"x-debug-timing"
+BACKGROUND = (
+    "background"  # route label for queries run outside a request (startup, maintenance jobs)
+)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+@dataclass
+class RequestTimings:
+    """Per-request accumulator, reachable from engine events and dependencies through a context variable."""
+
+    queries: int = 0
+    phases: dict[str, float] = field(default_factory=lambda: dict.fromkeys(TIMING_PHASES, 0.0))
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the wall time of the block to `phase` of the current request, if any."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _current.get()
+        if timings is not None:
+            timings.phases[phase] += time.perf_counter() - start
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.in_flight = 0
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        self.responses: dict[tuple[str, str, str], int] = {}
+        self.db_queries: dict[str, int] = {}
+        self.db_seconds: dict[str, float] = {}
+        self.engines: dict[str, AsyncEngine] = {}
+
+    def observe_request(
+        self, method: str, route: str, status: int, seconds: float, timings: RequestTimings
+    ) -> None:
+        key = (method, route)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram()
+        histogram.observe(seconds)
+        response_key = (method, route, str(status))
+        self.responses[response_key] = self.responses.get(response_key, 0) + 1
+        self.observe_queries(route, timings.queries, timings.phases["db"])
+
+    def observe_queries(self, route: str, queries: int, seconds: float) -> None:
+        self.db_queries[route] = self.db_queries.get(route, 0) + queries
+        self.db_seconds[route] = self.db_seconds.get(route, 0.0) + seconds
+
+    def reset(self) -> None:
+        self.latency.clear()
+        self.responses.clear()
+        self.db_queries.clear()
+        self.db_seconds.clear()
+
+    def render(self) -> str:
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        metric(
+            "helpvia_http_request_duration_seconds",
+            "histogram",
+            "Request latency by route template.",
+        )
+        for (method, route), histogram in sorted(self.latency.items()):
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(
+                    f'helpvia_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'helpvia_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}'
+            )
+            lines.append(
+                f"helpvia_http_request_duration_seconds_sum{{{labels}}} {histogram.sum:.6f}"
+            )
+            lines.append(
+                f"helpvia_http_request_duration_seconds_count{{{labels}}} {histogram.count}"
+            )
+        metric(
+            "helpvia_http_responses_total",
+            "counter",
+            "Responses by route template and status code.",
+        )
+        for (method, route, status), count in sorted(self.responses.items()):
+            lines.append(
+                f'helpvia_http_responses_total{{method="{method}",route="{route}",status="{status}"}} {count}'
+            )
+        metric("helpvia_http_requests_in_flight", "gauge", "Requests currently being served.")
+        lines.append(f"helpvia_http_requests_in_flight {self.in_flight}")
+        metric("helpvia_db_queries_total", "counter", "SQL statements executed, by route template.")
+        for route, count in sorted(self.db_queries.items()):
+            lines.append(f'helpvia_db_queries_total{{route="{route}"}} {count}')
+        metric(
+            "helpvia_db_query_seconds_total",
+            "counter",
+            "Cumulative SQL execution time, by route template.",
+        )
+        for route, seconds in sorted(self.db_seconds.items()):
+            lines.append(f'helpvia_db_query_seconds_total{{route="{route}"}} {seconds:.6f}')
+        metric(
+            "helpvia_db_pool_checked_out", "gauge", "Connections currently checked out of the pool."
+        )
+        pools = [(name, engine.sync_engine.pool) for name, engine in self.engines.items()]
+        for name, pool in pools:
+            if hasattr(pool, "checkedout"):
+                lines.append(f'helpvia_db_pool_checked_out{{engine="{name}"}} {pool.checkedout()}')
+        metric(
+            "helpvia_db_pool_overflow",
+            "gauge",
+            "Connections open beyond pool_size (negative while the pool is filling).",
+        )
+        for name, pool in pools:
+            if hasattr(pool, "overflow"):
+                lines.append(f'helpvia_db_pool_overflow{{engine="{name}"}} {pool.overflow()}')
+        gates = admission_stats()
+        metric("helpvia_admission_in_use", "gauge", "Admission slots held, by route class.")
+        for route_class, stats in gates.items():
+            lines.append(f'helpvia_admission_in_use{{class="{route_class}"}} {stats["in_use"]}')
+        metric(
+            "helpvia_admission_waiting",
+            "gauge",
+            "Requests waiting for an admission slot, by route class.",
+        )
+        for route_class, stats in gates.items():
+            lines.append(f'helpvia_admission_waiting{{class="{route_class}"}} {stats["waiting"]}')
+        metric(
+            "helpvia_admission_queued_total",
+            "counter",
+            "Requests that had to wait for a slot, by route class.",
+        )
+        for route_class, stats in gates.items():
+            lines.append(
+                f'helpvia_admission_queued_total{{class="{route_class}"}} {stats["queued"]}'
+            )
+        metric(
+            "helpvia_admission_queue_seconds_total",
+            "counter",
+            "Cumulative time spent waiting for a slot, by route class.",
+        )
+        for route_class, stats in gates.items():
+            lines.append(
+                f'helpvia_admission_queue_seconds_total{{class="{route_class}"}} {stats["queue_seconds"]:.6f}'
+            )
+        metric(
+            "helpvia_admission_rejected_total",
+            "counter",
+            "Requests shed with 503, by route class and reason.",
+        )
+        for route_class, stats in gates.items():
+            lines.append(
+                f'helpvia_admission_rejected_total{{class="{route_class}",reason="queue_full"}} {stats["rejected_queue_full"]}'
+            )
+            lines.append(
+                f'helpvia_admission_rejected_total{{class="{route_class}",reason="queue_timeout"}} {stats["rejected_queue_timeout"]}'
+            )
+        metric("helpvia_auth_cache_entries", "gauge", "Entries held in the auth caches.")
+        cache_stats = auth_cache_stats()
+        for cache, stats in cache_stats.items():
+            lines.append(f'helpvia_auth_cache_entries{{cache="{cache}"}} {stats["size"]}')
+        metric("helpvia_auth_cache_lookups_total", "counter", "Auth cache lookups by result.")
+        for cache, stats in cache_stats.items():
+            lines.append(
+                f'helpvia_auth_cache_lookups_total{{cache="{cache}",result="hit"}} {stats["hits"]}'
+            )
+            lines.append(
+                f'helpvia_auth_cache_lookups_total{{cache="{cache}",result="miss"}} {stats["misses"]}'
+            )
+        metric(
+            "helpvia_password_hash_rejected_total",
+            "counter",
+            "Password hashes refused with 503 because the pool was full.",
+        )
+        lines.append(f"helpvia_password_hash_rejected_total {password_hasher.rejected}")
+        event_stats = broadcaster.stats()
+        metric("helpvia_event_subscribers", "gauge", "Clients connected to the ticket event feed.")
+        lines.append(f"helpvia_event_subscribers {event_stats['subscribers']}")
+        metric("helpvia_events_published_total", "counter", "Ticket events published.")
+        lines.append(f"helpvia_events_published_total {event_stats['published']}")
+        metric(
+            "helpvia_event_slow_consumers_dropped_total",
+            "counter",
+            "Feed clients disconnected for falling a full queue behind.",
+        )
+        lines.append(
+            f"helpvia_event_slow_consumers_dropped_total {event_stats['slow_consumers_dropped']}"
+        )
+        metric(
+            "helpvia_log_records_dropped_total",
+            "counter",
+            "Log records dropped because the logging queue was full.",
+        )
+        lines.append(f"helpvia_log_records_dropped_total {dropped_records()}")
+        jobs = scheduler_stats()
+        metric(
+            "helpvia_job_runs_total",
+            "counter",
+            "Scheduled job runs on this worker, by job and result.",
+        )
+        for job, stats in jobs.items():
+            lines.append(
+                f'helpvia_job_runs_total{{job="{job}",result="success"}} {stats["runs"] - stats["failures"]}'
+            )
+            lines.append(
+                f'helpvia_job_runs_total{{job="{job}",result="failure"}} {stats["failures"]}'
+            )
+        metric(
+            "helpvia_job_lease_skipped_total",
+            "counter",
+            "Scheduled job runs skipped because another worker held the lease.",
+        )
+        for job, stats in jobs.items():
+            lines.append(f'helpvia_job_lease_skipped_total{{job="{job}"}} {stats["skipped"]}')
+        metric("helpvia_job_processed_total", "counter", "Rows handled by scheduled job runs.")
+        for job, stats in jobs.items():
+            lines.append(f'helpvia_job_processed_total{{job="{job}"}} {stats["processed"]}')
+        metric(
+            "helpvia_job_duration_seconds_total",
+            "counter",
+            "Cumulative time spent running scheduled jobs.",
+        )
+        for job, stats in jobs.items():
+            lines.append(
+                f'helpvia_job_duration_seconds_total{{job="{job}"}} {stats["seconds"]:.6f}'
+            )
+        metric("helpvia_job_running", "gauge", "Scheduled jobs running on this worker right now.")
+        for job, stats in jobs.items():
+            lines.append(f'helpvia_job_running{{job="{job}"}} {stats["running"]}')
+        metric(
+            "helpvia_job_last_success_timestamp_seconds",
+            "gauge",
+            "Unix time this worker last finished the job without error.",
+        )
+        for job, stats in jobs.items():
+            if stats["last_success"] is not None:
+                lines.append(
+                    f'helpvia_job_last_success_timestamp_seconds{{job="{job}"}} {stats["last_success"]:.3f}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    timings = _current.get()
+    if timings is None:
+        metrics.observe_queries(BACKGROUND, 1, elapsed)
+    else:
+        timings.queries += 1
+        timings.phases["db"] += elapsed
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Count statements and DB time per request, and report the engine's pool gauges."""
+    if name in metrics.engines:
+        return
+    metrics.engines[name] = engine
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_label(scope) -> str:
+    """Route template of the matched endpoint, e.g. /api/v1/tickets/{ticket_id}."""
+    route = scope.get("route")
+    if route is None or not hasattr(route, "path_format"):
+        # Unmatched paths share one label so scanners cannot blow up label cardinality
+        return "unmatched"
+    # Routes of an included router may only know their own suffix; recover the prefix from the concrete path
+    params = {
+        name: route.param_convertors[name].to_string(value)
+        for name, value in scope.get("path_params", {}).items()
+        if name in route.param_convertors
+    }
+    suffix = route.path_format.format(**params)
+    path = scope["path"]
+    prefix = path[: len(path) - len(suffix)] if path.endswith(suffix) else ""
+    return prefix + route.path_format
+
+
+def _server_timing(timings: RequestTimings, total: float) -> bytes:
+    parts = [f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in timings.phases.items()]
+    parts[TIMING_PHASES.index("db")] += f';desc="{timings.queries} queries"'
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts).encode()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: latency histogram, status counts and in-flight gauge per route template.
+
+    With DEBUG_TIMING_HEADER enabled, a request carrying `X-Debug-Timing: 1` gets a `Server-Timing`
+    response header breaking the time to first byte down into auth, db and serialize."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        timings = RequestTimings()
+        token = _current.set(timings)
+        debug = settings.DEBUG_TIMING_HEADER and (DEBUG_TIMING_HEADER, b"1") in scope["headers"]
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if debug:
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"server-timing", _server_timing(timings, time.perf_counter() - start)),
+                    ]
+            await send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            _current.reset(token)
+            metrics.observe_request(
+                scope["method"], _route_label(scope), status, time.perf_counter() - start, timings
+            )
@@ -0,0 +1,286 @@
+"""Versioned schema migrations
+
+    python -m app.core.migrations
+
+Run once per deploy, before the new workers start. Workers only read schema_version at startup;
+outside development and testing they refuse to start on a database older than SCHEMA_HEAD rather
+than running DDL themselves.
+"""
+
+import asyncio
+import json
+from collections.abc import Awaitable
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import delete, func, insert, inspect, select, text, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, async_sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.schema_version import SchemaVersion
+from app.models.ticket import ADD_TICKETS_FULLTEXT, CREATE_TICKETS_FTS, Ticket
+from app.models.ticket_action import TicketActionEntry
+from app.models.ticket_archive import TicketArchive
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def _create_missing_indexes(sync_conn) -> None:
+    # create_all skips tables that already exist, including any indexes added to them since. An index
+    # on a column that a later step adds is left for that step to create.
+    inspector = inspect(sync_conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            if index.name not in existing and {column.name for column in index.columns} <= columns:
+                index.create(sync_conn)
+
+
+async def _column_names(conn: AsyncConnection, table: str) -> set:
+    return await conn.run_sync(
+        lambda sync_conn: {column["name"] for column in inspect(sync_conn).get_columns(table)}
+    )
+
+
+async def create_missing_tables(engine: AsyncEngine) -> None:
+    """Tables and indexes added to the models since the first release."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
+
+
+async def add_ticket_version_column(engine: AsyncEngine) -> bool:
+    """Add tickets.version to databases created before ETag support; returns True if it was added."""
+    async with engine.begin() as conn:
+        if "version" in await _column_names(conn, "tickets"):
+            return False
+        await conn.execute(
+            text("ALTER TABLE tickets ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        )
+        return True
+
+
+async def migrate_actions_json(engine: AsyncEngine, batch_size: int = 500) -> int:
+    """Copy legacy Ticket.actions_json history into ticket_actions, one batch per transaction."""
+    migrated, last_id = 0, 0
+    while True:
+        async with engine.begin() as conn:
+            rows = (
+                await conn.execute(
+                    select(Ticket.id, Ticket.actions_json)
+                    .where(
+                        Ticket.id > last_id,
+                        Ticket.actions_json.is_not(None),
+                        Ticket.actions_json.not_in(["", "{}"]),
+                    )
+                    .order_by(Ticket.id)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                return migrated
+            entries = []
+            for ticket_id, actions_json in rows:
+                try:
+                    actions = json.loads(actions_json)
+                except ValueError:
+                    continue
+                for key in sorted(actions):
+                    item = actions[key]
+                    entries.append(
+                        {
+                            "ticket_id": ticket_id,
+                            "action": item.get("action", ""),
+                            "user": item.get("user", ""),
+                            "created_at": datetime.fromisoformat(item.get("timestamp", key)),
+                        }
+                    )
+            if entries:
+                await conn.execute(insert(TicketActionEntry), entries)
+            await conn.execute(
+                update(Ticket)
+                .where(Ticket.id.in_([r.id for r in rows]))
+                .values(actions_json="{}", updated_at=Ticket.updated_at)
+            )
+            migrated += len(entries)
+            last_id = rows[-1].id
+
+
+async def add_full_text_search(engine: AsyncEngine) -> None:
+    """The FTS structures are created alongside tickets, so databases that already had the table lack them."""
+    async with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            await conn.execute(CREATE_TICKETS_FTS)
+        elif engine.dialect.name == "mysql":
+            indexes = await conn.run_sync(
+                lambda sync_conn: {i["name"] for i in inspect(sync_conn).get_indexes("tickets")}
+            )
+            if "ft_tickets_summary_description" not in indexes:
+                await conn.execute(ADD_TICKETS_FULLTEXT)
+
+
+async def add_ticket_filter_indexes(engine: AsyncEngine) -> None:
+    """Assignee, creator and priority indexes behind the filtered lists and /tickets/mine."""
+    from app.core.maintenance import JOBS
+
+    async with engine.begin() as conn:
+        await conn.run_sync(_create_missing_indexes)
+    await JOBS["analyze"](async_sessionmaker(engine, expire_on_commit=False))
+
+
+async def rebuild_derived_data(engine: AsyncEngine) -> None:
+    from app.core.maintenance import JOBS
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    for job in ("reconcile-counters", "rebuild-search-index"):
+        await JOBS[job](session_factory)
+
+
+async def add_report_rollups(engine: AsyncEngine) -> None:
+    """Rollup tables and the close-date indexes that fill them, then a first full build."""
+    from app.core.maintenance import JOBS
+
+    await create_missing_tables(engine)
+    await JOBS["refresh-reports"](async_sessionmaker(engine, expire_on_commit=False))
+
+
+async def add_sla_breached_at(engine: AsyncEngine) -> None:
+    """tickets.sla_breached_at and its archive copy, then the job_leases table and the SLA scan index."""
+    async with engine.begin() as conn:
+        for table in ("tickets", "tickets_archive"):
+            if "sla_breached_at" not in await _column_names(conn, table):
+                await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN sla_breached_at DATETIME"))
+    await create_missing_tables(engine)
+
+
+async def add_sqlite_autoincrement(engine: AsyncEngine) -> None:
+    """Rebuild tickets and ticket_actions with AUTOINCREMENT on SQLite. Without it a new row gets
+    max(id) + 1, so once the archiver or a delete removes the highest ids they are issued again and
+    collide with archived tickets. MySQL never reuses AUTO_INCREMENT values."""
+    if engine.dialect.name != "sqlite":
+        return
+    for model, archive in ((Ticket, TicketArchive), (TicketActionEntry, None)):
+        table = model.__table__
+        async with engine.begin() as conn:
+            ddl = (
+                await conn.execute(
+                    text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": table.name},
+                )
+            ).scalar()
+            if "AUTOINCREMENT" in ddl.upper():
+                continue
+            # The app never enables PRAGMA foreign_keys, so dropping tickets does not cascade to the action log
+            create = str(CreateTable(table).compile(dialect=conn.dialect)).replace(
+                f"CREATE TABLE {table.name} (", f"CREATE TABLE {table.name}_rebuild (", 1
+            )
+            columns = ", ".join(column.name for column in table.columns)
+            await conn.execute(text(create))
+            await conn.execute(
+                text(
+                    f"INSERT INTO {table.name}_rebuild ({columns}) SELECT {columns} FROM {table.name}"
+                )
+            )
+            await conn.execute(text(f"DROP TABLE {table.name}"))
+            await conn.execute(text(f"ALTER TABLE {table.name}_rebuild RENAME TO {table.name}"))
+            highest = [(await conn.execute(select(func.max(model.id)))).scalar() or 0]
+            if archive is not None:
+                highest.append((await conn.execute(select(func.max(archive.id)))).scalar() or 0)
+            await conn.execute(
+                text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": table.name}
+            )
+            await conn.execute(
+                text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"),
+                {"name": table.name, "seq": max(highest)},
+            )
+            await conn.run_sync(_create_missing_indexes)
+
+
+# Append only: (version, description, step). Steps must be safe to re-run, since a database that
+# predates versioning starts from 0 whatever it already has.
+MIGRATIONS: list[tuple[int, str, Callable[[AsyncEngine], Awaitable]]] = [
+    (1, "create tables added since the first release", create_missing_tables),
+    (2, "add tickets.version", add_ticket_version_column),
+    (3, "add full-text search structures", add_full_text_search),
+    (4, "move tickets.actions_json into ticket_actions", migrate_actions_json),
+    (5, "build ticket counters and the search index", rebuild_derived_data),
+    (6, "index tickets by assignee, creator and priority", add_ticket_filter_indexes),
+    (7, "add the ticket archive tables", create_missing_tables),
+    (8, "add the daily report rollups", add_report_rollups),
+    (9, "add SLA breach tracking and the job lease table", add_sla_breached_at),
+    (10, "stop SQLite reissuing ticket and action ids", add_sqlite_autoincrement),
+]
+SCHEMA_HEAD = MIGRATIONS[-1][0]
+
+
+async def current_version(engine: AsyncEngine) -> Optional[int]:
+    """One primary-key read; None for an empty database or one that predates versioning."""
+    try:
+        async with engine.connect() as conn:
+            return (await conn.execute(select(SchemaVersion.version))).scalar()
+    except DBAPIError:
+        return None
+
+
+async def _stamp(conn: AsyncConnection, version: int) -> None:
+    await conn.execute(delete(SchemaVersion))
+    await conn.execute(insert(SchemaVersion).values(version=version, applied_at=datetime.utcnow()))
+
+
+async def upgrade(engine: AsyncEngine) -> list[int]:
+    """Bring the database to SCHEMA_HEAD; returns the versions applied."""
+    version = await current_version(engine)
+    if version is None:
+        async with engine.begin() as conn:
+            if not await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("tickets")):
+                # Empty database: create the current schema outright, there is nothing to migrate
+                await conn.run_sync(Base.metadata.create_all)
+                await _stamp(conn, SCHEMA_HEAD)
+                return []
+        version = 0
+    applied = []
+    for number, _, step in MIGRATIONS:
+        if number > version:
+            await step(engine)
+            async with engine.begin() as conn:
+                await _stamp(conn, number)
+            applied.append(number)
+    return applied
+
+
+async def ensure_schema(engine: AsyncEngine) -> None:
+    """Startup check. Development and testing create or upgrade the database in place; everywhere
+    else a single version read decides whether this build may serve it."""
+    if settings.ENVIRONMENT in ("development", "testing"):
+        await upgrade(engine)
+        return
+    version = await current_version(engine)
+    # A newer schema is fine: migrations are additive, and old workers keep serving during a rolling deploy
+    if version is None or version < SCHEMA_HEAD:
+        raise SchemaOutOfDate(
+            f"Database schema is at version {version or 0} but this build needs {SCHEMA_HEAD}; run `python -m app.core.migrations`"
+        )
+
+
+async def main() -> None:
+    from app.core.database import engine
+
+    before = await current_version(engine)
+    applied = await upgrade(engine)
+    descriptions = {number: description for number, description, _ in MIGRATIONS}
+    for number in applied:
+        print(f"{number}: {descriptions[number]}")
+    print(
+        f"Schema at version {SCHEMA_HEAD}" + ("" if applied or before is not None else " (created)")
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
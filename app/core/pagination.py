@@ -0,0 +1,30 @@
+"""Keyset pagination cursors"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(at: datetime, ticket_id: int, rank: Optional[int] = None) -> str:
+    """`at` is the timestamp the list is sorted on; `rank` leads the key when sorting by priority."""
+    data = {"c": at.isoformat(), "i": ticket_id}
+    if rank is not None:
+        data["r"] = rank
+    raw = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """(at, id), or (rank, at, id) for a cursor taken from a priority-sorted list."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        key = (datetime.fromisoformat(data["c"]), int(data["i"]))
+        return (int(data["r"]), *key) if "r" in data else key
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
@@ -0,0 +1,188 @@
+"""In-process job scheduler
+
+Every worker runs one, and a row per job in job_leases decides which of them runs the job: a worker
+takes the lease once it has expired, renews it while the job runs and, when done, leaves it expiring
+at the job's next due time. The others skip the job until then, and a crashed holder only blocks it
+for SCHEDULER_LEASE_SECONDS. Expiry is compared against each worker's own clock, so keep them in sync.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.models.job_lease import JobLease
+
+logger = logging.getLogger("helpvia")
+
+
+@dataclass(eq=False)
+class ScheduledJob:
+    """A maintenance job run every `interval` seconds, with this worker's counters for /metrics."""
+
+    name: str
+    run: Callable[[async_sessionmaker], Awaitable[Optional[int]]]
+    interval: float
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0  # due, but another worker held the lease
+    processed: int = 0  # rows the job reported handling
+    seconds: float = 0.0
+    last_success: Optional[float] = None  # unix time
+    running: bool = False
+
+    def stats(self) -> dict[str, Optional[float]]:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "processed": self.processed,
+            "seconds": self.seconds,
+            "last_success": self.last_success,
+            "running": int(self.running),
+        }
+
+
+# Jobs of the running scheduler by name, for /metrics
+active_jobs: dict[str, ScheduledJob] = {}
+
+
+def scheduler_stats() -> dict[str, dict[str, Optional[float]]]:
+    return {name: job.stats() for name, job in active_jobs.items()}
+
+
+class Scheduler:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        jobs: list[ScheduledJob],
+        owner: Optional[str] = None,
+        lease_seconds: float = settings.SCHEDULER_LEASE_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.jobs = jobs
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        for job in self.jobs:
+            active_jobs[job.name] = job
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"scheduler:{job.name}"))
+
+    async def stop(self) -> None:
+        """Cancel the loops; a job cut off mid-run keeps its committed chunks and its lease simply expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        for job in self.jobs:
+            active_jobs.pop(job.name, None)
+
+    async def _loop(self, job: ScheduledJob) -> None:
+        while True:
+            ran = await self.run_once(job)
+            # A worker that lost the race polls again within a lease, in case the holder dies
+            await asyncio.sleep(job.interval if ran else min(job.interval, self.lease_seconds))
+
+    async def run_once(self, job: ScheduledJob) -> bool:
+        """Run `job` if this worker can take its lease; returns whether it ran. Failures are logged, not raised."""
+        try:
+            acquired = await self.acquire(job.name)
+        except Exception:
+            logger.exception(f"Could not take the lease for scheduled job {job.name}")
+            return False
+        if not acquired:
+            job.skipped += 1
+            return False
+        started, start = datetime.utcnow(), time.perf_counter()
+        job.running = True
+        heartbeat = asyncio.create_task(self._heartbeat(job.name))
+        try:
+            processed = await job.run(self.session_factory)
+        except Exception:
+            job.failures += 1
+            logger.exception(f"Scheduled job {job.name} failed")
+        else:
+            job.processed += processed or 0
+            job.last_success = time.time()
+            if processed:
+                logger.info(
+                    f"Scheduled job {job.name} processed {processed} rows in {time.perf_counter() - start:.2f}s"
+                )
+        finally:
+            heartbeat.cancel()
+            job.running = False
+            job.runs += 1
+            job.seconds += time.perf_counter() - start
+        try:
+            await self.release(job.name, started + timedelta(seconds=job.interval))
+        except Exception:
+            logger.exception(f"Could not release the lease for scheduled job {job.name}")
+        return True
+
+    async def acquire(self, name: str) -> bool:
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(JobLease)
+                .where(JobLease.name == name, JobLease.expires_at <= now)
+                .values(owner=self.owner, expires_at=expires_at)
+            )
+            if result.rowcount:
+                await db.commit()
+                return True
+            if await db.get(JobLease, name) is not None:
+                return False
+            try:
+                await db.execute(
+                    insert(JobLease).values(name=name, owner=self.owner, expires_at=expires_at)
+                )
+                await db.commit()
+            except IntegrityError:
+                # Another worker inserted the first lease row for this job
+                await db.rollback()
+                return False
+        return True
+
+    async def renew(self, name: str) -> bool:
+        """Push our lease out another lease period; False if it was lost, e.g. after a long stall."""
+        async with self.session_factory() as db:
+            expires_at = datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+            result = await db.execute(
+                update(JobLease)
+                .where(JobLease.name == name, JobLease.owner == self.owner)
+                .values(expires_at=expires_at)
+            )
+            await db.commit()
+            return bool(result.rowcount)
+
+    async def release(self, name: str, next_due: datetime) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(JobLease)
+                .where(JobLease.name == name, JobLease.owner == self.owner)
+                .values(expires_at=next_due, last_finished_at=datetime.utcnow())
+            )
+            await db.commit()
+
+    async def _heartbeat(self, name: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await self.renew(name):
+                    logger.warning(f"Scheduled job {name} lost its lease to another worker")
+                    return
+            except Exception:
+                logger.exception(f"Could not renew the lease for scheduled job {name}")
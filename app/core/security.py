@@ -1,22 +1,99 @@
 """Security utilities"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from jose import jwt
-from passlib.context import CryptContext
+from functools import cache
+from typing import TYPE_CHECKING, Optional
+
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+class InvalidTokenError(ValueError):
+    pass
+
+
+@cache
+def pwd_context() -> "CryptContext":
+    # passlib (and jose below) are imported on first use, keeping them off the worker startup path
+    from passlib.context import CryptContext
+
+    # Pinning min/max to the configured cost makes verify_and_update flag hashes made under an older cost
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+    )
+
+
+class HashingPoolBusy(RuntimeError):
+    pass
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded thread pool so it never blocks the event loop."""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rejected = 0
+        self._in_flight = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+    async def _run(self, fn, *args):
+        # Fail fast instead of letting the executor queue grow without bound
+        if self._in_flight >= self.workers + self.max_pending:
+            self.rejected += 1
+            raise HashingPoolBusy("Password hashing pool is saturated")
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context().hash, password)
+
+    async def verify_and_update(self, plain: str, hashed: str) -> tuple[bool, Optional[str]]:
+        """Returns (valid, new_hash); new_hash is set when the stored hash uses an outdated cost."""
+        return await self._run(pwd_context().verify_and_update, plain, hashed)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    return pwd_context().verify(plain, hashed)
+
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return pwd_context().hash(password)
+
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
+    from jose import jwt
+
     to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    expire = datetime.utcnow() + (
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
+
 def decode_access_token(token: str) -> dict:
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    """Raises InvalidTokenError for a malformed, forged or expired token."""
+    from jose import JWTError, jwt
+
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError as e:
+        raise InvalidTokenError(str(e)) from e
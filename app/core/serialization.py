@@ -0,0 +1,43 @@
+"""Fast JSON serialization for list endpoints"""
+
+from collections.abc import Collection, Iterable
+from operator import attrgetter
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic_core import to_json
+
+from app.core.metrics import timed
+from app.models.ticket import EXPANDABLE_RELATIONSHIPS
+from app.schemas.ticket import TicketResponse
+from app.schemas.user import UserSummary
+
+# Precomputed once: the ORM attributes a TicketResponse is built from
+TICKET_FIELDS = tuple(TicketResponse.model_fields)
+USER_SUMMARY_FIELDS = tuple(UserSummary.model_fields)
+_ticket_values = attrgetter(*TICKET_FIELDS)
+_user_values = attrgetter(*USER_SUMMARY_FIELDS)
+
+
+def ticket_dict(ticket: Any, expand: Collection[str] = ()) -> dict[str, Any]:
+    """Read response fields straight off an ORM row; it is already valid, so no pydantic validation.
+
+    Relationships are only touched when expanded, since they must have been eager-loaded."""
+    data = dict(zip(TICKET_FIELDS, _ticket_values(ticket)))
+    for relationship in EXPANDABLE_RELATIONSHIPS:
+        user = getattr(ticket, relationship) if relationship in expand else None
+        data[relationship] = (
+            dict(zip(USER_SUMMARY_FIELDS, _user_values(user))) if user is not None else None
+        )
+    return data
+
+
+def ticket_dicts(tickets: Iterable[Any], expand: Collection[str] = ()) -> list[dict[str, Any]]:
+    return [ticket_dict(ticket, expand) for ticket in tickets]
+
+
+def json_response(payload: Any, headers: Optional[dict[str, str]] = None) -> Response:
+    """Encode with pydantic-core's Rust serializer and bypass FastAPI's response_model re-validation."""
+    with timed("serialize"):
+        content = to_json(payload)
+    return Response(content=content, media_type="application/json", headers=headers)
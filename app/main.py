@@ -1,24 +1,50 @@
 """HelpVia API - Main Application Entry Point"""
-import logging
+
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import auth, tickets
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.api import auth, reports, tickets
+from app.core.admission import AdmissionMiddleware
+from app.core.cache import auth_cache_stats
 from app.core.config import settings
-from app.core.database import Base, engine
-from app.core.logging_config import setup_logging
+from app.core.database import AsyncSessionLocal, engine, read_engine
+from app.core.logging_config import RequestContextMiddleware, setup_logging, stop_logging
+from app.core.maintenance import scheduled_jobs
+from app.core.metrics import MetricsMiddleware, instrument_engine, metrics
+from app.core.migrations import ensure_schema
+from app.core.scheduler import Scheduler
+from app.core.security import HashingPoolBusy, password_hasher
 
 logger = setup_logging()
+instrument_engine(engine, "primary")
+if read_engine is not engine:
+    instrument_engine(read_engine, "replica")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting HelpVia API...")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await ensure_schema(engine)
     logger.info("Database ready")
+    # Safe on every worker: the job_leases row lets one of them run each job at a time
+    scheduler = (
+        Scheduler(AsyncSessionLocal, scheduled_jobs()) if settings.SCHEDULER_ENABLED else None
+    )
+    if scheduler:
+        scheduler.start()
     yield
     logger.info("Shutting down...")
+    if scheduler:
+        await scheduler.stop()
+    password_hasher.shutdown()
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+    stop_logging()
+
 
 app = FastAPI(
     title="HelpVia API",
@@ -27,6 +53,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Innermost, so CORS headers still reach a shed request and the metrics count its 503
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -34,14 +62,36 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestContextMiddleware)
+
+
+@app.exception_handler(HashingPoolBusy)
+async def hashing_pool_busy_handler(request: Request, exc: HashingPoolBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": "1.0.0"}
+    return {"status": "healthy", "version": "1.0.0", "auth_cache": auth_cache_stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    if not settings.METRICS_ENABLED:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to HelpVia API", "docs": "/docs"}
 
+
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(tickets.router, prefix="/api/v1/tickets", tags=["Tickets"])
+app.include_router(reports.router, prefix="/api/v1/reports", tags=["Reports"])
@@ -1,4 +1,32 @@
 """Database models"""
+
+from app.models.job_lease import JobLease
+from app.models.schema_version import SchemaVersion
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.ticket_action import TicketActionEntry
+from app.models.ticket_archive import TicketActionArchive, TicketArchive
+from app.models.ticket_counter import TicketCounter
+from app.models.ticket_report import (
+    TicketAssigneeDailyRollup,
+    TicketAssigneeMonthlyRollup,
+    TicketDailyRollup,
+    TicketReportDirtyDay,
+)
 from app.models.user import User
-from app.models.ticket import Ticket, TicketStatus, TicketPriority
-__all__ = ["User", "Ticket", "TicketStatus", "TicketPriority"]
+
+__all__ = [
+    "User",
+    "Ticket",
+    "TicketStatus",
+    "TicketPriority",
+    "TicketActionEntry",
+    "TicketArchive",
+    "TicketActionArchive",
+    "TicketCounter",
+    "TicketDailyRollup",
+    "TicketAssigneeDailyRollup",
+    "TicketAssigneeMonthlyRollup",
+    "TicketReportDirtyDay",
+    "JobLease",
+    "SchemaVersion",
+]
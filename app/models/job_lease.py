@@ -0,0 +1,16 @@
+"""Job lease model"""
+
+from sqlalchemy import Column, DateTime, String
+
+from app.core.database import Base
+
+
+class JobLease(Base):
+    """One row per scheduled job: whoever holds an unexpired lease is the only worker allowed to run it.
+    After a run the holder leaves it expiring at the job's next due time."""
+
+    __tablename__ = "job_leases"
+    name = Column(String(50), primary_key=True)
+    owner = Column(String(255), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    last_finished_at = Column(DateTime)
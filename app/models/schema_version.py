@@ -0,0 +1,15 @@
+"""Schema version model"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer
+
+from app.core.database import Base
+
+
+class SchemaVersion(Base):
+    """Single row recording the last migration applied; checked on every worker start."""
+
+    __tablename__ = "schema_version"
+    version = Column(Integer, primary_key=True)
+    applied_at = Column(DateTime, default=datetime.utcnow, nullable=False)
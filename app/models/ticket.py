@@ -1,11 +1,14 @@
 """Ticket database model"""
-from datetime import datetime
-import json
+
 import enum
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, ForeignKey
+from datetime import datetime
+
+from sqlalchemy import DDL, Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text, event
 from sqlalchemy.orm import relationship
+
 from app.core.database import Base
 
+
 class TicketStatus(str, enum.Enum):
     OPEN = "open"
     IN_PROGRESS = "in_progress"
@@ -13,14 +16,41 @@ class TicketStatus(str, enum.Enum):
     CLOSED = "closed"
     ON_HOLD = "on_hold"
 
+
 class TicketPriority(str, enum.Enum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
     CRITICAL = "critical"
 
+
+# Relationships clients may ask to have embedded via ?expand=
+EXPANDABLE_RELATIONSHIPS = ("assigned_to", "created_by")
+
+
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        Index("ix_tickets_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tickets_updated_at_id", "updated_at", "id"),
+        # Agent queues and "my tickets"; also cover the user foreign keys
+        Index("ix_tickets_assigned_to_id_created_at_id", "assigned_to_id", "created_at", "id"),
+        Index("ix_tickets_created_by_id_created_at_id", "created_by_id", "created_at", "id"),
+        Index("ix_tickets_priority_created_at_id", "priority", "created_at", "id"),
+        # Closes per day for the reporting rollups and the archiver
+        Index("ix_tickets_status_closed_at", "status", "closed_at"),
+        # Open tickets not yet flagged, oldest first, for the SLA breach job
+        Index(
+            "ix_tickets_status_sla_breached_at_created_at_id",
+            "status",
+            "sla_breached_at",
+            "created_at",
+            "id",
+        ),
+        # Without it SQLite hands out max(id) + 1, reissuing the ids of archived and deleted tickets
+        {"sqlite_autoincrement": True},
+    )
     id = Column(Integer, primary_key=True, index=True)
     summary = Column(String(255), nullable=False, index=True)
     description = Column(Text)
@@ -29,25 +59,35 @@ class Ticket(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     closed_at = Column(DateTime)
+    # Set once by the scheduler when the ticket outlives its priority's SLA while still open
+    sla_breached_at = Column(DateTime)
+    # Legacy action history; superseded by ticket_actions and drained by app.core.migrations
     actions_json = Column(Text, default="{}")
+    # Bumped by the ORM on every UPDATE; backs ticket ETags
+    version = Column(Integer, default=1, server_default="1", nullable=False)
     assigned_to_id = Column(Integer, ForeignKey("users.id"))
     created_by_id = Column(Integer, ForeignKey("users.id"))
-    assigned_to = relationship("User", foreign_keys=[assigned_to_id], back_populates="assigned_tickets")
-    created_by = relationship("User", foreign_keys=[created_by_id], back_populates="created_tickets")
-    
-    @property
-    def actions(self) -> dict:
-        try:
-            return json.loads(self.actions_json) if self.actions_json else {}
-        except:
-            return {}
-    
-    @actions.setter
-    def actions(self, value: dict):
-        self.actions_json = json.dumps(value) if value else "{}"
-    
-    def add_action(self, action: str, user: str, timestamp=None):
-        timestamp = timestamp or datetime.utcnow()
-        current = self.actions
-        current[timestamp.isoformat()] = {"action": action, "user": user, "timestamp": timestamp.isoformat()}
-        self.actions = current
+    assigned_to = relationship(
+        "User", foreign_keys=[assigned_to_id], back_populates="assigned_tickets"
+    )
+    created_by = relationship(
+        "User", foreign_keys=[created_by_id], back_populates="created_tickets"
+    )
+    __mapper_args__ = {"version_id_col": version}
+
+
+# Full-text search: a standalone FTS5 table on SQLite (kept in sync by TicketSearchRepository),
+# a FULLTEXT index on MySQL (maintained by InnoDB itself)
+CREATE_TICKETS_FTS = DDL(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts USING fts5(summary, description)"
+)
+ADD_TICKETS_FULLTEXT = DDL(
+    "ALTER TABLE tickets ADD FULLTEXT INDEX ft_tickets_summary_description (summary, description)"
+)
+event.listen(Ticket.__table__, "after_create", CREATE_TICKETS_FTS.execute_if(dialect="sqlite"))
+event.listen(Ticket.__table__, "after_create", ADD_TICKETS_FULLTEXT.execute_if(dialect="mysql"))
+event.listen(
+    Ticket.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS tickets_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,20 @@
+"""Ticket action log model"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+
+from app.core.database import Base
+
+
+class TicketActionEntry(Base):
+    __tablename__ = "ticket_actions"
+    __table_args__ = (
+        Index("ix_ticket_actions_ticket_id_id", "ticket_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
+    id = Column(Integer, primary_key=True)
+    ticket_id = Column(Integer, ForeignKey("tickets.id", ondelete="CASCADE"), nullable=False)
+    action = Column(Text, nullable=False)
+    user = Column(String(50), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,54 @@
+"""Archived ticket models
+
+Closed tickets past the retention window move here, with their action logs, so the hot tables only
+hold recent work. Tickets keep their original ids; actions are numbered afresh in the archive, in
+their original order. Both are read-only.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+from app.models.ticket import TicketPriority, TicketStatus
+
+
+class TicketArchive(Base):
+    __tablename__ = "tickets_archive"
+    __table_args__ = (
+        Index("ix_tickets_archive_created_at_id", "created_at", "id"),
+        Index("ix_tickets_archive_updated_at_id", "updated_at", "id"),
+        Index(
+            "ix_tickets_archive_assigned_to_id_created_at_id", "assigned_to_id", "created_at", "id"
+        ),
+        Index(
+            "ix_tickets_archive_created_by_id_created_at_id", "created_by_id", "created_at", "id"
+        ),
+        Index("ix_tickets_archive_closed_at", "closed_at"),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    summary = Column(String(255), nullable=False)
+    description = Column(Text)
+    status = Column(Enum(TicketStatus), nullable=False)
+    priority = Column(Enum(TicketPriority), nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    closed_at = Column(DateTime)
+    sla_breached_at = Column(DateTime)
+    version = Column(Integer, nullable=False)
+    assigned_to_id = Column(Integer, ForeignKey("users.id"))
+    created_by_id = Column(Integer, ForeignKey("users.id"))
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    assigned_to = relationship("User", foreign_keys=[assigned_to_id], viewonly=True)
+    created_by = relationship("User", foreign_keys=[created_by_id], viewonly=True)
+
+
+class TicketActionArchive(Base):
+    __tablename__ = "ticket_actions_archive"
+    __table_args__ = (Index("ix_ticket_actions_archive_ticket_id_id", "ticket_id", "id"),)
+    id = Column(Integer, primary_key=True)
+    ticket_id = Column(Integer, nullable=False)
+    action = Column(Text, nullable=False)
+    user = Column(String(50), nullable=False)
+    created_at = Column(DateTime, nullable=False)
@@ -0,0 +1,14 @@
+"""Ticket counter model"""
+
+from sqlalchemy import Column, Integer, String
+
+from app.core.database import Base
+
+
+class TicketCounter(Base):
+    """Running ticket totals keyed by dimension, e.g. ("status", "open") or ("assignee", "42")."""
+
+    __tablename__ = "ticket_counters"
+    scope = Column(String(20), primary_key=True)
+    key = Column(String(50), primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
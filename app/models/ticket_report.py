@@ -0,0 +1,72 @@
+"""Reporting rollup models
+
+Daily aggregates behind /api/v1/reports. ReportRepository.refresh recomputes only the days that
+changed, so a report over a year reads a few hundred rows per series instead of scanning tickets.
+"""
+
+from sqlalchemy import Column, Date, DateTime, Enum, Float, Integer
+
+from app.core.database import Base
+from app.models.ticket import TicketPriority
+
+# Time-to-close histogram: (column, upper bound in seconds); the last bucket is open-ended
+CLOSE_BUCKETS = (
+    ("closed_within_1h", 3600),
+    ("closed_within_4h", 4 * 3600),
+    ("closed_within_1d", 86400),
+    ("closed_within_3d", 3 * 86400),
+    ("closed_within_7d", 7 * 86400),
+    ("closed_within_30d", 30 * 86400),
+    ("closed_after_30d", None),
+)
+# Assignee key for tickets closed while unassigned; a primary key column cannot be NULL
+UNASSIGNED = 0
+
+
+class TicketDailyRollup(Base):
+    """Tickets opened and closed per day and priority; the backlog is the running sum of the difference."""
+
+    __tablename__ = "ticket_daily_rollups"
+    day = Column(Date, primary_key=True)
+    priority = Column(Enum(TicketPriority), primary_key=True)
+    opened = Column(Integer, default=0, nullable=False)
+    closed = Column(Integer, default=0, nullable=False)
+    refreshed_at = Column(DateTime, nullable=False)
+
+
+class CloseTimeColumns:
+    """Tickets closed, their total time to close and its CLOSE_BUCKETS histogram."""
+
+    closed = Column(Integer, default=0, nullable=False)
+    close_seconds = Column(Float, default=0, nullable=False)
+    closed_within_1h = Column(Integer, default=0, nullable=False)
+    closed_within_4h = Column(Integer, default=0, nullable=False)
+    closed_within_1d = Column(Integer, default=0, nullable=False)
+    closed_within_3d = Column(Integer, default=0, nullable=False)
+    closed_within_7d = Column(Integer, default=0, nullable=False)
+    closed_within_30d = Column(Integer, default=0, nullable=False)
+    closed_after_30d = Column(Integer, default=0, nullable=False)
+
+
+class TicketAssigneeDailyRollup(CloseTimeColumns, Base):
+    """Close times per day and assignee."""
+
+    __tablename__ = "ticket_assignee_daily_rollups"
+    day = Column(Date, primary_key=True)
+    assigned_to_id = Column(Integer, primary_key=True)
+
+
+class TicketAssigneeMonthlyRollup(CloseTimeColumns, Base):
+    """The daily assignee rollup summed per calendar month (keyed by its first day), so a year-long
+    report reads twelve rows per assignee rather than 365."""
+
+    __tablename__ = "ticket_assignee_monthly_rollups"
+    month = Column(Date, primary_key=True)
+    assigned_to_id = Column(Integer, primary_key=True)
+
+
+class TicketReportDirtyDay(Base):
+    """Days a delete or a re-close changed without leaving a newer updated_at to find them by."""
+
+    __tablename__ = "ticket_report_dirty_days"
+    day = Column(Date, primary_key=True)
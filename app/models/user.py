@@ -1,9 +1,13 @@
 """User database model"""
+
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, String
 from sqlalchemy.orm import relationship
+
 from app.core.database import Base
 
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
@@ -15,5 +19,9 @@ class User(Base):
     is_superuser = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-    assigned_tickets = relationship("Ticket", foreign_keys="Ticket.assigned_to_id", back_populates="assigned_to")
-    created_tickets = relationship("Ticket", foreign_keys="Ticket.created_by_id", back_populates="created_by")
+    assigned_tickets = relationship(
+        "Ticket", foreign_keys="Ticket.assigned_to_id", back_populates="assigned_to"
+    )
+    created_tickets = relationship(
+        "Ticket", foreign_keys="Ticket.created_by_id", back_populates="created_by"
+    )
@@ -0,0 +1,361 @@
+"""Reporting rollup repository"""
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import (
+    Date,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    type_coerce,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.ticket_archive import TicketArchive
+from app.models.ticket_report import (
+    CLOSE_BUCKETS,
+    UNASSIGNED,
+    TicketAssigneeDailyRollup,
+    TicketAssigneeMonthlyRollup,
+    TicketDailyRollup,
+    TicketReportDirtyDay,
+)
+
+# Tickets updated this long before the last refresh are looked at again, so a write stamped just
+# before a refresh started but committed after it is not missed
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def _day(column):
+    return type_coerce(func.date(column), Date)
+
+
+def _month(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _day_runs(days: Iterable[date], max_days: int) -> Iterator[tuple[date, date]]:
+    """Consecutive days as inclusive (first, last) ranges of at most max_days."""
+    first = last = None
+    for day in sorted(days):
+        if first is not None and day == last + timedelta(days=1) and (day - first).days < max_days:
+            last = day
+            continue
+        if first is not None:
+            yield first, last
+        first = last = day
+    if first is not None:
+        yield first, last
+
+
+def close_time_percentile(buckets: Sequence[int], fraction: float) -> Optional[float]:
+    """Estimate a time-to-close percentile in seconds from CLOSE_BUCKETS counts, interpolating
+    linearly within the bucket it falls in; the open-ended last bucket reports its lower bound."""
+    total = sum(buckets)
+    if not total:
+        return None
+    target, seen, lower = fraction * total, 0, 0.0
+    for count, (_, upper) in zip(buckets, CLOSE_BUCKETS):
+        if count and seen + count >= target:
+            if upper is None:
+                return lower
+            return lower + (upper - lower) * (target - seen) / count
+        seen += count
+        lower = upper or lower
+    return lower
+
+
+class ReportRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def mark_dirty(self, moments: Iterable[Optional[datetime]]) -> None:
+        """Queue the days of these timestamps for recomputation, inside the caller's transaction."""
+        days = sorted({moment.date() for moment in moments if moment is not None})
+        if not days:
+            return
+        dialect = self.db.get_bind().dialect.name
+        rows = [{"day": day} for day in days]
+        if dialect == "sqlite":
+            await self.db.execute(
+                sqlite_insert(TicketReportDirtyDay).on_conflict_do_nothing(), rows
+            )
+        elif dialect == "mysql":
+            await self.db.execute(mysql_insert(TicketReportDirtyDay).prefix_with("IGNORE"), rows)
+        else:
+            await self._insert_missing_days(days)
+
+    async def _insert_missing_days(self, days: list[date]) -> None:
+        existing = set(
+            (
+                await self.db.execute(
+                    select(TicketReportDirtyDay.day).where(TicketReportDirtyDay.day.in_(days))
+                )
+            ).scalars()
+        )
+        for day in days:
+            if day in existing:
+                continue
+            try:
+                async with self.db.begin_nested():
+                    await self.db.execute(insert(TicketReportDirtyDay).values(day=day))
+            except IntegrityError:
+                # Marked by a concurrent transaction; only the savepoint was rolled back
+                pass
+
+    async def refreshed_at(self) -> Optional[datetime]:
+        return (await self.db.execute(select(func.max(TicketDailyRollup.refreshed_at)))).scalar()
+
+    async def refresh(self, full: bool = False, chunk_days: int = 31) -> int:
+        """Recompute the rollups for every day that changed since the last refresh (all days when
+        `full` or on the first run), chunk_days per transaction; returns the number of days recomputed.
+        """
+        started = datetime.utcnow()
+        watermark = None if full else await self.refreshed_at()
+        dirty = set((await self.db.execute(select(TicketReportDirtyDay.day))).scalars())
+        if watermark is None:
+            days = dirty | set(await self._all_days(started.date()))
+        else:
+            days = dirty | await self._changed_days(watermark - REFRESH_OVERLAP)
+        recomputed = 0
+        for first, last in _day_runs(days, chunk_days):
+            await self._recompute(first, last, started)
+            await self.db.commit()
+            recomputed += (last - first).days + 1
+        return recomputed
+
+    async def _all_days(self, today: date) -> list[date]:
+        starts = []
+        for column in (Ticket.created_at, TicketArchive.created_at):
+            starts.append((await self.db.execute(select(func.min(column)))).scalar())
+        starts.append((await self.db.execute(select(func.min(TicketDailyRollup.day)))).scalar())
+        known = [
+            value.date() if isinstance(value, datetime) else value
+            for value in starts
+            if value is not None
+        ]
+        if not known:
+            return []
+        first = min(known)
+        return [first + timedelta(days=n) for n in range((today - first).days + 1)]
+
+    async def _changed_days(self, since: datetime) -> set:
+        # Creates, closes, reopens and priority or assignee changes all move updated_at; archived rows never change
+        result = await self.db.execute(
+            select(Ticket.created_at, Ticket.closed_at).where(Ticket.updated_at >= since)
+        )
+        days = set()
+        for created_at, closed_at in result.all():
+            days.add(created_at.date())
+            if closed_at is not None:
+                days.add(closed_at.date())
+        return days
+
+    def _seconds_to_close(self, model):
+        if self.db.get_bind().dialect.name == "mysql":
+            return func.timestampdiff(literal_column("SECOND"), model.created_at, model.closed_at)
+        return (func.julianday(model.closed_at) - func.julianday(model.created_at)) * 86400
+
+    async def _recompute(self, first: date, last: date, refreshed_at: datetime) -> None:
+        """Replace the rollups for first..last from both ticket tiers, in the caller's transaction."""
+        start, end = datetime.combine(first, time()), datetime.combine(
+            last + timedelta(days=1), time()
+        )
+        # Claim the dirty marks first: this takes the write lock, so a mark made after our reads waits and survives
+        await self.db.execute(
+            delete(TicketReportDirtyDay).where(TicketReportDirtyDay.day.between(first, last))
+        )
+        daily: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+        by_assignee: dict[tuple, dict] = {}
+        for model in (Ticket, TicketArchive):
+            opened = _day(model.created_at)
+            result = await self.db.execute(
+                select(opened, model.priority, func.count())
+                .where(model.created_at >= start, model.created_at < end)
+                .group_by(opened, model.priority)
+            )
+            for day, priority, count in result.all():
+                daily[(day, priority)][0] += count
+            closed = _day(model.closed_at)
+            closes = [
+                model.status == TicketStatus.CLOSED,
+                model.closed_at >= start,
+                model.closed_at < end,
+            ]
+            result = await self.db.execute(
+                select(closed, model.priority, func.count())
+                .where(*closes)
+                .group_by(closed, model.priority)
+            )
+            for day, priority, count in result.all():
+                daily[(day, priority)][1] += count
+            seconds = self._seconds_to_close(model)
+            bucket = case(
+                *(
+                    (seconds < upper, n)
+                    for n, (_, upper) in enumerate(CLOSE_BUCKETS)
+                    if upper is not None
+                ),
+                else_=len(CLOSE_BUCKETS) - 1,
+            )
+            assignee = func.coalesce(model.assigned_to_id, UNASSIGNED)
+            result = await self.db.execute(
+                select(closed, assignee, bucket, func.count(), func.sum(seconds))
+                .where(*closes)
+                .group_by(closed, assignee, bucket)
+            )
+            for day, assigned_to_id, n, count, total_seconds in result.all():
+                row = by_assignee.setdefault(
+                    (day, assigned_to_id),
+                    {
+                        "day": day,
+                        "assigned_to_id": assigned_to_id,
+                        "closed": 0,
+                        "close_seconds": 0.0,
+                        **{name: 0 for name, _ in CLOSE_BUCKETS},
+                    },
+                )
+                row["closed"] += count
+                row["close_seconds"] += float(total_seconds or 0)
+                row[CLOSE_BUCKETS[n][0]] += count
+        await self.db.execute(
+            delete(TicketDailyRollup).where(TicketDailyRollup.day.between(first, last))
+        )
+        await self.db.execute(
+            delete(TicketAssigneeDailyRollup).where(
+                TicketAssigneeDailyRollup.day.between(first, last)
+            )
+        )
+        if daily:
+            await self.db.execute(
+                insert(TicketDailyRollup),
+                [
+                    {
+                        "day": day,
+                        "priority": priority,
+                        "opened": opened,
+                        "closed": closed,
+                        "refreshed_at": refreshed_at,
+                    }
+                    for (day, priority), (opened, closed) in daily.items()
+                ],
+            )
+        if by_assignee:
+            await self.db.execute(insert(TicketAssigneeDailyRollup), list(by_assignee.values()))
+        month = _month(first)
+        while month <= last:
+            await self._recompute_month(month)
+            month = _next_month(month)
+
+    async def _recompute_month(self, month: date) -> None:
+        daily, monthly = TicketAssigneeDailyRollup, TicketAssigneeMonthlyRollup
+        columns = ["closed", "close_seconds", *(name for name, _ in CLOSE_BUCKETS)]
+        await self.db.execute(delete(monthly).where(monthly.month == month))
+        sums = (
+            select(
+                literal(month, Date),
+                daily.assigned_to_id,
+                *(func.sum(getattr(daily, name)) for name in columns),
+            )
+            .where(daily.day >= month, daily.day < _next_month(month))
+            .group_by(daily.assigned_to_id)
+        )
+        await self.db.execute(
+            insert(monthly).from_select(["month", "assigned_to_id", *columns], sums)
+        )
+
+    async def volume(
+        self, since: date, until: date, priorities: Optional[Sequence[TicketPriority]] = None
+    ) -> list[Row]:
+        """(day, opened, closed) for each day with activity in since..until."""
+        query = select(
+            TicketDailyRollup.day,
+            func.sum(TicketDailyRollup.opened),
+            func.sum(TicketDailyRollup.closed),
+        ).where(TicketDailyRollup.day.between(since, until))
+        if priorities:
+            query = query.where(TicketDailyRollup.priority.in_(priorities))
+        result = await self.db.execute(
+            query.group_by(TicketDailyRollup.day).order_by(TicketDailyRollup.day)
+        )
+        return result.all()
+
+    async def backlog(
+        self, since: date, until: date
+    ) -> tuple[dict[TicketPriority, int], list[Row]]:
+        """Tickets not yet closed at the start of `since` by priority, and the daily (day, priority,
+        opened, closed) moves after it; the caller accumulates them into a series."""
+        before = (
+            select(
+                TicketDailyRollup.priority,
+                func.sum(TicketDailyRollup.opened - TicketDailyRollup.closed),
+            )
+            .where(TicketDailyRollup.day < since)
+            .group_by(TicketDailyRollup.priority)
+        )
+        opening = {
+            priority: int(count) for priority, count in (await self.db.execute(before)).all()
+        }
+        moves = (
+            select(
+                TicketDailyRollup.day,
+                TicketDailyRollup.priority,
+                TicketDailyRollup.opened,
+                TicketDailyRollup.closed,
+            )
+            .where(TicketDailyRollup.day.between(since, until))
+            .order_by(TicketDailyRollup.day)
+        )
+        return opening, (await self.db.execute(moves)).all()
+
+    async def time_to_close(self, since: date, until: date) -> list[tuple]:
+        """Per assignee over since..until, busiest first: (assigned_to_id, closed, close_seconds,
+        *bucket counts). Whole months come from the monthly rollup, the partial ones at either end by day.
+        """
+        first_month = since if since.day == 1 else _next_month(since)
+        end_month = _month(until + timedelta(days=1))
+        if first_month < end_month:
+            spans = [
+                (TicketAssigneeDailyRollup, since, first_month),
+                (TicketAssigneeMonthlyRollup, first_month, end_month),
+                (TicketAssigneeDailyRollup, end_month, until + timedelta(days=1)),
+            ]
+        else:
+            spans = [(TicketAssigneeDailyRollup, since, until + timedelta(days=1))]
+        totals: dict[int, list[float]] = {}
+        for rollup, start, end in spans:
+            if start >= end:
+                continue
+            key = rollup.day if rollup is TicketAssigneeDailyRollup else rollup.month
+            sums = [
+                func.sum(rollup.closed),
+                func.sum(rollup.close_seconds),
+                *(func.sum(getattr(rollup, name)) for name, _ in CLOSE_BUCKETS),
+            ]
+            result = await self.db.execute(
+                select(rollup.assigned_to_id, *sums)
+                .where(key >= start, key < end)
+                .group_by(rollup.assigned_to_id)
+            )
+            for assigned_to_id, *values in result.all():
+                running = totals.setdefault(assigned_to_id, [0] * len(values))
+                for n, value in enumerate(values):
+                    running[n] += value or 0
+        rows = [(assigned_to_id, *values) for assigned_to_id, values in totals.items()]
+        return sorted(rows, key=lambda row: (-row[1], row[0]))
@@ -0,0 +1,63 @@
+"""Ticket action log repository"""
+
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.events import TICKET_ACTION, broadcaster
+from app.models.ticket_action import TicketActionEntry
+from app.models.ticket_archive import TicketActionArchive
+
+
+class TicketActionRepository:
+    def __init__(self, db: AsyncSession, archived: bool = False):
+        self.db = db
+        # Reads of an archived ticket's log go to the archive table; writes always target the live log
+        self.model = TicketActionArchive if archived else TicketActionEntry
+
+    def log(self, ticket_id: int, action: str, user: str) -> TicketActionEntry:
+        # Staged on the session so it commits with whatever ticket change it describes
+        entry = TicketActionEntry(ticket_id=ticket_id, action=action, user=user)
+        self.db.add(entry)
+        return entry
+
+    async def create(self, ticket_id: int, action: str, user: str) -> TicketActionEntry:
+        entry = self.log(ticket_id, action, user)
+        await self.db.commit()
+        broadcaster.publish(
+            TICKET_ACTION,
+            {
+                "ticket_id": ticket_id,
+                "id": entry.id,
+                "action": action,
+                "user": user,
+                "created_at": entry.created_at,
+            },
+        )
+        return entry
+
+    async def get_for_ticket(
+        self, ticket_id: int, skip: int = 0, limit: Optional[int] = 100
+    ) -> list[TicketActionEntry]:
+        query = (
+            select(self.model)
+            .where(self.model.ticket_id == ticket_id)
+            .order_by(self.model.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    async def last_id(self, ticket_id: int) -> Optional[int]:
+        result = await self.db.execute(
+            select(func.max(self.model.id)).where(self.model.ticket_id == ticket_id)
+        )
+        return result.scalar()
+
+    async def count_for_ticket(self, ticket_id: int) -> int:
+        result = await self.db.execute(
+            select(func.count(self.model.id)).where(self.model.ticket_id == ticket_id)
+        )
+        return result.scalar() or 0
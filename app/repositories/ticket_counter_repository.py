@@ -0,0 +1,147 @@
+"""Ticket counter repository"""
+
+from collections import Counter
+from collections.abc import Iterable
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ticket import Ticket, TicketStatus
+from app.models.ticket_archive import TicketArchive
+from app.models.ticket_counter import TicketCounter
+
+STATUS = "status"
+ASSIGNEE = "assignee"
+UNASSIGNED = "none"
+# Bumped by every ticket write; list ETags are derived from it
+COLLECTION_VERSION = ("collection", "version")
+# Tickets moved to tickets_archive; the status and assignee counters cover the hot table only
+ARCHIVED = ("archived", "total")
+
+
+def counter_keys(
+    status: TicketStatus, assigned_to_id: Optional[int]
+) -> tuple[tuple[str, str], ...]:
+    return (
+        (STATUS, TicketStatus(status).value),
+        (ASSIGNEE, str(assigned_to_id) if assigned_to_id else UNASSIGNED),
+    )
+
+
+class TicketCounterRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def apply(self, deltas: Counter) -> None:
+        """Add deltas inside the caller's transaction; the caller commits alongside its ticket change."""
+        for (scope, key), delta in deltas.items():
+            if not delta:
+                continue
+            statement = self._upsert(scope, key, delta)
+            if statement is not None:
+                await self.db.execute(statement)
+            else:
+                await self._update_or_insert(scope, key, delta)
+
+    def _upsert(self, scope: str, key: str, delta: int):
+        """The dialect's single-statement increment, or None where it has none."""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            return (
+                sqlite_insert(TicketCounter)
+                .values(scope=scope, key=key, count=delta)
+                .on_conflict_do_update(
+                    index_elements=["scope", "key"], set_={"count": TicketCounter.count + delta}
+                )
+            )
+        if dialect == "mysql":
+            return (
+                mysql_insert(TicketCounter)
+                .values(scope=scope, key=key, count=delta)
+                .on_duplicate_key_update(count=TicketCounter.count + delta)
+            )
+        return None
+
+    async def _update_or_insert(self, scope: str, key: str, delta: int) -> None:
+        increment = (
+            update(TicketCounter)
+            .where(TicketCounter.scope == scope, TicketCounter.key == key)
+            .values(count=TicketCounter.count + delta)
+        )
+        if (await self.db.execute(increment)).rowcount:
+            return
+        try:
+            async with self.db.begin_nested():
+                await self.db.execute(
+                    insert(TicketCounter).values(scope=scope, key=key, count=delta)
+                )
+        except IntegrityError:
+            # Another transaction inserted the row first; only the savepoint was rolled back
+            await self.db.execute(increment)
+
+    async def count_statuses(self, statuses: Optional[Iterable[TicketStatus]] = None) -> int:
+        query = select(func.coalesce(func.sum(TicketCounter.count), 0)).where(
+            TicketCounter.scope == STATUS
+        )
+        if statuses is not None:
+            query = query.where(TicketCounter.key.in_([TicketStatus(s).value for s in statuses]))
+        result = await self.db.execute(query)
+        return result.scalar() or 0
+
+    async def archived_total(self) -> int:
+        scope, key = ARCHIVED
+        result = await self.db.execute(
+            select(TicketCounter.count).where(
+                TicketCounter.scope == scope, TicketCounter.key == key
+            )
+        )
+        return result.scalar() or 0
+
+    async def collection_version(self) -> int:
+        scope, key = COLLECTION_VERSION
+        result = await self.db.execute(
+            select(TicketCounter.count).where(
+                TicketCounter.scope == scope, TicketCounter.key == key
+            )
+        )
+        return result.scalar() or 0
+
+    async def get_scope(self, scope: str) -> dict[str, int]:
+        result = await self.db.execute(
+            select(TicketCounter.key, TicketCounter.count).where(
+                TicketCounter.scope == scope, TicketCounter.count != 0
+            )
+        )
+        return dict(result.all())
+
+    async def rebuild(self) -> None:
+        """Recount every dimension from the ticket tables and replace the stored totals."""
+        deltas: Counter = Counter()
+        result = await self.db.execute(
+            select(Ticket.status, Ticket.assigned_to_id, func.count(Ticket.id)).group_by(
+                Ticket.status, Ticket.assigned_to_id
+            )
+        )
+        for status, assigned_to_id, count in result.all():
+            for key in counter_keys(status, assigned_to_id):
+                deltas[key] += count
+        deltas[ARCHIVED] = (
+            await self.db.execute(select(func.count()).select_from(TicketArchive))
+        ).scalar_one()
+        # The collection version must never move backwards, or stale ETags could match again
+        await self.db.execute(
+            delete(TicketCounter).where(TicketCounter.scope != COLLECTION_VERSION[0])
+        )
+        if deltas:
+            await self.db.execute(
+                insert(TicketCounter),
+                [
+                    {"scope": scope, "key": key, "count": count}
+                    for (scope, key), count in deltas.items()
+                ],
+            )
+        await self.db.commit()
@@ -1,54 +1,773 @@
 """Ticket repository"""
-from datetime import datetime
-from typing import Optional, List
-from sqlalchemy import select, func
+
+import asyncio
+import heapq
+from collections import Counter
+from collections.abc import AsyncIterator, Collection, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import (
+    Select,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.ticket import Ticket, TicketStatus
+from sqlalchemy.orm import joinedload
+
+from app.core.events import (
+    TICKET_CREATED,
+    TICKET_DELETED,
+    TICKET_UPDATED,
+    TICKETS_ARCHIVED,
+    TICKETS_BULK_CREATED,
+    TICKETS_BULK_DELETED,
+    TICKETS_BULK_UPDATED,
+    TICKETS_SLA_BREACHED,
+    broadcaster,
+)
+from app.core.export import EXPORT_COLUMNS
+from app.core.pagination import encode_cursor
+from app.core.serialization import ticket_dict
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.ticket_action import TicketActionEntry
+from app.models.ticket_archive import TicketActionArchive, TicketArchive
+from app.repositories.report_repository import ReportRepository
+from app.repositories.ticket_action_repository import TicketActionRepository
+from app.repositories.ticket_counter_repository import (
+    ARCHIVED,
+    COLLECTION_VERSION,
+    TicketCounterRepository,
+    counter_keys,
+)
+from app.repositories.ticket_search_repository import TicketSearchRepository
+
+
+class VersionConflict(Exception):
+    """The ticket's version no longer matches the one the caller edited."""
+
+
+SORTS = ("created_at", "updated_at", "priority")
+# Statuses still waiting on someone, so still on the SLA clock
+SLA_STATUSES = (TicketStatus.OPEN, TicketStatus.IN_PROGRESS, TicketStatus.ON_HOLD)
+PRIORITY_RANK = {
+    TicketPriority.LOW: 0,
+    TicketPriority.MEDIUM: 1,
+    TicketPriority.HIGH: 2,
+    TicketPriority.CRITICAL: 3,
+}
+# Bound parameter each filter is compared against; IN lists expand, so any number of values shares a statement
+FILTER_CLAUSES = {
+    "statuses": lambda model: model.status.in_(bindparam("statuses", expanding=True)),
+    "priorities": lambda model: model.priority.in_(bindparam("priorities", expanding=True)),
+    "assigned_to_id": lambda model: model.assigned_to_id == bindparam("assigned_to_id"),
+    "involving_user_id": lambda model: or_(
+        model.assigned_to_id == bindparam("involving_user_id"),
+        model.created_by_id == bindparam("involving_user_id"),
+    ),
+    "created_since": lambda model: model.created_at >= bindparam("created_since"),
+    "created_before": lambda model: model.created_at < bindparam("created_before"),
+    "updated_since": lambda model: model.updated_at >= bindparam("updated_since"),
+    "updated_before": lambda model: model.updated_at < bindparam("updated_before"),
+}
+
+
+@dataclass(frozen=True)
+class TicketListFilter:
+    """Criteria and ordering for a ticket list; unset criteria are left out of the statement."""
+
+    statuses: tuple[TicketStatus, ...] = ()
+    priorities: tuple[TicketPriority, ...] = ()
+    assigned_to_id: Optional[int] = None
+    involving_user_id: Optional[int] = None  # assigned to or created by
+    created_since: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_since: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    sort: str = "created_at"
+    descending: bool = True
+
+    def params(self) -> dict[str, Any]:
+        return {
+            name: value
+            for name in FILTER_CLAUSES
+            if (value := getattr(self, name)) not in (None, ())
+        }
+
+    def sort_key(self, ticket) -> tuple:
+        at = ticket.updated_at if self.sort == "updated_at" else ticket.created_at
+        return (
+            (PRIORITY_RANK[ticket.priority], at, ticket.id)
+            if self.sort == "priority"
+            else (at, ticket.id)
+        )
+
+    def cursor(self, ticket) -> str:
+        key = self.sort_key(ticket)
+        return encode_cursor(*key[-2:], rank=key[0] if self.sort == "priority" else None)
+
+    def accepts_cursor(self, after: tuple) -> bool:
+        return len(after) == (3 if self.sort == "priority" else 2)
+
+
+def _sort_columns(sort: str, model=Ticket) -> tuple:
+    # Priority is stored by name, so rank it explicitly; the filter's index does the narrowing and
+    # the database sorts what matches, which is why priority order should be paired with a filter
+    if sort == "priority":
+        return (
+            case(*((model.priority == priority, rank) for priority, rank in PRIORITY_RANK.items())),
+            model.created_at,
+            model.id,
+        )
+    return (getattr(model, sort), model.id)
+
+
+# Statements built once per shape (tier, filters present, sort, paging mode, expansions) and reused with new
+# parameters, which also keeps every request of a shape on one entry of SQLAlchemy's compiled cache
+_list_statements: dict[tuple, Select] = {}
+_count_statements: dict[tuple, Select] = {}
+
+
+def list_statement(
+    filters: TicketListFilter, keyset: bool, expand: Collection[str] = (), model=Ticket
+) -> Select:
+    names = tuple(filters.params())
+    shape = (model, names, filters.sort, filters.descending, keyset, tuple(sorted(expand)))
+    query = _list_statements.get(shape)
+    if query is None:
+        columns = _sort_columns(filters.sort, model)
+        query = (
+            select(model)
+            .options(*(joinedload(getattr(model, relationship)) for relationship in shape[-1]))
+            .where(*(FILTER_CLAUSES[name](model) for name in names))
+        )
+        if keyset:
+            # Seek past the last row seen through the sort's index instead of scanning OFFSET rows
+            after = tuple_(
+                *(bindparam(f"after_{n}", type_=column.type) for n, column in enumerate(columns))
+            )
+            query = query.where(
+                tuple_(*columns) < after if filters.descending else tuple_(*columns) > after
+            )
+        else:
+            query = query.offset(bindparam("offset"))
+        query = query.order_by(
+            *(column.desc() if filters.descending else column.asc() for column in columns)
+        ).limit(bindparam("limit"))
+        query = _list_statements[shape] = query
+    return query
+
+
+def count_statement(filters: TicketListFilter, model=Ticket) -> Select:
+    shape = (model, tuple(filters.params()))
+    query = _count_statements.get(shape)
+    if query is None:
+        query = _count_statements[shape] = (
+            select(func.count())
+            .select_from(model)
+            .where(*(FILTER_CLAUSES[name](model) for name in shape[1]))
+        )
+    return query
+
 
 class TicketRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
-    
+        self.counters = TicketCounterRepository(db)
+        self.search = TicketSearchRepository(db)
+        self.reports = ReportRepository(db)
+
     async def create(self, ticket: Ticket) -> Ticket:
+        ticket.status = ticket.status or TicketStatus.OPEN
         self.db.add(ticket)
+        await self.db.flush()
+        await self.counters.apply(
+            Counter((*counter_keys(ticket.status, ticket.assigned_to_id), COLLECTION_VERSION))
+        )
+        await self.search.index([(ticket.id, ticket.summary, ticket.description)])
         await self.db.commit()
         await self.db.refresh(ticket)
+        broadcaster.publish(TICKET_CREATED, ticket_dict(ticket))
         return ticket
-    
-    async def get_by_id(self, ticket_id: int) -> Optional[Ticket]:
-        result = await self.db.execute(select(Ticket).where(Ticket.id == ticket_id))
-        return result.scalar_one_or_none()
-    
-    async def get_all(self, skip: int = 0, limit: int = 100, status: Optional[TicketStatus] = None) -> List[Ticket]:
-        query = select(Ticket)
-        if status:
-            query = query.where(Ticket.status == status)
-        query = query.offset(skip).limit(limit).order_by(Ticket.created_at.desc())
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
-    
-    async def get_open_tickets(self, skip: int = 0, limit: int = 100) -> List[Ticket]:
-        query = select(Ticket).where(Ticket.status.in_([TicketStatus.OPEN, TicketStatus.IN_PROGRESS])).offset(skip).limit(limit).order_by(Ticket.created_at.desc())
-        result = await self.db.execute(query)
+
+    async def bulk_create(self, rows: list[dict]) -> list[int]:
+        """Insert many tickets in one transaction, returning their ids in input order."""
+        if self.db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+            result = await self.db.execute(
+                insert(Ticket).returning(Ticket.id, sort_by_parameter_order=True), rows
+            )
+            ids = list(result.scalars().all())
+        else:
+            # Backends without RETURNING (MySQL): let the ORM fetch each generated id
+            tickets = [Ticket(**row) for row in rows]
+            self.db.add_all(tickets)
+            await self.db.flush()
+            ids = [ticket.id for ticket in tickets]
+        deltas: Counter = Counter([COLLECTION_VERSION])
+        for row in rows:
+            deltas.update(
+                counter_keys(row.get("status") or TicketStatus.OPEN, row.get("assigned_to_id"))
+            )
+        await self.counters.apply(deltas)
+        await self.search.index(
+            [
+                (ticket_id, row["summary"], row.get("description"))
+                for ticket_id, row in zip(ids, rows)
+            ]
+        )
+        await self.db.commit()
+        broadcaster.publish(TICKETS_BULK_CREATED, {"ids": ids})
+        return ids
+
+    async def get_by_id(
+        self, ticket_id: int, expand: Collection[str] = (), include_archived: bool = True
+    ) -> Optional[Ticket]:
+        """The ticket, or its read-only TicketArchive row once archived (only looked up on a hot miss)."""
+        result = await self.db.execute(self._select(expand).where(Ticket.id == ticket_id))
+        ticket = result.scalar_one_or_none()
+        if ticket is None and include_archived:
+            result = await self.db.execute(
+                self._select(expand, TicketArchive).where(TicketArchive.id == ticket_id)
+            )
+            ticket = result.scalar_one_or_none()
+        return ticket
+
+    async def get_many(
+        self, ticket_ids: Collection[int], expand: Collection[str] = ()
+    ) -> dict[int, Ticket]:
+        """Tickets by id from one IN query per tier; ids found in neither are absent from the result."""
+        found: dict[int, Ticket] = {}
+        for model in (Ticket, TicketArchive):
+            missing = [ticket_id for ticket_id in ticket_ids if ticket_id not in found]
+            if not missing:
+                break
+            result = await self.db.execute(self._select(expand, model).where(model.id.in_(missing)))
+            found.update((ticket.id, ticket) for ticket in result.scalars())
+        return found
+
+    def _select(self, expand: Collection[str] = (), model=Ticket):
+        # Many-to-one users are joined into the same statement, so expanding costs no extra round trips
+        return select(model).options(
+            *(joinedload(getattr(model, relationship)) for relationship in expand)
+        )
+
+    async def get_version(self, ticket_id: int) -> Optional[int]:
+        located = await self.locate(ticket_id)
+        return located[0] if located else None
+
+    async def locate(self, ticket_id: int) -> Optional[tuple[int, bool]]:
+        """(version, archived) for a ticket in either tier, or None."""
+        for model in (Ticket, TicketArchive):
+            version = (
+                await self.db.execute(select(model.version).where(model.id == ticket_id))
+            ).scalar_one_or_none()
+            if version is not None:
+                return version, model is TicketArchive
+        return None
+
+    async def is_archived(self, ticket_id: int) -> bool:
+        result = await self.db.execute(
+            select(TicketArchive.id).where(TicketArchive.id == ticket_id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def exists(self, ticket_id: int) -> bool:
+        result = await self.db.execute(select(Ticket.id).where(Ticket.id == ticket_id))
+        return result.scalar_one_or_none() is not None
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[TicketStatus] = None,
+        after: Optional[tuple[datetime, int]] = None,
+        expand: Collection[str] = (),
+    ) -> list[Ticket]:
+        return await self.find(
+            TicketListFilter(statuses=(status,) if status else ()), skip, limit, after, expand
+        )
+
+    async def get_open_tickets(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[datetime, int]] = None,
+        expand: Collection[str] = (),
+    ) -> list[Ticket]:
+        return await self.find(
+            TicketListFilter(statuses=(TicketStatus.OPEN, TicketStatus.IN_PROGRESS)),
+            skip,
+            limit,
+            after,
+            expand,
+        )
+
+    async def find(
+        self,
+        filters: TicketListFilter,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple] = None,
+        expand: Collection[str] = (),
+        include_archived: bool = False,
+    ) -> list[Ticket]:
+        """A page of tickets matching `filters`; `after` is the sort key of the previous page's last row.
+
+        With include_archived, each tier is queried through its own indexes for the rows that could
+        make the page, and the two sorted runs are merged."""
+        if not include_archived:
+            return await self._find(Ticket, filters, skip, limit, after, expand)
+        tiers = [
+            await self._find(model, filters, 0, skip + limit, after, expand)
+            for model in (Ticket, TicketArchive)
+        ]
+        merged = heapq.merge(*tiers, key=filters.sort_key, reverse=filters.descending)
+        return list(merged)[skip : skip + limit]
+
+    async def _find(
+        self,
+        model,
+        filters: TicketListFilter,
+        skip: int,
+        limit: int,
+        after: Optional[tuple],
+        expand: Collection[str],
+    ) -> list:
+        params = {**filters.params(), "limit": limit}
+        if after:
+            params.update((f"after_{n}", value) for n, value in enumerate(after))
+        else:
+            params["offset"] = skip
+        result = await self.db.execute(
+            list_statement(filters, keyset=bool(after), expand=expand, model=model), params
+        )
         return list(result.scalars().all())
-    
+
+    async def count_matching(
+        self, filters: TicketListFilter, include_archived: bool = False
+    ) -> int:
+        params = filters.params()
+        if set(params) <= {"statuses"}:
+            # Status alone (or nothing) is answered from the maintained counters without touching tickets
+            total = await self.counters.count_statuses(list(filters.statuses) or None)
+            # Only closed tickets are archived
+            if include_archived and (
+                not filters.statuses or TicketStatus.CLOSED in filters.statuses
+            ):
+                total += await self.counters.archived_total()
+            return total
+        total = (await self.db.execute(count_statement(filters), params)).scalar_one()
+        if include_archived:
+            total += (
+                await self.db.execute(count_statement(filters, TicketArchive), params)
+            ).scalar_one()
+        return total
+
+    async def stream_for_export(
+        self, filters: TicketListFilter = TicketListFilter(), batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[Any]]:
+        """Yield plain column tuples through a server-side cursor so memory stays flat however many rows match.
+
+        Rows match and are ordered as the same filter lists them."""
+        params = filters.params()
+        columns = _sort_columns(filters.sort)
+        query = (
+            select(*(getattr(Ticket, column) for column in EXPORT_COLUMNS))
+            .where(*(FILTER_CLAUSES[name](Ticket) for name in params))
+            .order_by(
+                *(column.desc() if filters.descending else column.asc() for column in columns)
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(query, params)
+        async for row in result:
+            yield row
+
     async def count_all(self, status: Optional[TicketStatus] = None) -> int:
-        query = select(func.count(Ticket.id))
-        if status:
-            query = query.where(Ticket.status == status)
-        result = await self.db.execute(query)
-        return result.scalar() or 0
-    
+        return await self.counters.count_statuses([status] if status else None)
+
+    async def count_statuses(self, statuses: list[TicketStatus]) -> int:
+        return await self.counters.count_statuses(statuses)
+
     async def update(self, ticket: Ticket) -> Ticket:
         ticket.updated_at = datetime.utcnow()
+        state = inspect(ticket)
+        text_changed = (
+            state.attrs.summary.history.has_changes()
+            or state.attrs.description.history.has_changes()
+        )
+        # A re-close moves closed_at off a day the report rollups have no other way to find. Read it
+        # before the counter query autoflushes the session, which clears the attribute history
+        old_closed_at = state.attrs.closed_at.history.deleted
+        await self.counters.apply(self._counter_moves(ticket))
+        await self.reports.mark_dirty(old_closed_at)
+        if text_changed:
+            await self.search.index([(ticket.id, ticket.summary, ticket.description)])
         await self.db.commit()
         await self.db.refresh(ticket)
+        broadcaster.publish(TICKET_UPDATED, ticket_dict(ticket))
         return ticket
-    
+
+    async def patch(
+        self, ticket_id: int, values: dict, user: str, expected_version: Optional[int] = None
+    ) -> Optional[Row]:
+        """Apply a partial update with one UPDATE ... RETURNING and return the new row (None if missing).
+
+        Raises VersionConflict when expected_version is given and stale. Status and assignee changes
+        also read the old values first, since the counters need to know what they move away from."""
+        values = {**values, "updated_at": datetime.utcnow()}
+        if values.get("status") == TicketStatus.CLOSED:
+            values["closed_at"] = values["updated_at"]
+        old = None
+        if "status" in values or "assigned_to_id" in values:
+            old = (
+                await self.db.execute(
+                    select(Ticket.status, Ticket.assigned_to_id, Ticket.version, Ticket.closed_at)
+                    .where(Ticket.id == ticket_id)
+                    .with_for_update()
+                )
+            ).one_or_none()
+            if old is None:
+                return None
+            expected_version = old.version if expected_version is None else expected_version
+        query = (
+            update(Ticket)
+            .where(Ticket.id == ticket_id)
+            .values(**values, version=Ticket.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if expected_version is not None:
+            query = query.where(Ticket.version == expected_version)
+        row = await self._update_returning(ticket_id, query)
+        if row is None:
+            await self.db.rollback()
+            if await self.exists(ticket_id):
+                raise VersionConflict(ticket_id)
+            return None
+        deltas = Counter([COLLECTION_VERSION])
+        if old is not None:
+            deltas.update(counter_keys(row.status, row.assigned_to_id))
+            deltas.subtract(counter_keys(old.status, old.assigned_to_id))
+        await self.counters.apply(deltas)
+        if "closed_at" in values and old is not None:
+            await self.reports.mark_dirty([old.closed_at])
+        if "summary" in values or "description" in values:
+            await self.search.index([(row.id, row.summary, row.description)])
+        if "status" in values:
+            TicketActionRepository(self.db).log(
+                ticket_id, f"Status changed to {row.status.value}", user
+            )
+        await self.db.commit()
+        broadcaster.publish(TICKET_UPDATED, ticket_dict(row))
+        return row
+
+    async def _update_returning(self, ticket_id: int, query) -> Optional[Row]:
+        columns = Ticket.__table__.columns
+        if self.db.get_bind().dialect.update_returning:
+            return (await self.db.execute(query.returning(*columns))).one_or_none()
+        # No RETURNING (MySQL): same transaction, so the follow-up SELECT sees exactly what we wrote
+        result = await self.db.execute(query)
+        if result.rowcount == 0:
+            return None
+        return (await self.db.execute(select(*columns).where(Ticket.id == ticket_id))).one()
+
+    def _selection(
+        self,
+        ids: Optional[list[int]] = None,
+        status: Optional[TicketStatus] = None,
+        priority: Optional[TicketPriority] = None,
+        assigned_to_id: Optional[int] = None,
+        created_before: Optional[datetime] = None,
+    ) -> list:
+        clauses = []
+        if ids is not None:
+            clauses.append(Ticket.id.in_(ids))
+        if status:
+            clauses.append(Ticket.status == status)
+        if priority:
+            clauses.append(Ticket.priority == priority)
+        if assigned_to_id is not None:
+            clauses.append(Ticket.assigned_to_id == assigned_to_id)
+        if created_before:
+            clauses.append(Ticket.created_at < created_before)
+        return clauses
+
+    async def _chunks(
+        self, clauses: list, chunk_size: int, keyset: tuple = (Ticket.id,), pause: float = 0
+    ) -> AsyncIterator[list[Row]]:
+        """Walk matching rows in keyset order, one locked chunk per transaction. A keyset other than
+        the id should follow an index whose leading columns the clauses pin, e.g. (created_at, id).
+        `pause` sleeps between chunks so request traffic waiting on the write lock gets it first."""
+        columns = (
+            Ticket.id,
+            Ticket.status,
+            Ticket.assigned_to_id,
+            Ticket.created_at,
+            Ticket.closed_at,
+        )
+        after = None
+        while True:
+            query = (
+                select(*columns)
+                .where(*clauses)
+                .order_by(*keyset)
+                .limit(chunk_size)
+                .with_for_update()
+            )
+            if after is not None:
+                query = query.where(
+                    tuple_(*keyset)
+                    > tuple_(*(literal(value, column.type) for value, column in zip(after, keyset)))
+                )
+            rows = (await self.db.execute(query)).all()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < chunk_size:
+                return
+            if pause:
+                await asyncio.sleep(pause)
+            after = tuple(getattr(rows[-1], column.key) for column in keyset)
+
+    async def _selected_chunks(
+        self, chunk_size: int, ids: Optional[list[int]] = None, **filters
+    ) -> AsyncIterator[list[Row]]:
+        """_chunks over a bulk selection. An id list is walked a slice at a time, so each query binds
+        at most chunk_size ids rather than the whole list."""
+        if ids is None:
+            async for rows in self._chunks(self._selection(**filters), chunk_size):
+                yield rows
+            return
+        ids = sorted(set(ids))
+        for start in range(0, len(ids), chunk_size):
+            async for rows in self._chunks(
+                self._selection(ids=ids[start : start + chunk_size], **filters), chunk_size
+            ):
+                yield rows
+
+    async def bulk_update(
+        self, changes: dict, user: str, chunk_size: int = 1000, **selection
+    ) -> int:
+        """Set-based UPDATE of every matching ticket, committed in chunks; returns the number updated."""
+        affected = 0
+        async for rows in self._selected_chunks(chunk_size, **selection):
+            affected += await self._update_chunk(rows, changes, user)
+        return affected
+
+    async def close_resolved(
+        self, resolved_before: datetime, user: str, chunk_size: int = 1000, pause: float = 0
+    ) -> int:
+        """Close tickets left RESOLVED with no change since resolved_before; returns the number closed."""
+        clauses = [Ticket.status == TicketStatus.RESOLVED, Ticket.updated_at < resolved_before]
+        closed = 0
+        async for rows in self._chunks(
+            clauses, chunk_size, keyset=(Ticket.created_at, Ticket.id), pause=pause
+        ):
+            closed += await self._update_chunk(rows, {"status": TicketStatus.CLOSED}, user)
+        return closed
+
+    async def _update_chunk(self, rows: list[Row], changes: dict, user: str) -> int:
+        ids = [row.id for row in rows]
+        now = datetime.utcnow()
+        values = {**changes, "updated_at": now, "version": Ticket.version + 1}
+        if changes.get("status") == TicketStatus.CLOSED:
+            values["closed_at"] = now
+        await self.db.execute(
+            update(Ticket)
+            .where(Ticket.id.in_(ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        deltas = Counter([COLLECTION_VERSION])
+        for row in rows:
+            deltas.update(
+                counter_keys(
+                    changes.get("status", row.status),
+                    changes.get("assigned_to_id", row.assigned_to_id),
+                )
+            )
+            deltas.subtract(counter_keys(row.status, row.assigned_to_id))
+        await self.counters.apply(deltas)
+        if "closed_at" in values:
+            await self.reports.mark_dirty(row.closed_at for row in rows)
+        if "status" in changes:
+            action = f"Status changed to {TicketStatus(changes['status']).value}"
+            await self.db.execute(
+                insert(TicketActionEntry),
+                [
+                    {"ticket_id": ticket_id, "action": action, "user": user, "created_at": now}
+                    for ticket_id in ids
+                ],
+            )
+        await self.db.commit()
+        broadcaster.publish(TICKETS_BULK_UPDATED, {"ids": ids, "changes": changes})
+        return len(ids)
+
+    async def flag_sla_breaches(
+        self,
+        targets: dict[TicketPriority, timedelta],
+        user: str,
+        chunk_size: int = 1000,
+        pause: float = 0,
+    ) -> int:
+        """Stamp sla_breached_at on open tickets older than their priority's target; returns the number flagged."""
+        now = datetime.utcnow()
+        flagged = 0
+        for priority, target in targets.items():
+            action = f"SLA breached: {priority.value} tickets are due within {target.total_seconds() / 3600:g}h"
+            for status in SLA_STATUSES:
+                # One scan per status keeps the keyset on the (status, sla_breached_at, created_at, id) index
+                clauses = [
+                    Ticket.status == status,
+                    Ticket.sla_breached_at.is_(None),
+                    Ticket.created_at < now - target,
+                    Ticket.priority == priority,
+                ]
+                async for rows in self._chunks(
+                    clauses, chunk_size, keyset=(Ticket.created_at, Ticket.id), pause=pause
+                ):
+                    ids = [row.id for row in rows]
+                    await self.db.execute(
+                        update(Ticket)
+                        .where(Ticket.id.in_(ids))
+                        .values(sla_breached_at=now, version=Ticket.version + 1)
+                        .execution_options(synchronize_session=False)
+                    )
+                    await self.counters.apply(Counter([COLLECTION_VERSION]))
+                    await self.db.execute(
+                        insert(TicketActionEntry),
+                        [
+                            {
+                                "ticket_id": ticket_id,
+                                "action": action,
+                                "user": user,
+                                "created_at": now,
+                            }
+                            for ticket_id in ids
+                        ],
+                    )
+                    await self.db.commit()
+                    broadcaster.publish(
+                        TICKETS_SLA_BREACHED, {"ids": ids, "priority": priority.value}
+                    )
+                    flagged += len(ids)
+        return flagged
+
+    async def bulk_delete(self, chunk_size: int = 1000, **selection) -> int:
+        """Set-based DELETE of every matching ticket and its action log, committed in chunks."""
+        affected = 0
+        async for rows in self._selected_chunks(chunk_size, **selection):
+            ids = [row.id for row in rows]
+            await self.db.execute(
+                delete(TicketActionEntry).where(TicketActionEntry.ticket_id.in_(ids))
+            )
+            await self.search.remove(ids)
+            await self.db.execute(
+                delete(Ticket)
+                .where(Ticket.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            deltas = Counter([COLLECTION_VERSION])
+            for row in rows:
+                deltas.subtract(counter_keys(row.status, row.assigned_to_id))
+            await self.counters.apply(deltas)
+            await self.reports.mark_dirty(
+                [*(row.created_at for row in rows), *(row.closed_at for row in rows)]
+            )
+            await self.db.commit()
+            broadcaster.publish(TICKETS_BULK_DELETED, {"ids": ids})
+            affected += len(ids)
+        return affected
+
+    async def archive_closed(self, closed_before: datetime, chunk_size: int = 1000) -> int:
+        """Move tickets closed before `closed_before`, with their action logs, into the archive tables."""
+        clauses = [Ticket.status == TicketStatus.CLOSED, Ticket.closed_at < closed_before]
+        ticket_columns = [
+            column.name
+            for column in TicketArchive.__table__.columns
+            if column.name != "archived_at"
+        ]
+        # The archive numbers actions itself; inserting them in id order keeps each log's order
+        action_columns = [
+            column.name for column in TicketActionArchive.__table__.columns if column.name != "id"
+        ]
+        archived = 0
+        async for rows in self._chunks(clauses, chunk_size):
+            ids = [row.id for row in rows]
+            copy_tickets = select(
+                *(getattr(Ticket, name) for name in ticket_columns), literal(datetime.utcnow())
+            ).where(Ticket.id.in_(ids))
+            await self.db.execute(
+                insert(TicketArchive).from_select([*ticket_columns, "archived_at"], copy_tickets)
+            )
+            copy_actions = (
+                select(*(getattr(TicketActionEntry, name) for name in action_columns))
+                .where(TicketActionEntry.ticket_id.in_(ids))
+                .order_by(TicketActionEntry.id)
+            )
+            await self.db.execute(
+                insert(TicketActionArchive).from_select(action_columns, copy_actions)
+            )
+            await self.db.execute(
+                delete(TicketActionEntry).where(TicketActionEntry.ticket_id.in_(ids))
+            )
+            await self.search.remove(ids)
+            await self.db.execute(
+                delete(Ticket)
+                .where(Ticket.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            deltas = Counter([COLLECTION_VERSION])
+            deltas[ARCHIVED] += len(ids)
+            for row in rows:
+                deltas.subtract(counter_keys(row.status, row.assigned_to_id))
+            await self.counters.apply(deltas)
+            await self.db.commit()
+            broadcaster.publish(TICKETS_ARCHIVED, {"ids": ids})
+            archived += len(ids)
+        return archived
+
+    def _counter_moves(self, ticket: Ticket) -> Counter:
+        state = inspect(ticket)
+        status_history, assignee_history = (
+            state.attrs.status.history,
+            state.attrs.assigned_to_id.history,
+        )
+        deltas = Counter([COLLECTION_VERSION])
+        if not (status_history.has_changes() or assignee_history.has_changes()):
+            return deltas
+        old_status = status_history.deleted[0] if status_history.deleted else ticket.status
+        old_assignee = (
+            assignee_history.deleted[0] if assignee_history.deleted else ticket.assigned_to_id
+        )
+        deltas.update(counter_keys(ticket.status, ticket.assigned_to_id))
+        deltas.subtract(counter_keys(old_status, old_assignee))
+        return deltas
+
     async def delete(self, ticket_id: int) -> bool:
-        ticket = await self.get_by_id(ticket_id)
+        ticket = await self.get_by_id(ticket_id, include_archived=False)
         if ticket:
+            await self.db.execute(
+                delete(TicketActionEntry).where(TicketActionEntry.ticket_id == ticket_id)
+            )
             await self.db.delete(ticket)
+            deltas = Counter([COLLECTION_VERSION])
+            deltas.subtract(counter_keys(ticket.status, ticket.assigned_to_id))
+            await self.counters.apply(deltas)
+            await self.reports.mark_dirty([ticket.created_at, ticket.closed_at])
+            await self.search.remove([ticket_id])
             await self.db.commit()
+            broadcaster.publish(TICKET_DELETED, {"id": ticket_id})
             return True
         return False
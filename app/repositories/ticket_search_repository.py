@@ -0,0 +1,98 @@
+"""Ticket full-text search repository"""
+
+from collections.abc import Iterable, Sequence
+from typing import Optional
+
+from sqlalchemy import column, delete, func, insert, literal_column, select, table, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+
+SUMMARY_WEIGHT = 5.0
+
+tickets_fts = table("tickets_fts", column("rowid"), column("summary"), column("description"))
+
+
+def fts5_query(q: str) -> str:
+    # Quote every term so user input can never be parsed as FTS5 operators; terms are ANDed
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+
+class TicketSearchRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    async def index(self, rows: Sequence[tuple[int, str, Optional[str]]]) -> None:
+        """Insert or replace index entries for (id, summary, description) rows in the caller's transaction."""
+        if self.dialect != "sqlite" or not rows:
+            return
+        await self.remove([ticket_id for ticket_id, _, _ in rows])
+        await self.db.execute(
+            insert(tickets_fts),
+            [
+                {"rowid": ticket_id, "summary": summary, "description": description or ""}
+                for ticket_id, summary, description in rows
+            ],
+        )
+
+    async def remove(self, ticket_ids: Iterable[int]) -> None:
+        ticket_ids = list(ticket_ids)
+        if self.dialect != "sqlite" or not ticket_ids:
+            return
+        await self.db.execute(delete(tickets_fts).where(tickets_fts.c.rowid.in_(ticket_ids)))
+
+    def _query(self, q: str, status: Optional[TicketStatus], priority: Optional[TicketPriority]):
+        if self.dialect == "sqlite":
+            # bm25 is lower-is-better; weight summary hits above description hits
+            score = -func.bm25(literal_column("tickets_fts"), SUMMARY_WEIGHT, 1.0)
+            query = (
+                select(Ticket, score.label("score"))
+                .join(tickets_fts, tickets_fts.c.rowid == Ticket.id)
+                .where(text("tickets_fts MATCH :q").bindparams(q=fts5_query(q)))
+            )
+        else:
+            score = match(Ticket.summary, Ticket.description, against=q).in_natural_language_mode()
+            query = select(Ticket, score.label("score")).where(score > 0)
+        if status:
+            query = query.where(Ticket.status == status)
+        if priority:
+            query = query.where(Ticket.priority == priority)
+        return query, score
+
+    async def search(
+        self,
+        q: str,
+        status: Optional[TicketStatus] = None,
+        priority: Optional[TicketPriority] = None,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> list[tuple[Ticket, float]]:
+        query, score = self._query(q, status, priority)
+        result = await self.db.execute(
+            query.order_by(score.desc(), Ticket.id.desc()).offset(skip).limit(limit)
+        )
+        return [(ticket, float(rank)) for ticket, rank in result.all()]
+
+    async def count(
+        self,
+        q: str,
+        status: Optional[TicketStatus] = None,
+        priority: Optional[TicketPriority] = None,
+    ) -> int:
+        query, _ = self._query(q, status, priority)
+        result = await self.db.execute(select(func.count()).select_from(query.subquery()))
+        return result.scalar() or 0
+
+    async def rebuild(self) -> None:
+        if self.dialect != "sqlite":
+            return
+        await self.db.execute(delete(tickets_fts))
+        await self.db.execute(
+            insert(tickets_fts).from_select(
+                ["rowid", "summary", "description"],
+                select(Ticket.id, Ticket.summary, func.coalesce(Ticket.description, "")),
+            )
+        )
+        await self.db.commit()
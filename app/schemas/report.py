@@ -0,0 +1,46 @@
+"""Report schemas"""
+
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ReportRange(BaseModel):
+    since: date
+    until: date
+    # Reports read the rollups, which are as fresh as the last refresh-reports run
+    refreshed_at: Optional[datetime] = None
+
+
+class VolumeDay(BaseModel):
+    day: date
+    opened: int
+    closed: int
+
+
+class VolumeReport(ReportRange):
+    days: list[VolumeDay]
+
+
+class BacklogDay(BaseModel):
+    day: date
+    total: int
+    by_priority: dict[str, int]
+
+
+class BacklogReport(ReportRange):
+    days: list[BacklogDay]
+
+
+class AssigneeTimeToClose(BaseModel):
+    assigned_to_id: Optional[int] = None
+    closed: int
+    mean_hours: float
+    # Estimated from a histogram; a percentile past 30 days is reported as 720
+    p50_hours: float
+    p90_hours: float
+
+
+class TimeToCloseReport(ReportRange):
+    assignees: list[AssigneeTimeToClose]
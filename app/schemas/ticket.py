@@ -1,8 +1,13 @@
 """Ticket schemas"""
+
 from datetime import datetime
-from typing import Optional, Dict
-from pydantic import BaseModel, Field, ConfigDict
-from app.models.ticket import TicketStatus, TicketPriority
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.models.ticket import TicketPriority, TicketStatus
+from app.schemas.user import UserSummary
+
 
 class TicketBase(BaseModel):
     summary: str = Field(..., min_length=1, max_length=255)
@@ -10,9 +15,20 @@ class TicketBase(BaseModel):
     status: TicketStatus = TicketStatus.OPEN
     priority: TicketPriority = TicketPriority.MEDIUM
 
+
 class TicketCreate(TicketBase):
     pass
 
+
+def reject_explicit_nulls(model: BaseModel, fields: tuple) -> None:
+    """Optional only so they can be left out; an explicit null would reach a NOT NULL column."""
+    nulls = [
+        name for name in fields if name in model.model_fields_set and getattr(model, name) is None
+    ]
+    if nulls:
+        raise ValueError(f"{', '.join(nulls)} cannot be null")
+
+
 class TicketUpdate(BaseModel):
     summary: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
@@ -20,22 +36,155 @@ class TicketUpdate(BaseModel):
     priority: Optional[TicketPriority] = None
     assigned_to_id: Optional[int] = None
 
+    @model_validator(mode="after")
+    def require_values(self):
+        reject_explicit_nulls(self, ("summary", "status", "priority"))
+        return self
+
+
 class TicketAction(BaseModel):
     action: str = Field(..., min_length=1)
 
+
+class TicketActionResponse(BaseModel):
+    id: int
+    ticket_id: int
+    action: str
+    user: str
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TicketActionListResponse(BaseModel):
+    total: int
+    items: list[TicketActionResponse]
+    page: int
+    page_size: int
+    total_pages: int
+
+
 class TicketResponse(TicketBase):
     id: int
     created_at: datetime
     updated_at: datetime
     closed_at: Optional[datetime] = None
-    actions: Dict[str, dict] = Field(default_factory=dict)
+    sla_breached_at: Optional[datetime] = None
     assigned_to_id: Optional[int] = None
     created_by_id: Optional[int] = None
     model_config = ConfigDict(from_attributes=True)
 
-class TicketListResponse(BaseModel):
+
+class TicketListItem(TicketResponse):
+    # Populated only when requested with ?expand=
+    assigned_to: Optional[UserSummary] = None
+    created_by: Optional[UserSummary] = None
+
+
+class TicketDetailResponse(TicketListItem):
+    actions: Optional[list[TicketActionResponse]] = None
+
+
+class BulkTicketResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkTicketResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkTicketResult]
+
+
+class TicketBatchRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1)
+
+
+class TicketBatchItem(BaseModel):
+    id: int
+    found: bool
+    ticket: Optional[TicketListItem] = None
+
+
+class TicketBatchResponse(BaseModel):
+    # Items follow the requested order, duplicates included; missing repeats the ids with found=false
+    found: int
+    missing: list[int]
+    items: list[TicketBatchItem]
+
+
+class TicketFilter(BaseModel):
+    status: Optional[TicketStatus] = None
+    priority: Optional[TicketPriority] = None
+    assigned_to_id: Optional[int] = None
+    created_before: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def require_criterion(self):
+        if not self.model_dump(exclude_none=True):
+            raise ValueError("filter needs at least one criterion")
+        return self
+
+
+class TicketSelection(BaseModel):
+    ids: Optional[list[int]] = Field(None, min_length=1)
+    filter: Optional[TicketFilter] = None
+
+    @model_validator(mode="after")
+    def require_one_selector(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("provide exactly one of ids or filter")
+        return self
+
+
+class TicketBulkChanges(BaseModel):
+    status: Optional[TicketStatus] = None
+    priority: Optional[TicketPriority] = None
+    assigned_to_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def require_change(self):
+        if not self.model_fields_set:
+            raise ValueError("changes needs at least one field")
+        reject_explicit_nulls(self, ("status", "priority"))
+        return self
+
+
+class TicketBulkUpdate(TicketSelection):
+    changes: TicketBulkChanges
+
+
+class TicketBulkDelete(TicketSelection):
+    pass
+
+
+class BulkMutationResponse(BaseModel):
+    affected: int
+
+
+class TicketStatsResponse(BaseModel):
     total: int
-    items: list[TicketResponse]
+    by_status: dict[str, int]
+    by_assignee: dict[str, int]
+    archived: int = 0  # closed tickets moved to the archive, not included in the totals above
+
+
+class TicketSearchHit(TicketResponse):
+    score: float
+
+
+class TicketSearchResponse(BaseModel):
+    total: int
+    items: list[TicketSearchHit]
     page: int
     page_size: int
     total_pages: int
+
+
+class TicketListResponse(BaseModel):
+    total: int
+    items: list[TicketListItem]
+    page: Optional[int] = None
+    page_size: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
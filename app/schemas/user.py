@@ -1,22 +1,28 @@
 """User schemas"""
+
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+
 
 class UserBase(BaseModel):
     username: str = Field(..., min_length=3, max_length=50)
     email: EmailStr
     full_name: Optional[str] = None
 
+
 class UserCreate(UserBase):
     password: str = Field(..., min_length=8)
 
+
 class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
     full_name: Optional[str] = None
     password: Optional[str] = Field(None, min_length=8)
     is_active: Optional[bool] = None
 
+
 class UserResponse(UserBase):
     id: int
     is_active: bool
@@ -25,9 +31,18 @@ class UserResponse(UserBase):
     updated_at: datetime
     model_config = ConfigDict(from_attributes=True)
 
+
+class UserSummary(BaseModel):
+    id: int
+    username: str
+    full_name: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
 
+
 class TokenData(BaseModel):
     username: Optional[str] = None
@@ -0,0 +1,149 @@
+"""Hot-path latency as closed-ticket history grows, with and without archiving
+
+    python -m benchmarks.bench_archive [history_sizes]    e.g. 0,100000,400000
+
+Each run holds ACTIVE open tickets fixed and adds `history` tickets closed long ago, then times the
+same queue, filter, search and lookup queries before and after the archiver moves the history out.
+"""
+
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.core.maintenance import JOBS
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.ticket_action import TicketActionEntry
+from app.models.user import User
+from app.repositories.ticket_repository import TicketListFilter, TicketRepository
+from app.repositories.ticket_search_repository import TicketSearchRepository
+from benchmarks.common import PROBLEMS, SEED, SUBJECTS, make_engine, session_factory, timed
+
+ACTIVE = 5_000
+USERS = 200
+PAGE_SIZE = 20
+START = datetime(2020, 1, 1)
+
+
+async def seed(engine, history: int, batch_size: int = 10_000) -> None:
+    """`history` closed tickets (one action each) followed by ACTIVE open ones, assigned across USERS agents."""
+    rng = random.Random(SEED)
+    priorities, active_statuses = list(TicketPriority), [
+        TicketStatus.OPEN,
+        TicketStatus.IN_PROGRESS,
+        TicketStatus.ON_HOLD,
+    ]
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(User),
+            [
+                {
+                    "id": n,
+                    "username": f"user{n}",
+                    "email": f"user{n}@example.com",
+                    "hashed_password": "x",
+                }
+                for n in range(1, USERS + 1)
+            ],
+        )
+        total = history + ACTIVE
+        for offset in range(0, total, batch_size):
+            rows, actions = [], []
+            for i in range(offset, min(offset + batch_size, total)):
+                created_at = START + timedelta(seconds=i * 30)
+                closed = i < history
+                rows.append(
+                    {
+                        "id": i + 1,
+                        "summary": f"{rng.choice(SUBJECTS)} {rng.choice(PROBLEMS)}",
+                        "status": TicketStatus.CLOSED if closed else rng.choice(active_statuses),
+                        "priority": rng.choice(priorities),
+                        "created_at": created_at,
+                        "updated_at": created_at + timedelta(hours=4),
+                        "closed_at": created_at + timedelta(hours=4) if closed else None,
+                        "actions_json": "{}",
+                        "assigned_to_id": rng.randint(1, USERS),
+                        "created_by_id": rng.randint(1, USERS),
+                    }
+                )
+                if closed:
+                    actions.append(
+                        {
+                            "ticket_id": i + 1,
+                            "action": "Status changed to closed",
+                            "user": "bench",
+                            "created_at": created_at,
+                        }
+                    )
+            await conn.execute(insert(Ticket), rows)
+            if actions:
+                await conn.execute(insert(TicketActionEntry), actions)
+    Session = session_factory(engine)
+    for job in ("reconcile-counters", "rebuild-search-index", "analyze"):
+        await JOBS[job](Session)
+
+
+async def measure(Session, history: int) -> dict:
+    rng = random.Random(SEED)
+    queue = TicketListFilter(
+        involving_user_id=7, statuses=(TicketStatus.OPEN, TicketStatus.IN_PROGRESS), sort="priority"
+    )
+    urgent = TicketListFilter(priorities=(TicketPriority.CRITICAL,), sort="updated_at")
+    async with Session() as db:
+        repo = TicketRepository(db)
+        search = TicketSearchRepository(db)
+
+        async def page(filters):
+            await repo.find(filters, limit=PAGE_SIZE + 1)
+            await repo.count_matching(filters)
+
+        return {
+            "agent queue (/mine)": await timed(lambda: page(queue)),
+            "critical by updated_at": await timed(lambda: page(urgent)),
+            "search 'printer'": await timed(lambda: search.search("printer", limit=PAGE_SIZE)),
+            "get active ticket": await timed(
+                lambda: repo.get_by_id(history + rng.randint(1, ACTIVE))
+            ),
+        }
+
+
+async def run(history: int) -> None:
+    engine = await make_engine(f"archive-{history}.db")
+    await seed(engine, history)
+    Session = session_factory(engine)
+    before = await measure(Session, history)
+    t0 = time.perf_counter()
+    async with Session() as db:
+        archived = await TicketRepository(db).archive_closed(datetime.utcnow() - timedelta(days=90))
+    archive_s = time.perf_counter() - t0
+    await JOBS["analyze"](Session)
+    after = await measure(Session, history)
+    if archived:
+        async with Session() as db:
+            repo = TicketRepository(db)
+            after["get archived ticket"] = await timed(
+                lambda: repo.get_by_id(random.randint(1, archived))
+            )
+    await engine.dispose()
+    rate = f", {archived / archive_s:,.0f} rows/s" if archived else ""
+    print(f"{ACTIVE} active + {history} closed; archived {archived} in {archive_s:.1f} s{rate}")
+    print(f"  {'':<24} {'in tickets':>12} {'archived':>12}")
+    for name in after:
+        hot = f"{before[name]:9.2f} ms" if name in before else f"{'':>12}"
+        print(f"  {name:<24} {hot} {after[name]:9.2f} ms")
+
+
+async def main(sizes) -> None:
+    for history in sizes:
+        await run(history)
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            [int(n) for n in sys.argv[1].split(",")] if len(sys.argv) > 1 else [0, 100_000, 400_000]
+        )
+    )
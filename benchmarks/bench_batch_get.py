@@ -0,0 +1,82 @@
+"""Fetching known ticket ids: one GET /tickets/{id} per id vs a single /tickets/batch request
+
+python -m benchmarks.bench_batch_get [ids]
+"""
+
+import asyncio
+import random
+import sys
+
+from httpx import AsyncClient
+
+from app.core.database import create_engine, get_db, get_read_db
+from app.core.security import create_access_token
+from app.main import app
+from benchmarks.common import SEED, make_engine, seed_tickets, session_factory, timed
+
+TICKETS = 100_000
+CONCURRENCY = 16
+
+
+async def main(count: int) -> None:
+    seeded = await make_engine()
+    await seed_tickets(seeded, TICKETS)
+    await seeded.dispose()
+    engine = create_engine(str(seeded.url))
+    Session = session_factory(engine)
+
+    async def override_get_db():
+        async with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench'})}"}
+    ids = random.Random(SEED).sample(range(1, TICKETS + 1), count)
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+
+        async def fetch(ticket_id: int) -> None:
+            (await client.get(f"/api/v1/tickets/{ticket_id}", headers=headers)).raise_for_status()
+
+        async def sequential() -> None:
+            for ticket_id in ids:
+                await fetch(ticket_id)
+
+        async def concurrent() -> None:
+            remaining = iter(ids)
+
+            async def worker() -> None:
+                for ticket_id in remaining:
+                    await fetch(ticket_id)
+
+            await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+
+        async def batch_get() -> None:
+            (
+                await client.get(
+                    "/api/v1/tickets/batch",
+                    params={"ids": ",".join(map(str, ids))},
+                    headers=headers,
+                )
+            ).raise_for_status()
+
+        async def batch_post() -> None:
+            (
+                await client.post("/api/v1/tickets/batch", json={"ids": ids}, headers=headers)
+            ).raise_for_status()
+
+        await fetch(ids[0])  # warm up
+        print(f"{count} random ids out of {TICKETS} tickets, SQLite")
+        for name, fn in [
+            ("one GET per id", sequential),
+            (f"one GET per id, {CONCURRENCY} at a time", concurrent),
+            ("GET /batch", batch_get),
+            ("POST /batch", batch_post),
+        ]:
+            elapsed = await timed(fn, repeat=3)
+            print(f"  {name:<32} {elapsed:9.2f} ms  ({elapsed * 1000 / count:7.1f} us/ticket)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,62 @@
+"""Single-create vs bulk ticket insert throughput
+
+python -m benchmarks.bench_bulk_create [ticket_count]
+"""
+
+import asyncio
+import sys
+import time
+
+from app.core.config import settings
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.repositories.ticket_repository import TicketRepository
+from benchmarks.common import make_engine, session_factory
+
+
+def _row(i: int, user_id: int) -> dict:
+    return {
+        "summary": f"Imported ticket {i}",
+        "description": "From the email gateway",
+        "status": TicketStatus.OPEN,
+        "priority": TicketPriority.MEDIUM,
+        "created_by_id": user_id,
+    }
+
+
+async def single(count: int) -> float:
+    engine = await make_engine()
+    Session = session_factory(engine)
+    t0 = time.perf_counter()
+    async with Session() as db:
+        repo = TicketRepository(db)
+        for i in range(count):
+            await repo.create(Ticket(**_row(i, 1)))
+    elapsed = time.perf_counter() - t0
+    await engine.dispose()
+    return count / elapsed
+
+
+async def bulk(count: int, batch_size: int) -> float:
+    engine = await make_engine()
+    Session = session_factory(engine)
+    t0 = time.perf_counter()
+    async with Session() as db:
+        repo = TicketRepository(db)
+        for offset in range(0, count, batch_size):
+            await repo.bulk_create(
+                [_row(i, 1) for i in range(offset, min(offset + batch_size, count))]
+            )
+    elapsed = time.perf_counter() - t0
+    await engine.dispose()
+    return count / elapsed
+
+
+async def main(count: int) -> None:
+    print(f"{count} tickets")
+    batch_size = settings.BULK_INSERT_BATCH_SIZE
+    print(f"  {'single create':<22} {await single(count):10.0f} rows/s")
+    print(f"  {f'bulk (batch={batch_size})':<22} {await bulk(count, batch_size):10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000))
@@ -0,0 +1,41 @@
+"""Set-based bulk close and bulk delete
+
+python -m benchmarks.bench_bulk_mutations [ticket_count]
+"""
+
+import asyncio
+import sys
+import time
+
+from app.core.config import settings
+from app.models.ticket import TicketStatus
+from app.repositories.ticket_counter_repository import TicketCounterRepository
+from app.repositories.ticket_repository import TicketRepository
+from benchmarks.common import make_engine, seed_tickets, session_factory
+
+
+async def main(count: int) -> None:
+    engine = await make_engine()
+    await seed_tickets(engine, count)
+    Session = session_factory(engine)
+    async with Session() as db:
+        await TicketCounterRepository(db).rebuild()
+        repo = TicketRepository(db)
+        t0 = time.perf_counter()
+        closed = await repo.bulk_update(
+            {"status": TicketStatus.CLOSED}, "bench", chunk_size=settings.BULK_MUTATION_CHUNK_SIZE
+        )
+        close_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        deleted = await repo.bulk_delete(
+            chunk_size=settings.BULK_MUTATION_CHUNK_SIZE, status=TicketStatus.CLOSED
+        )
+        delete_s = time.perf_counter() - t0
+    await engine.dispose()
+    print(f"{count} tickets, chunk_size={settings.BULK_MUTATION_CHUNK_SIZE}")
+    print(f"  {'bulk close':<22} {closed:8d} rows in {close_s:6.2f} s")
+    print(f"  {'bulk delete':<22} {deleted:8d} rows in {delete_s:6.2f} s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
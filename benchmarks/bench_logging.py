@@ -0,0 +1,124 @@
+"""Request latency with logging disabled, with blocking handlers, and with the queued pipeline
+
+    python -m benchmarks.bench_logging [requests] [concurrency]
+
+Logs at DEBUG, so every request writes an access record. Reads only: concurrent SQLite writers would
+measure lock waits rather than logging.
+"""
+
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from httpx import AsyncClient
+
+from app.core import logging_config
+from app.core.config import settings
+from app.core.database import create_engine, get_db, get_read_db
+from app.core.security import create_access_token
+from app.main import app
+from benchmarks.common import make_engine, seed_tickets, session_factory
+
+SLOW_WRITE_SECONDS = 0.002  # a stalled terminal, pipe or container log driver
+
+
+class SlowStream:
+    def __init__(self, path: Path):
+        self._file = open(path, "a")
+
+    def write(self, text: str) -> int:
+        time.sleep(SLOW_WRITE_SECONDS)
+        return self._file.write(text)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+
+def disabled() -> None:
+    logging.getLogger("helpvia").setLevel(logging.CRITICAL + 1)
+
+
+def blocking(log_dir: Path, stdout) -> None:
+    # The original setup: handlers write synchronously on the event loop
+    logger = logging.getLogger("helpvia")
+    logging_config.stop_logging()
+    logger.handlers.clear()
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    for handler in (logging.StreamHandler(stdout), logging.FileHandler(log_dir / "blocking.log")):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+
+
+def queued(log_dir: Path, stdout) -> None:
+    settings.LOG_DIR = str(log_dir)
+    settings.LOG_LEVEL = "DEBUG"
+    with redirect_stdout(stdout):
+        logging_config.setup_logging()
+
+
+async def run(client: AsyncClient, headers: dict, requests: int, concurrency: int) -> list[float]:
+    samples: list[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for i in remaining:
+            t0 = time.perf_counter()
+            if i % 2:
+                response = await client.get(f"/api/v1/tickets/{i % 10_000 + 1}", headers=headers)
+            else:
+                response = await client.get("/api/v1/tickets/", headers=headers)
+            response.raise_for_status()
+            samples.append((time.perf_counter() - t0) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    samples.sort()
+    return samples
+
+
+async def main(requests: int, concurrency: int) -> None:
+    seeded = await make_engine()
+    await seed_tickets(seeded, 10_000)
+    await seeded.dispose()
+    engine = create_engine(str(seeded.url))  # the app's pool settings and pragmas
+    Session = session_factory(engine)
+
+    async def override_get_db():
+        async with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench'})}"}
+    log_dir = Path(tempfile.mkdtemp(prefix="helpvia-bench-logs-"))
+    print(f"{requests} requests, concurrency={concurrency}")
+    async with AsyncClient(app=app, base_url="http://bench") as client:
+        disabled()
+        await run(client, headers, 50, concurrency)  # warm up
+        modes = [
+            ("disabled", disabled, None),
+            ("blocking", blocking, open(log_dir / "stdout.log", "a")),
+            ("queued", queued, open(log_dir / "stdout.log", "a")),
+            ("blocking, slow stdout", blocking, SlowStream(log_dir / "slow.log")),
+            ("queued, slow stdout", queued, SlowStream(log_dir / "slow.log")),
+        ]
+        for name, configure, stdout in modes:
+            if stdout is None:
+                configure()
+            else:
+                configure(log_dir, stdout)
+            samples = await run(client, headers, requests, concurrency)
+            print(
+                f"  {name:<22} p50 {samples[len(samples) // 2]:8.2f} ms   p99 {samples[int(len(samples) * 0.99)]:8.2f} ms"
+            )
+    logging_config.stop_logging()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 2000, int(args[1]) if len(args) > 1 else 16))
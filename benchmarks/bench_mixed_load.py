@@ -0,0 +1,115 @@
+"""Mixed read/write load against local uvicorn workers: SQLite defaults vs tuned pragmas (WAL)
+
+python -m benchmarks.bench_mixed_load [seconds] [concurrency] [workers]
+"""
+
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from httpx import AsyncClient
+
+from app.core.security import create_access_token
+from benchmarks.common import SEED, make_engine, seed_tickets
+
+WRITE_RATIO = 0.2
+PORT = 8765
+MODES = {
+    "defaults (DELETE/FULL)": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_CACHE_SIZE": "-2000",
+    },
+    "tuned (WAL/NORMAL)": {
+        "SQLITE_JOURNAL_MODE": "WAL",
+        "SQLITE_SYNCHRONOUS": "NORMAL",
+        "SQLITE_CACHE_SIZE": "-64000",
+    },
+}
+
+
+async def _wait_ready(client: AsyncClient, timeout: float = 30) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("uvicorn did not start")
+
+
+async def run(pragmas: dict, seconds: float, concurrency: int, workers: int) -> float:
+    engine = await make_engine("load.db")
+    await seed_tickets(engine, 20_000)
+    url = str(engine.url)
+    await engine.dispose()
+    env = {**os.environ, **pragmas, "SQLITE_DATABASE_URL": url, "LOG_LEVEL": "WARNING"}
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(PORT),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+        cwd=Path(tempfile.mkdtemp(prefix="helpvia-bench-")),
+    )
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench'})}"}
+    rng = random.Random(SEED)
+    completed = 0
+    try:
+        async with AsyncClient(base_url=f"http://127.0.0.1:{PORT}", timeout=30) as client:
+            await _wait_ready(client)
+            deadline = time.perf_counter() + seconds
+
+            async def worker() -> None:
+                nonlocal completed
+                while time.perf_counter() < deadline:
+                    if rng.random() < WRITE_RATIO:
+                        response = await client.post(
+                            "/api/v1/tickets/", json={"summary": "Load test"}, headers=headers
+                        )
+                    else:
+                        response = await client.get(
+                            "/api/v1/tickets/", params={"page": rng.randint(1, 50)}, headers=headers
+                        )
+                    response.raise_for_status()
+                    completed += 1
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        server.terminate()
+        server.wait()
+    return completed / seconds
+
+
+async def main(seconds: float, concurrency: int, workers: int) -> None:
+    print(
+        f"{int(WRITE_RATIO * 100)}% writes, concurrency={concurrency}, workers={workers}, {seconds:.0f}s per mode"
+    )
+    for name, pragmas in MODES.items():
+        print(f"  {name:<24} {await run(pragmas, seconds, concurrency, workers):10.0f} req/s")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(
+        main(
+            float(args[0]) if args else 10,
+            int(args[1]) if len(args) > 1 else 32,
+            int(args[2]) if len(args) > 2 else 4,
+        )
+    )
@@ -0,0 +1,52 @@
+"""Offset vs keyset pagination on a deep ticket table
+
+python -m benchmarks.bench_pagination [ticket_count]
+"""
+
+import asyncio
+import sys
+
+from sqlalchemy import select
+
+from app.models.ticket import Ticket
+from app.repositories.ticket_repository import TicketRepository
+from benchmarks.common import make_engine, seed_tickets, session_factory, timed
+
+PAGE_SIZE = 20
+DEEP_PAGE = 10_000
+
+
+async def main(count: int) -> None:
+    engine = await make_engine()
+    await seed_tickets(engine, count)
+    Session = session_factory(engine)
+    deep_skip = (DEEP_PAGE - 1) * PAGE_SIZE
+    async with Session() as db:
+        repo = TicketRepository(db)
+        # The cursor a client would hold after walking to page 9,999
+        row = (
+            await db.execute(
+                select(Ticket.created_at, Ticket.id)
+                .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+                .offset(deep_skip - 1)
+                .limit(1)
+            )
+        ).one()
+        results = {
+            "offset page 1": await timed(lambda: repo.get_all(skip=0, limit=PAGE_SIZE)),
+            f"offset page {DEEP_PAGE}": await timed(
+                lambda: repo.get_all(skip=deep_skip, limit=PAGE_SIZE)
+            ),
+            "keyset page 1": await timed(lambda: repo.get_all(limit=PAGE_SIZE)),
+            f"keyset page {DEEP_PAGE}": await timed(
+                lambda: repo.get_all(limit=PAGE_SIZE, after=(row.created_at, row.id))
+            ),
+        }
+    await engine.dispose()
+    print(f"{count} tickets, page_size={PAGE_SIZE}")
+    for name, ms in results.items():
+        print(f"  {name:<22} {ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 250_000))
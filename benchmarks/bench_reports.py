@@ -0,0 +1,97 @@
+"""Year-long reports: aggregating tickets on every request vs reading the daily rollups
+
+    python -m benchmarks.bench_reports [tickets]
+
+The default million tickets, one every 30 seconds, span just under a year.
+"""
+
+import asyncio
+import random
+import sys
+import time
+from datetime import timedelta
+
+from sqlalchemy import Date, func, select, type_coerce
+
+from app.models.ticket import Ticket, TicketStatus
+from app.repositories.report_repository import ReportRepository
+from app.repositories.ticket_repository import TicketRepository
+from benchmarks.common import SEED, make_engine, session_factory, timed
+from benchmarks.seed import START, TICKET_INTERVAL, seed_dataset
+
+UPDATES = 1000
+
+
+def _day(column):
+    return type_coerce(func.date(column), Date)
+
+
+async def main(tickets: int) -> None:
+    engine = await make_engine("reports.db")
+    await seed_dataset(engine, tickets, max_comments=0)
+    Session = session_factory(engine)
+    since, until = START.date(), (START + tickets * TICKET_INTERVAL).date()
+    seconds = (func.julianday(Ticket.closed_at) - func.julianday(Ticket.created_at)) * 86400
+    closed = [Ticket.status == TicketStatus.CLOSED]
+    # What a report has to run without rollups: a pass over every ticket in the range
+    scans = {
+        "opened/closed per day": [
+            select(_day(Ticket.created_at), func.count()).group_by(_day(Ticket.created_at)),
+            select(_day(Ticket.closed_at), func.count())
+            .where(*closed)
+            .group_by(_day(Ticket.closed_at)),
+        ],
+        "backlog by priority": [
+            select(_day(Ticket.created_at), Ticket.priority, func.count()).group_by(
+                _day(Ticket.created_at), Ticket.priority
+            ),
+            select(_day(Ticket.closed_at), Ticket.priority, func.count())
+            .where(*closed)
+            .group_by(_day(Ticket.closed_at), Ticket.priority),
+        ],
+        "time to close by assignee": [
+            select(Ticket.assigned_to_id, func.count(), func.avg(seconds))
+            .where(*closed)
+            .group_by(Ticket.assigned_to_id),
+        ],
+    }
+    async with Session() as db:
+
+        async def scan(queries):
+            for query in queries:
+                (await db.execute(query)).all()
+
+        repo = ReportRepository(db)
+        rollups = {
+            "opened/closed per day": lambda: repo.volume(since, until),
+            "backlog by priority": lambda: repo.backlog(since, until),
+            "time to close by assignee": lambda: repo.time_to_close(since, until),
+        }
+        print(f"{tickets} tickets, {since} to {until}, SQLite")
+        print(f"  {'':<26} {'scan':>12} {'rollups':>12}")
+        for name in scans:
+            print(
+                f"  {name:<26} {await timed(lambda name=name: scan(scans[name]), repeat=3):9.2f} ms {await timed(rollups[name]):9.2f} ms"
+            )
+    t0 = time.perf_counter()
+    async with Session() as db:
+        days = await ReportRepository(db).refresh(full=True)
+    print(f"  full rebuild: {days} days in {time.perf_counter() - t0:.2f} s")
+    # A busy day's worth of closes among the last week's tickets, then an incremental refresh
+    recent = int(timedelta(days=7) / TICKET_INTERVAL)
+    ids = random.Random(SEED).sample(
+        range(max(tickets - recent, 0) + 1, tickets + 1), min(UPDATES, tickets)
+    )
+    async with Session() as db:
+        await TicketRepository(db).bulk_update({"status": TicketStatus.CLOSED}, "bench", ids=ids)
+    t0 = time.perf_counter()
+    async with Session() as db:
+        days = await ReportRepository(db).refresh()
+    print(
+        f"  incremental after closing {UPDATES} tickets: {days} days in {time.perf_counter() - t0:.2f} s"
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
@@ -0,0 +1,106 @@
+"""Write latency while the auto-close job runs: one transaction vs scheduler-sized chunks
+
+python -m benchmarks.bench_scheduler [ticket_count]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.database import create_engine
+from app.models.ticket import Ticket, TicketStatus
+from app.repositories.ticket_counter_repository import TicketCounterRepository
+from app.repositories.ticket_repository import TicketRepository
+from benchmarks.common import make_engine, seed_tickets, session_factory
+
+
+async def touch_tickets(
+    Session, ids: list[int], stop: asyncio.Event, latencies: list[float], errors: list[str]
+) -> None:
+    """The request traffic: one single-row update per transaction, back to back."""
+    n = 0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            async with Session() as db:
+                await db.execute(
+                    update(Ticket)
+                    .where(Ticket.id == ids[n % len(ids)])
+                    .values(summary=f"Touched {n}")
+                )
+                await db.commit()
+            latencies.append(time.perf_counter() - t0)
+        except OperationalError as exc:
+            errors.append(str(exc.orig))
+        n += 1
+        await asyncio.sleep(0.005)
+
+
+async def run(count: int, chunk_size: int, pause: float) -> tuple:
+    seeded = await make_engine()
+    await seed_tickets(seeded, count)
+    await seeded.dispose()
+    engine = create_engine(str(seeded.url))  # the app's pool settings and pragmas
+    Session = session_factory(engine)
+    async with Session() as db:
+        await TicketCounterRepository(db).rebuild()
+        ids = list(
+            (
+                await db.execute(
+                    select(Ticket.id).where(Ticket.status == TicketStatus.OPEN).limit(1000)
+                )
+            ).scalars()
+        )
+    stop, latencies, errors = asyncio.Event(), [], []
+    writer = asyncio.create_task(touch_tickets(Session, ids, stop, latencies, errors))
+    await asyncio.sleep(0.2)
+    t0 = time.perf_counter()
+    async with Session() as db:
+        closed = await TicketRepository(db).close_resolved(
+            datetime.utcnow(), "bench", chunk_size=chunk_size, pause=pause
+        )
+    job_s = time.perf_counter() - t0
+    stop.set()
+    await writer
+    await engine.dispose()
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+    return (
+        closed,
+        job_s,
+        len(latencies),
+        statistics.median(latencies) if latencies else 0,
+        p99,
+        latencies[-1] if latencies else 0,
+        len(errors),
+    )
+
+
+async def main(count: int) -> None:
+    print(
+        f"{count} tickets, SQLite ({settings.SQLITE_JOURNAL_MODE}); a writer updates one ticket every 5 ms while close-resolved runs"
+    )
+    print(
+        f"  {'':<32} {'closed':>7} {'job':>8} {'writes':>7} {'p50':>9} {'p99':>9} {'max':>9} {'errors':>7}"
+    )
+    size, pause = settings.SCHEDULER_BATCH_SIZE, settings.SCHEDULER_CHUNK_PAUSE_SECONDS
+    modes = (
+        ("one transaction", count, 0),
+        (f"chunks of {size}", size, 0),
+        (f"chunks of {size}, {pause * 1000:g} ms apart", size, pause),
+    )
+    for label, chunk_size, chunk_pause in modes:
+        closed, job_s, writes, p50, p99, worst, errors = await run(count, chunk_size, chunk_pause)
+        print(
+            f"  {label:<32} {closed:7d} {job_s:7.2f}s {writes:7d} {p50 * 1000:7.1f}ms {p99 * 1000:7.1f}ms {worst * 1000:7.1f}ms {errors:7d}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000))
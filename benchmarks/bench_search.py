@@ -0,0 +1,55 @@
+"""Full-text search vs LIKE scan
+
+python -m benchmarks.bench_search [ticket_count]
+"""
+
+import asyncio
+import sys
+import time
+
+from sqlalchemy import func, or_, select
+
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.repositories.ticket_search_repository import TicketSearchRepository
+from benchmarks.common import make_engine, seed_tickets, session_factory, timed
+
+
+async def main(count: int) -> None:
+    engine = await make_engine()
+    await seed_tickets(engine, count)
+    Session = session_factory(engine)
+    async with Session() as db:
+        repo = TicketSearchRepository(db)
+        t0 = time.perf_counter()
+        await repo.rebuild()
+        build_s = time.perf_counter() - t0
+        rare = str(count // 2)
+
+        def like(term: str):
+            pattern = f"%{term}%"
+            return db.execute(
+                select(func.count(Ticket.id)).where(
+                    or_(Ticket.summary.ilike(pattern), Ticket.description.ilike(pattern))
+                )
+            )
+
+        results = {
+            "rare term: LIKE": await timed(lambda: like(rare), repeat=3),
+            "rare term: fts": await timed(lambda: repo.search(rare)),
+            "common: LIKE count": await timed(lambda: like("printer"), repeat=3),
+            "common: fts count": await timed(lambda: repo.count("printer")),
+            "ranked page 1": await timed(lambda: repo.search("printer crashing")),
+            "ranked + filters": await timed(
+                lambda: repo.search(
+                    "printer crashing", status=TicketStatus.OPEN, priority=TicketPriority.HIGH
+                )
+            ),
+        }
+    await engine.dispose()
+    print(f"{count} tickets, index built in {build_s:.1f} s")
+    for name, ms in results.items():
+        print(f"  {name:<22} {ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
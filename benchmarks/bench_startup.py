@@ -0,0 +1,98 @@
+"""Worker cold start: imports, schema check vs create_all, and spawn-to-first-response
+
+python -m benchmarks.bench_startup [runs]
+"""
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from httpx import AsyncClient
+
+from app.core.database import Base
+from app.core.migrations import current_version
+from benchmarks.common import make_engine, seed_tickets
+
+PORT = 8765
+IMPORT_APP = "import time; t0 = time.perf_counter(); import app.main; print((time.perf_counter() - t0) * 1000)"
+
+
+def import_ms(env: dict) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_APP], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+async def spawn_to_ready_ms(env: dict) -> float:
+    t0 = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(PORT),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    try:
+        async with AsyncClient(base_url=f"http://127.0.0.1:{PORT}") as client:
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        return (time.perf_counter() - t0) * 1000
+                except Exception:
+                    await asyncio.sleep(0.01)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def main(runs: int) -> None:
+    engine = await make_engine("startup.db")
+    await seed_tickets(engine, 10_000)
+
+    # What each worker used to run, and the version read that replaces it
+    async def create_all():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    create_all_ms, check_ms = [], []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        await create_all()
+        create_all_ms.append((time.perf_counter() - t0) * 1000)
+        t0 = time.perf_counter()
+        await current_version(engine)
+        check_ms.append((time.perf_counter() - t0) * 1000)
+    url = str(engine.url)
+    await engine.dispose()
+    env = {
+        **os.environ,
+        "SQLITE_DATABASE_URL": url,
+        "ENVIRONMENT": "production",
+        "LOG_LEVEL": "WARNING",
+        "LOG_DIR": tempfile.mkdtemp(prefix="helpvia-bench-logs-"),
+    }
+    cwd = Path(__file__).resolve().parent.parent
+    os.chdir(cwd)
+    imports = [import_ms(env) for _ in range(runs)]
+    ready = [await spawn_to_ready_ms(env) for _ in range(runs)]
+    print(f"median of {runs} runs, SQLite")
+    print(f"  {'create_all (before)':<22} {statistics.median(create_all_ms):8.2f} ms")
+    print(f"  {'version check (after)':<22} {statistics.median(check_ms):8.2f} ms")
+    print(f"  {'import app.main':<22} {statistics.median(imports):8.2f} ms")
+    print(f"  {'cold start to /health':<22} {statistics.median(ready):8.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
@@ -0,0 +1,107 @@
+"""Shared benchmark helpers"""
+
+import random
+import tempfile
+import time
+from collections.abc import Awaitable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.core.migrations import upgrade
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.user import User
+
+SEED = 1234
+SUBJECTS = [
+    "Printer",
+    "Laptop",
+    "VPN",
+    "Email",
+    "Monitor",
+    "Password",
+    "Wifi",
+    "Database",
+    "Invoice",
+    "Badge",
+    "Phone",
+    "Server",
+]
+PROBLEMS = [
+    "not working",
+    "keeps crashing",
+    "running slow",
+    "access denied",
+    "needs replacing",
+    "error on startup",
+    "cannot connect",
+    "missing data",
+]
+DETAILS = [
+    "since the update",
+    "after the office move",
+    "for the whole team",
+    "intermittently",
+    "every morning",
+    "on the second floor",
+    "when travelling",
+    "after a reboot",
+]
+
+
+async def make_engine(name: str = "bench.db") -> AsyncEngine:
+    path = Path(tempfile.mkdtemp(prefix="helpvia-bench-")) / name
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    await upgrade(engine)
+    return engine
+
+
+def session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def seed_tickets(engine: AsyncEngine, count: int, batch_size: int = 10_000) -> int:
+    """Insert one user and `count` tickets with executemany batches; returns the user id."""
+    rng = random.Random(SEED)
+    start = datetime(2020, 1, 1)
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            insert(User).values(username="bench", email="bench@example.com", hashed_password="x")
+        )
+        user_id = result.inserted_primary_key[0]
+        statuses, priorities = list(TicketStatus), list(TicketPriority)
+        for offset in range(0, count, batch_size):
+            rows = [
+                {
+                    "summary": f"{rng.choice(SUBJECTS)} {rng.choice(PROBLEMS)} #{i}",
+                    "description": f"{rng.choice(SUBJECTS)} {rng.choice(PROBLEMS)} {rng.choice(DETAILS)}",
+                    "status": rng.choice(statuses),
+                    "priority": rng.choice(priorities),
+                    "created_at": start + timedelta(seconds=i * 30),
+                    "updated_at": start + timedelta(seconds=i * 30),
+                    "actions_json": "{}",
+                    "created_by_id": user_id,
+                }
+                for i in range(offset, min(offset + batch_size, count))
+            ]
+            await conn.execute(insert(Ticket), rows)
+    return user_id
+
+
+async def timed(fn: Callable[[], Awaitable], repeat: int = 5) -> float:
+    """Median wall time in milliseconds over `repeat` runs."""
+    samples: list[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
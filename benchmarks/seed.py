@@ -0,0 +1,193 @@
+"""Bulk seeder for load tests: users plus tickets with action histories
+
+    python -m benchmarks.seed <db_path> [ticket_count] [user_count]
+
+Rows are generated deterministically from SEED and inserted with executemany batches and explicit
+ids, so a million tickets take about a minute on SQLite. Every user's password is PASSWORD.
+"""
+
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.maintenance import JOBS
+from app.core.migrations import upgrade
+from app.core.security import get_password_hash
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.ticket_action import TicketActionEntry
+from app.models.user import User
+from benchmarks.common import DETAILS, PROBLEMS, SEED, SUBJECTS, session_factory
+
+PASSWORD = "benchpass"
+START = datetime(2020, 1, 1)
+TICKET_INTERVAL = timedelta(seconds=30)
+# Most tickets are finished; the open ones are what lists and stats are mostly about
+STATUS_WEIGHTS = {
+    TicketStatus.CLOSED: 45,
+    TicketStatus.RESOLVED: 15,
+    TicketStatus.OPEN: 20,
+    TicketStatus.IN_PROGRESS: 15,
+    TicketStatus.ON_HOLD: 5,
+}
+PRIORITY_WEIGHTS = {
+    TicketPriority.LOW: 30,
+    TicketPriority.MEDIUM: 45,
+    TicketPriority.HIGH: 20,
+    TicketPriority.CRITICAL: 5,
+}
+# The status changes a ticket went through to reach its current status
+STATUS_PATHS = {
+    TicketStatus.OPEN: [],
+    TicketStatus.IN_PROGRESS: [TicketStatus.IN_PROGRESS],
+    TicketStatus.ON_HOLD: [TicketStatus.IN_PROGRESS, TicketStatus.ON_HOLD],
+    TicketStatus.RESOLVED: [TicketStatus.IN_PROGRESS, TicketStatus.RESOLVED],
+    TicketStatus.CLOSED: [TicketStatus.IN_PROGRESS, TicketStatus.RESOLVED, TicketStatus.CLOSED],
+}
+COMMENTS = [
+    "Asked the reporter for a screenshot",
+    "Reproduced on a second machine",
+    "Waiting on the vendor",
+    "Applied the workaround from the knowledge base",
+    "Escalated to the infrastructure team",
+    "Reporter confirmed it is still happening",
+]
+
+
+def username(n: int) -> str:
+    return f"user{n}"
+
+
+def _history(
+    rng: random.Random,
+    ticket_id: int,
+    status: TicketStatus,
+    assignee: str,
+    created_at: datetime,
+    max_comments: int,
+) -> list[dict]:
+    """Plausible action log: creation, assignment, comments and the status changes leading to `status`."""
+    steps = [("Ticket created", "system")]
+    if assignee:
+        steps.append((f"Assigned to {assignee}", "system"))
+    for _ in range(rng.randint(0, max_comments)):
+        steps.append((f"Comment: {rng.choice(COMMENTS)}", assignee or "helpdesk"))
+    for next_status in STATUS_PATHS[status]:
+        steps.append((f"Status changed to {next_status.value}", assignee or "helpdesk"))
+    at = created_at
+    actions = []
+    for action, user in steps:
+        actions.append({"ticket_id": ticket_id, "action": action, "user": user, "created_at": at})
+        at += timedelta(minutes=rng.randint(5, 600))
+    return actions
+
+
+async def seed_dataset(
+    engine: AsyncEngine,
+    tickets: int,
+    users: int = 200,
+    max_comments: int = 3,
+    batch_size: int = 10_000,
+) -> dict[str, int]:
+    """Insert `users` users and `tickets` tickets with action logs, then build counters, the search index and report rollups."""
+    rng = random.Random(SEED)
+    # One bcrypt hash shared by every user: hashing is the slow part of creating users
+    hashed = get_password_hash(PASSWORD)
+    statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    priorities, priority_weights = list(PRIORITY_WEIGHTS), list(PRIORITY_WEIGHTS.values())
+    action_count = 0
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(User),
+            [
+                {
+                    "id": n,
+                    "username": username(n),
+                    "email": f"{username(n)}@example.com",
+                    "hashed_password": hashed,
+                    "full_name": f"User {n}",
+                }
+                for n in range(1, users + 1)
+            ],
+        )
+        for offset in range(0, tickets, batch_size):
+            ticket_rows, action_rows = [], []
+            for i in range(offset, min(offset + batch_size, tickets)):
+                ticket_id = i + 1
+                status = rng.choices(statuses, status_weights)[0]
+                created_at = START + i * TICKET_INTERVAL
+                # Unassigned tickets are still waiting in the queue
+                assignee_id = (
+                    rng.randint(1, users)
+                    if status != TicketStatus.OPEN or rng.random() < 0.5
+                    else None
+                )
+                history = _history(
+                    rng,
+                    ticket_id,
+                    status,
+                    username(assignee_id) if assignee_id else "",
+                    created_at,
+                    max_comments,
+                )
+                updated_at = history[-1]["created_at"]
+                ticket_rows.append(
+                    {
+                        "id": ticket_id,
+                        "summary": f"{rng.choice(SUBJECTS)} {rng.choice(PROBLEMS)}",
+                        "description": f"{rng.choice(SUBJECTS)} {rng.choice(PROBLEMS)} {rng.choice(DETAILS)}",
+                        "status": status,
+                        "priority": rng.choices(priorities, priority_weights)[0],
+                        "created_at": created_at,
+                        "updated_at": updated_at,
+                        "closed_at": updated_at if status == TicketStatus.CLOSED else None,
+                        "actions_json": "{}",
+                        "assigned_to_id": assignee_id,
+                        "created_by_id": rng.randint(1, users),
+                    }
+                )
+                action_rows.extend(history)
+            await conn.execute(insert(Ticket), ticket_rows)
+            await conn.execute(insert(TicketActionEntry), action_rows)
+            action_count += len(action_rows)
+    Session = session_factory(engine)
+    for job in ("reconcile-counters", "rebuild-search-index", "refresh-reports", "analyze"):
+        await JOBS[job](Session)
+    return {"users": users, "tickets": tickets, "actions": action_count}
+
+
+async def create_seeded_database(path: Path, tickets: int, users: int = 200) -> dict[str, int]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    await upgrade(engine)
+    try:
+        return await seed_dataset(engine, tickets, users)
+    finally:
+        await engine.dispose()
+
+
+async def main(path: Path, tickets: int, users: int) -> None:
+    if path.exists():
+        sys.exit(f"{path} already exists")
+    t0 = time.perf_counter()
+    summary = await create_seeded_database(path, tickets, users)
+    print(
+        f"seeded {path}: {summary['users']} users, {summary['tickets']} tickets, {summary['actions']} actions in {time.perf_counter() - t0:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args:
+        sys.exit("usage: python -m benchmarks.seed <db_path> [ticket_count] [user_count]")
+    asyncio.run(
+        main(
+            Path(args[0]),
+            int(args[1]) if len(args) > 1 else 100_000,
+            int(args[2]) if len(args) > 2 else 200,
+        )
+    )
@@ -0,0 +1,389 @@
+"""Latency and throughput scenarios against a seeded database, saved as JSON
+
+    python -m benchmarks.suite [--tickets N] [--db PATH] [--target asgi|uvicorn] [--seconds S]
+                               [--concurrency C] [--scenarios login,get,...] [--out FILE] [--compare BASELINE]
+
+Each scenario drives the API through httpx for a fixed time, either in process (ASGI transport) or
+against local uvicorn workers, and records throughput, error count and latency percentiles. Results
+go to benchmarks/results/<timestamp>-<commit>.json; --compare prints the change against an earlier run.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+from httpx import AsyncClient, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.pagination import encode_cursor
+from app.models.ticket import Ticket, TicketPriority
+from app.models.user import User
+from benchmarks.common import SEED, session_factory
+from benchmarks.seed import PASSWORD, create_seeded_database, username
+
+RESULTS_DIR = Path(__file__).parent / "results"
+PORT = 8765
+DEEP_FRACTION = 0.9  # list_deep starts 90% of the way through the table
+
+
+class Context:
+    """What the scenarios need to know about the seeded data."""
+
+    def __init__(self, tickets: int, users: int, deep_cursor: str, tokens: list[str]):
+        self.tickets = tickets
+        self.users = users
+        self.deep_cursor = deep_cursor
+        self.tokens = tokens
+        self.rng = random.Random(SEED)
+
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+    def ticket_id(self) -> int:
+        return self.rng.randint(1, self.tickets)
+
+
+Scenario = Callable[[AsyncClient, Context], Awaitable[Response]]
+
+
+async def login(client: AsyncClient, ctx: Context) -> Response:
+    return await client.post(
+        "/api/v1/auth/login",
+        data={"username": username(ctx.rng.randint(1, ctx.users)), "password": PASSWORD},
+    )
+
+
+async def create(client: AsyncClient, ctx: Context) -> Response:
+    return await client.post(
+        "/api/v1/tickets/",
+        json={
+            "summary": "Benchmark ticket",
+            "description": "Created by the benchmark suite",
+            "priority": "high",
+        },
+        headers=ctx.headers(),
+    )
+
+
+async def list_shallow(client: AsyncClient, ctx: Context) -> Response:
+    return await client.get("/api/v1/tickets/", headers=ctx.headers())
+
+
+async def list_deep(client: AsyncClient, ctx: Context) -> Response:
+    return await client.get(
+        "/api/v1/tickets/", params={"cursor": ctx.deep_cursor}, headers=ctx.headers()
+    )
+
+
+async def my_queue(client: AsyncClient, ctx: Context) -> Response:
+    return await client.get(
+        "/api/v1/tickets/mine",
+        params=[("status", "open"), ("status", "in_progress"), ("sort", "priority")],
+        headers=ctx.headers(),
+    )
+
+
+async def get(client: AsyncClient, ctx: Context) -> Response:
+    return await client.get(f"/api/v1/tickets/{ctx.ticket_id()}", headers=ctx.headers())
+
+
+async def update(client: AsyncClient, ctx: Context) -> Response:
+    return await client.patch(
+        f"/api/v1/tickets/{ctx.ticket_id()}",
+        json={"priority": ctx.rng.choice(list(TicketPriority)).value},
+        headers=ctx.headers(),
+    )
+
+
+async def add_action(client: AsyncClient, ctx: Context) -> Response:
+    return await client.post(
+        f"/api/v1/tickets/{ctx.ticket_id()}/actions",
+        json={"action": "Comment: benchmark follow-up"},
+        headers=ctx.headers(),
+    )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "login": login,
+    "create": create,
+    "list_shallow": list_shallow,
+    "list_deep": list_deep,
+    "my_queue": my_queue,
+    "get": get,
+    "update": update,
+    "add_action": add_action,
+}
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else 0.0
+
+
+async def run_scenario(
+    client: AsyncClient, ctx: Context, scenario: Scenario, seconds: float, concurrency: int
+) -> dict:
+    samples: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def worker() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            response = await scenario(client, ctx)
+            elapsed = (time.perf_counter() - t0) * 1000
+            if response.status_code >= 400:
+                errors += 1
+            else:
+                samples.append(elapsed)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - t0
+    samples.sort()
+    return {
+        "requests": len(samples) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(samples) / wall, 2),
+        "latency_ms": {
+            "mean": round(sum(samples) / len(samples), 3) if samples else 0.0,
+            "p50": round(percentile(samples, 0.50), 3),
+            "p95": round(percentile(samples, 0.95), 3),
+            "p99": round(percentile(samples, 0.99), 3),
+            "max": round(samples[-1], 3) if samples else 0.0,
+        },
+    }
+
+
+async def describe_dataset(db_url: str) -> dict:
+    engine = create_async_engine(db_url)
+    async with engine.connect() as conn:
+        tickets = (await conn.execute(select(func.max(Ticket.id)))).scalar_one()
+        users = (await conn.execute(select(func.count()).select_from(User))).scalar_one()
+        # The cursor a client would hold after paging most of the way through the list
+        row = (
+            await conn.execute(
+                select(Ticket.created_at, Ticket.id)
+                .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+                .offset(int(tickets * DEEP_FRACTION))
+                .limit(1)
+            )
+        ).one()
+    await engine.dispose()
+    return {
+        "tickets": tickets,
+        "users": users,
+        "deep_cursor": encode_cursor(row.created_at, row.id),
+    }
+
+
+async def _wait_ready(client: AsyncClient, timeout: float = 30) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.02)
+    raise RuntimeError("uvicorn did not start")
+
+
+def _asgi_app(db_url: str):
+    """The app in process, with its sessions bound to the seeded database."""
+    from app.core.database import create_engine, get_db, get_read_db
+    from app.main import app
+
+    logging.getLogger("helpvia").setLevel(logging.WARNING)
+    engine = create_engine(db_url)
+    Session = session_factory(engine)
+
+    async def override_get_db():
+        async with Session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    return app, engine
+
+
+def git_commit() -> Optional[str]:
+    try:
+        repo = Path(__file__).parent
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=repo, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=repo,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+
+def _change(new: float, old: float) -> str:
+    return f"{(new - old) / old * 100:+6.1f}%" if old else "     n/a"
+
+
+def compare(baseline: dict, current: dict) -> None:
+    print(f"vs {baseline['meta'].get('commit') or 'baseline'} ({baseline['meta']['timestamp']})")
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        print(
+            f"  {name:<22} p50 {_change(result['latency_ms']['p50'], before['latency_ms']['p50'])}   p99 {_change(result['latency_ms']['p99'], before['latency_ms']['p99'])}   throughput {_change(result['throughput_rps'], before['throughput_rps'])}"
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    db_path = (
+        Path(args.db) if args.db else Path(tempfile.mkdtemp(prefix="helpvia-bench-")) / "suite.db"
+    )
+    if not db_path.exists():
+        t0 = time.perf_counter()
+        await create_seeded_database(db_path, args.tickets, args.users)
+        print(f"seeded {db_path} in {time.perf_counter() - t0:.1f} s")
+    db_url = f"sqlite+aiosqlite:///{db_path.resolve()}"
+    dataset = await describe_dataset(db_url)
+    env = {
+        "SQLITE_DATABASE_URL": db_url,
+        "ENVIRONMENT": "production",
+        "LOG_LEVEL": "WARNING",
+        "LOG_DIR": tempfile.mkdtemp(prefix="helpvia-bench-logs-"),
+    }
+    server = None
+    started = time.perf_counter()
+    if args.target == "uvicorn":
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "app.main:app",
+                "--port",
+                str(PORT),
+                "--workers",
+                str(args.workers),
+                "--log-level",
+                "warning",
+            ],
+            env={**os.environ, **env},
+        )
+        client = AsyncClient(base_url=f"http://127.0.0.1:{PORT}", timeout=60)
+    else:
+        app, engine = _asgi_app(db_url)
+        client = AsyncClient(app=app, base_url="http://bench", timeout=60)
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    results: dict[str, dict] = {}
+    try:
+        async with client:
+            if server is not None:
+                await _wait_ready(client)
+            # Spawn to first /health response for uvicorn; importing the app and wiring it up in process
+            cold_start_ms = round((time.perf_counter() - started) * 1000, 1)
+            tokens = []
+            for n in range(1, min(dataset["users"], 10) + 1):
+                response = await client.post(
+                    "/api/v1/auth/login", data={"username": username(n), "password": PASSWORD}
+                )
+                response.raise_for_status()
+                tokens.append(response.json()["access_token"])
+            ctx = Context(dataset["tickets"], dataset["users"], dataset["deep_cursor"], tokens)
+            print(
+                f"{dataset['tickets']} tickets, {dataset['users']} users, target={args.target}, concurrency={args.concurrency}, {args.seconds:.0f}s per scenario"
+            )
+            print(f"  {'cold start':<22} {cold_start_ms:8.1f} ms")
+            for name in names:
+                await run_scenario(
+                    client, ctx, SCENARIOS[name], min(1.0, args.seconds), args.concurrency
+                )  # warm up
+                results[name] = result = await run_scenario(
+                    client, ctx, SCENARIOS[name], args.seconds, args.concurrency
+                )
+                latency = result["latency_ms"]
+                print(
+                    f"  {name:<22} {result['throughput_rps']:8.1f} req/s   p50 {latency['p50']:8.2f} ms   p99 {latency['p99']:8.2f} ms   errors {result['errors']}"
+                )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        else:
+            await engine.dispose()
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "target": args.target,
+            "workers": args.workers if args.target == "uvicorn" else None,
+            "concurrency": args.concurrency,
+            "seconds": args.seconds,
+            "dataset": {"tickets": dataset["tickets"], "users": dataset["users"]},
+            "cold_start_ms": cold_start_ms,
+        },
+        "scenarios": results,
+    }
+    out = (
+        Path(args.out)
+        if args.out
+        else RESULTS_DIR
+        / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{(report['meta']['commit'] or 'nogit')[:7]}.json"
+    )
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"results written to {out}")
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text()), report)
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.suite", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument(
+        "--tickets", type=int, default=100_000, help="tickets to seed when --db does not exist yet"
+    )
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument(
+        "--db",
+        help="SQLite file to reuse (seeded on first use); defaults to a fresh temporary database",
+    )
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", help=f"comma separated subset of {','.join(SCENARIOS)}")
+    parser.add_argument(
+        "--out", help="result file (default benchmarks/results/<timestamp>-<commit>.json)"
+    )
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS) if args.scenarios else set()
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -1,10 +1,15 @@
 """Shared pytest fixtures"""
-import pytest
+
 import asyncio
+
+import pytest
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
-from app.core.database import Base, get_db
+
+from app.core.cache import token_cache, user_cache
+from app.core.database import Base, get_db, get_read_db
+from app.core.metrics import instrument_engine
 from app.core.security import get_password_hash
 from app.main import app
 from app.models.user import User
@@ -12,6 +17,8 @@ from app.models.user import User
 TEST_DB_URL = "sqlite+aiosqlite:///:memory:"
 test_engine = create_async_engine(TEST_DB_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool)
 TestSessionLocal = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+instrument_engine(test_engine, "test")
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -37,6 +44,9 @@ async def client(db_session):
     async def override_get_db():
         yield db_session
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    token_cache.clear()
+    user_cache.clear()
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()
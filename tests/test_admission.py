@@ -0,0 +1,106 @@
+"""Tests for admission control and load shedding"""
+
+import asyncio
+
+import pytest
+
+from app.core.admission import (
+    AUTH,
+    QUEUE_FULL,
+    QUEUE_TIMEOUT,
+    READ,
+    WRITE,
+    AdmissionGate,
+    AdmissionRejected,
+    admission_gates,
+    route_class,
+)
+from app.core.config import settings
+
+
+@pytest.mark.asyncio
+class TestAdmissionGate:
+    async def test_queue_hands_slots_over_in_order(self):
+        gate = AdmissionGate(limit=1, queue_size=2, queue_timeout=1)
+        await gate.acquire()
+        order = []
+
+        async def request(n):
+            await gate.acquire()
+            order.append(n)
+
+        waiters = [asyncio.create_task(request(n)) for n in (1, 2)]
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await gate.acquire()
+        assert exc_info.value.reason == QUEUE_FULL
+        gate.release()
+        await waiters[0]
+        gate.release()
+        await waiters[1]
+        assert order == [1, 2]
+        gate.release()
+        stats = gate.stats()
+        assert (
+            stats["in_use"],
+            stats["waiting"],
+            stats["admitted"],
+            stats["queued"],
+            stats["rejected_queue_full"],
+        ) == (0, 0, 3, 2, 1)
+
+    async def test_queue_deadline_rejects_and_frees_the_place(self):
+        gate = AdmissionGate(limit=1, queue_size=1, queue_timeout=0.01)
+        await gate.acquire()
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await gate.acquire()
+        assert exc_info.value.reason == QUEUE_TIMEOUT
+        assert gate.stats()["waiting"] == 0
+        gate.release()
+        await gate.acquire()
+        assert gate.stats()["in_use"] == 1
+
+    async def test_route_classes(self):
+        assert route_class("POST", "/api/v1/auth/login") == AUTH
+        assert route_class("GET", "/api/v1/auth/me") == AUTH
+        assert route_class("GET", "/api/v1/tickets/5") == READ
+        assert route_class("PATCH", "/api/v1/tickets/5") == WRITE
+        assert route_class("POST", "/api/v1/tickets/batch") == READ
+
+
+@pytest.mark.asyncio
+class TestAdmissionMiddleware:
+    async def test_saturated_class_is_shed_with_retry_after(
+        self, client, auth_headers, monkeypatch
+    ):
+        busy = AdmissionGate(limit=1, queue_size=0, queue_timeout=1)
+        await busy.acquire()
+        monkeypatch.setitem(admission_gates, WRITE, busy)
+        response = await client.post(
+            "/api/v1/tickets/",
+            json={"summary": "Shed", "description": "Pool is full"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == str(settings.ADMISSION_RETRY_AFTER_SECONDS)
+        assert response.json() == {"detail": "Server busy, retry shortly"}
+        # Other classes and the exempt probes are unaffected
+        assert (await client.get("/api/v1/tickets/", headers=auth_headers)).status_code == 200
+        assert (await client.get("/health")).status_code == 200
+        body = (await client.get("/metrics")).text
+        assert 'helpvia_admission_rejected_total{class="write",reason="queue_full"} 1' in body
+
+    async def test_health_is_exempt(self, client, monkeypatch):
+        for name in (READ, WRITE, AUTH):
+            monkeypatch.setitem(
+                admission_gates, name, AdmissionGate(limit=0, queue_size=0, queue_timeout=0)
+            )
+        assert (await client.get("/health")).status_code == 200
+        assert (await client.get("/api/v1/tickets/")).status_code == 503
+
+    async def test_disabled(self, client, monkeypatch):
+        monkeypatch.setitem(
+            admission_gates, READ, AdmissionGate(limit=0, queue_size=0, queue_timeout=0)
+        )
+        monkeypatch.setattr(settings, "ADMISSION_CONTROL_ENABLED", False)
+        assert (await client.get("/api/v1/tickets/")).status_code == 401
@@ -0,0 +1,220 @@
+"""Tests for archiving closed tickets and reading across both tiers"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.core.maintenance import reconcile_ticket_counters
+from app.models.ticket import Ticket, TicketStatus
+from app.models.ticket_action import TicketActionEntry
+from app.repositories.ticket_repository import TicketRepository
+from tests.conftest import TestSessionLocal
+
+NOW = datetime.utcnow()
+
+
+@pytest.fixture
+async def history(db_session, test_user):
+    """Six tickets, oldest first: three closed long ago, one closed recently, two open."""
+    specs = [
+        (TicketStatus.CLOSED, 200),
+        (TicketStatus.CLOSED, 150),
+        (TicketStatus.CLOSED, 120),
+        (TicketStatus.CLOSED, 5),
+        (TicketStatus.OPEN, None),
+        (TicketStatus.OPEN, None),
+    ]
+    tickets = [
+        Ticket(
+            summary=f"T{i}",
+            status=status,
+            created_by_id=test_user.id,
+            created_at=NOW - timedelta(days=300 - i),
+            closed_at=NOW - timedelta(days=closed) if closed else None,
+        )
+        for i, (status, closed) in enumerate(specs)
+    ]
+    db_session.add_all(tickets)
+    await db_session.flush()
+    db_session.add_all(
+        [
+            TicketActionEntry(ticket_id=tickets[0].id, action=f"Step {n}", user="testuser")
+            for n in range(3)
+        ]
+    )
+    await db_session.commit()
+    await reconcile_ticket_counters(TestSessionLocal)
+    return [ticket.id for ticket in tickets]
+
+
+async def archive(days: int = 90, chunk_size: int = 2) -> int:
+    async with TestSessionLocal() as db:
+        return await TicketRepository(db).archive_closed(
+            NOW - timedelta(days=days), chunk_size=chunk_size
+        )
+
+
+@pytest.mark.asyncio
+class TestArchive:
+    async def test_archive_moves_old_closed_tickets(self, client, auth_headers, history):
+        assert await archive() == 3
+        assert await archive() == 0
+        response = await client.get("/api/v1/tickets/", headers=auth_headers)
+        assert [t["summary"] for t in response.json()["items"]] == ["T5", "T4", "T3"]
+        assert response.json()["total"] == 3
+        stats = (await client.get("/api/v1/tickets/stats", headers=auth_headers)).json()
+        assert (stats["total"], stats["by_status"]["closed"], stats["archived"]) == (3, 1, 3)
+
+    async def test_reads_fall_through_to_archive(self, client, auth_headers, history):
+        await archive()
+        async with TestSessionLocal() as db:
+            archived = await TicketRepository(db).get_by_id(history[0])
+            assert archived.summary == "T0" and archived.status == TicketStatus.CLOSED
+        params = {"include_actions": True, "expand": "created_by"}
+        response = await client.get(
+            f"/api/v1/tickets/{history[0]}", params=params, headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert [a["action"] for a in response.json()["actions"]] == ["Step 0", "Step 1", "Step 2"]
+        assert response.json()["created_by"]["username"] == "testuser"
+        assert (
+            await client.get(f"/api/v1/tickets/{history[0]}/actions", headers=auth_headers)
+        ).json()["total"] == 3
+        assert (
+            await client.get(
+                f"/api/v1/tickets/{history[0]}",
+                params=params,
+                headers={**auth_headers, "If-None-Match": response.headers["etag"]},
+            )
+        ).status_code == 304
+
+    async def test_batch_get_spans_both_tiers(self, client, auth_headers, history):
+        await archive()
+        body = (
+            await client.post(
+                "/api/v1/tickets/batch",
+                json={"ids": [history[5], history[0]]},
+                headers=auth_headers,
+            )
+        ).json()
+        assert [item["ticket"]["summary"] for item in body["items"]] == ["T5", "T0"]
+
+    async def test_archived_tickets_are_read_only(self, client, auth_headers, history):
+        await archive()
+        ticket_id = history[0]
+        assert (
+            await client.patch(
+                f"/api/v1/tickets/{ticket_id}", json={"summary": "x"}, headers=auth_headers
+            )
+        ).status_code == 409
+        assert (
+            await client.put(
+                f"/api/v1/tickets/{ticket_id}", json={"summary": "x"}, headers=auth_headers
+            )
+        ).status_code == 409
+        assert (
+            await client.post(
+                f"/api/v1/tickets/{ticket_id}/actions", json={"action": "x"}, headers=auth_headers
+            )
+        ).status_code == 409
+        assert (
+            await client.delete(f"/api/v1/tickets/{ticket_id}", headers=auth_headers)
+        ).status_code == 409
+        assert (
+            await client.delete("/api/v1/tickets/9999", headers=auth_headers)
+        ).status_code == 404
+
+    async def test_include_archived_merges_tiers(self, client, auth_headers, history):
+        await archive()
+        everything = ["T5", "T4", "T3", "T2", "T1", "T0"]
+        response = await client.get(
+            "/api/v1/tickets/", params={"include_archived": True}, headers=auth_headers
+        )
+        assert [t["summary"] for t in response.json()["items"]] == everything
+        assert response.json()["total"] == 6
+        response = await client.get(
+            "/api/v1/tickets/",
+            params={"include_archived": True, "page": 2, "page_size": 2},
+            headers=auth_headers,
+        )
+        assert [t["summary"] for t in response.json()["items"]] == ["T3", "T2"]
+        seen, cursor = [], None
+        while True:
+            params = {
+                "include_archived": True,
+                "page_size": 4,
+                **({"cursor": cursor} if cursor else {}),
+            }
+            response = await client.get("/api/v1/tickets/", params=params, headers=auth_headers)
+            seen += [t["summary"] for t in response.json()["items"]]
+            cursor = response.json()["next_cursor"]
+            if not cursor:
+                break
+        assert seen == everything
+        response = await client.get(
+            "/api/v1/tickets/",
+            params={
+                "include_archived": True,
+                "status": "closed",
+                "created_before": (NOW - timedelta(days=298)).isoformat(),
+            },
+            headers=auth_headers,
+        )
+        assert [t["summary"] for t in response.json()["items"]] == ["T1", "T0"]
+        assert response.json()["total"] == 2
+
+    async def test_newest_ticket_id_is_not_reissued(
+        self, client, auth_headers, db_session, test_user
+    ):
+        only = Ticket(
+            summary="Only",
+            status=TicketStatus.CLOSED,
+            created_by_id=test_user.id,
+            closed_at=NOW - timedelta(days=365),
+        )
+        db_session.add(only)
+        await db_session.commit()
+        assert await archive() == 1
+        created = (
+            await client.post(
+                "/api/v1/tickets/",
+                json={"summary": "Next", "description": "After archiving"},
+                headers=auth_headers,
+            )
+        ).json()
+        assert created["id"] > only.id
+
+    async def test_ids_are_not_reissued_after_archiving(self, client, auth_headers, history):
+        await archive()
+        for ticket_id in history[3:]:
+            assert (
+                await client.delete(f"/api/v1/tickets/{ticket_id}", headers=auth_headers)
+            ).status_code == 204
+        created = (
+            await client.post(
+                "/api/v1/tickets/",
+                json={"summary": "Fresh", "description": "After archiving"},
+                headers=auth_headers,
+            )
+        ).json()
+        assert created["id"] > max(history)
+        await client.post(
+            f"/api/v1/tickets/{created['id']}/actions",
+            json={"action": "Replied"},
+            headers=auth_headers,
+        )
+        async with TestSessionLocal() as db:
+            await db.execute(
+                update(Ticket)
+                .where(Ticket.id == created["id"])
+                .values(status=TicketStatus.CLOSED, closed_at=NOW - timedelta(days=100))
+            )
+            await db.commit()
+        assert await archive() == 1
+        response = await client.get(f"/api/v1/tickets/{history[0]}/actions", headers=auth_headers)
+        assert [a["action"] for a in response.json()["items"]] == ["Step 0", "Step 1", "Step 2"]
+        response = await client.get(
+            f"/api/v1/tickets/{created['id']}/actions", headers=auth_headers
+        )
+        assert [a["action"] for a in response.json()["items"]][-1] == "Replied"
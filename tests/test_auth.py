@@ -1,5 +1,16 @@
 """Authentication tests"""
 import pytest
+from passlib.context import CryptContext
+from sqlalchemy import event
+
+from app.core.cache import user_cache
+from app.core.config import settings
+from app.core.database import get_read_db
+from app.core.security import password_hasher
+from app.main import app
+from app.repositories.user_repository import UserRepository
+from tests.conftest import test_engine
+
 
 @pytest.mark.asyncio
 class TestAuth:
@@ -17,3 +28,61 @@ class TestAuth:
         response = await client.get("/api/v1/auth/me", headers=auth_headers)
         assert response.status_code == 200
         assert response.json()["username"] == "testuser"
+
+    async def test_current_user_cached(self, client, auth_headers):
+        queries = []
+
+        def listener(*args):
+            queries.append(args[2])
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", listener)
+        try:
+            await client.get("/api/v1/auth/me", headers=auth_headers)
+            first = len(queries)
+            await client.get("/api/v1/auth/me", headers=auth_headers)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", listener)
+        assert first == 1
+        assert len(queries) == first
+        assert user_cache.hits >= 1
+
+    async def test_write_routes_authenticate_on_the_primary_session(self, client, auth_headers):
+        async def no_read_session():
+            raise AssertionError("a write route opened a read session")
+            yield
+
+        app.dependency_overrides[get_read_db] = no_read_session
+        user_cache.clear()
+        response = await client.post(
+            "/api/v1/tickets/", json={"summary": "Written"}, headers=auth_headers
+        )
+        assert response.status_code == 201
+
+    async def test_update_invalidates_cached_user(
+        self, client, auth_headers, db_session, test_user
+    ):
+        await client.get("/api/v1/auth/me", headers=auth_headers)
+        test_user.is_active = False
+        await UserRepository(db_session).update(test_user)
+        response = await client.get("/api/v1/auth/me", headers=auth_headers)
+        assert response.status_code == 400
+
+    async def test_login_rehashes_outdated_cost(self, client, db_session, test_user):
+        test_user.hashed_password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash(
+            "testpassword"
+        )
+        await db_session.commit()
+        response = await client.post(
+            "/api/v1/auth/login", data={"username": "testuser", "password": "testpassword"}
+        )
+        assert response.status_code == 200
+        await db_session.refresh(test_user)
+        assert test_user.hashed_password.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+
+    async def test_login_busy_hashing_pool(self, client, test_user, monkeypatch):
+        monkeypatch.setattr(password_hasher, "max_pending", -password_hasher.workers)
+        response = await client.post(
+            "/api/v1/auth/login", data={"username": "testuser", "password": "testpassword"}
+        )
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
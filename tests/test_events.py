@@ -0,0 +1,189 @@
+"""Tests for the ticket event feed"""
+
+import asyncio
+import json
+from typing import Optional
+
+import pytest
+
+from app.core.events import RESYNC, TICKET_CREATED, EventBroadcaster
+from app.main import app
+
+
+def drain(subscription) -> list:
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+class AsgiStream:
+    """Drives a long-lived request straight through the ASGI app, since httpx's transport buffers whole responses."""
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.sent: asyncio.Queue = asyncio.Queue()
+        self.incoming: asyncio.Queue = asyncio.Queue()
+
+    async def __aenter__(self):
+        self.task = asyncio.create_task(app(self.scope, self.incoming.get, self.sent.put))
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.incoming.put(
+            {
+                "type": (
+                    "http.disconnect" if self.scope["type"] == "http" else "websocket.disconnect"
+                ),
+                "code": 1000,
+            }
+        )
+        await asyncio.wait_for(self.task, 5)
+
+    async def next_message(self) -> dict:
+        return await asyncio.wait_for(self.sent.get(), 5)
+
+
+def make_scope(kind: str, path: str, query: str = "", headers: Optional[dict] = None) -> dict:
+    return {
+        "type": kind,
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http" if kind == "http" else "ws",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [
+            (b"host", b"test"),
+            *((k.lower().encode(), v.encode()) for k, v in (headers or {}).items()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("test", 80),
+        "subprotocols": [],
+    }
+
+
+class TestBroadcaster:
+    async def test_fan_out_and_resume(self):
+        broadcaster = EventBroadcaster(queue_size=10, history_size=5)
+        first = broadcaster.subscribe()
+        events = [broadcaster.publish(TICKET_CREATED, {"id": i}) for i in range(4)]
+        assert drain(first) == events
+        # Reconnect after the second event: only the two it missed are replayed
+        resumed = broadcaster.subscribe(last_event_id=events[1].id)
+        assert drain(resumed) == events[2:]
+        assert drain(broadcaster.subscribe(last_event_id=events[-1].id)) == []
+
+    async def test_resync_when_history_exhausted(self):
+        broadcaster = EventBroadcaster(queue_size=10, history_size=2)
+        events = [broadcaster.publish(TICKET_CREATED, {"id": i}) for i in range(5)]
+        [resync] = drain(broadcaster.subscribe(last_event_id=events[0].id))
+        assert resync.type == RESYNC
+        assert resync.id == events[-1].id
+
+    async def test_slow_consumer_dropped_without_blocking_others(self):
+        broadcaster = EventBroadcaster(queue_size=2, history_size=10)
+        slow, fast = broadcaster.subscribe(), broadcaster.subscribe()
+        for i in range(3):
+            broadcaster.publish(TICKET_CREATED, {"id": i})
+            drain(fast)
+        assert slow.dropped and not fast.dropped
+        assert [event async for event in slow.events()] == []
+        assert broadcaster.stats() == {
+            "subscribers": 1,
+            "published": 3,
+            "slow_consumers_dropped": 1,
+        }
+
+
+@pytest.mark.asyncio
+class TestEventFeed:
+    async def test_sse_stream_pushes_changes(self, client, auth_headers):
+        async with AsgiStream(
+            make_scope("http", "/api/v1/tickets/events", headers=auth_headers)
+        ) as stream:
+            start = await stream.next_message()
+            assert start["status"] == 200
+            assert (b"content-type", b"text/event-stream; charset=utf-8") in start["headers"]
+            assert (await stream.next_message())["body"] == b"retry: 3000\n\n"
+            created = (
+                await client.post(
+                    "/api/v1/tickets/", json={"summary": "Live"}, headers=auth_headers
+                )
+            ).json()
+            await client.post(
+                f"/api/v1/tickets/{created['id']}/actions",
+                json={"action": "Looking"},
+                headers=auth_headers,
+            )
+            await client.delete(f"/api/v1/tickets/{created['id']}", headers=auth_headers)
+            frames = [(await stream.next_message())["body"].decode() for _ in range(3)]
+        events = [
+            dict(line.split(": ", 1) for line in frame.strip().split("\n")) for frame in frames
+        ]
+        assert [event["event"] for event in events] == [
+            "ticket.created",
+            "ticket.action",
+            "ticket.deleted",
+        ]
+        assert json.loads(events[0]["data"])["data"]["summary"] == "Live"
+        assert json.loads(events[1]["data"])["data"]["action"] == "Looking"
+        ids = [int(event["id"]) for event in events]
+        assert ids == sorted(ids)
+
+    async def test_sse_resume_from_last_event_id(self, client, auth_headers):
+        async with AsgiStream(
+            make_scope("http", "/api/v1/tickets/events", headers=auth_headers)
+        ) as stream:
+            await stream.next_message()
+            await stream.next_message()
+            created = (
+                await client.post(
+                    "/api/v1/tickets/", json={"summary": "Before"}, headers=auth_headers
+                )
+            ).json()
+            frame = (await stream.next_message())["body"].decode()
+        last_event_id = frame.split("\n")[0].removeprefix("id: ")
+        # Changed while the client was disconnected
+        await client.patch(
+            f"/api/v1/tickets/{created['id']}", json={"priority": "high"}, headers=auth_headers
+        )
+        async with AsgiStream(
+            make_scope(
+                "http",
+                "/api/v1/tickets/events",
+                headers={**auth_headers, "Last-Event-ID": last_event_id},
+            )
+        ) as stream:
+            await stream.next_message()
+            await stream.next_message()
+            frame = (await stream.next_message())["body"].decode()
+        assert "event: ticket.updated" in frame and '"priority":"high"' in frame
+
+    async def test_sse_requires_auth(self, client):
+        response = await client.get("/api/v1/tickets/events")
+        assert response.status_code == 401
+
+    async def test_websocket_feed(self, client, auth_token, auth_headers):
+        async with AsgiStream(
+            make_scope("websocket", "/api/v1/tickets/events/ws", query=f"token={auth_token}")
+        ) as stream:
+            await stream.incoming.put({"type": "websocket.connect"})
+            assert (await stream.next_message())["type"] == "websocket.accept"
+            await client.post(
+                "/api/v1/tickets/", json={"summary": "Over the socket"}, headers=auth_headers
+            )
+            message = await stream.next_message()
+        event = json.loads(message["text"])
+        assert event["type"] == "ticket.created"
+        assert event["data"]["summary"] == "Over the socket"
+
+    async def test_websocket_rejects_bad_token(self, client):
+        async with AsgiStream(
+            make_scope("websocket", "/api/v1/tickets/events/ws", query="token=nope")
+        ) as stream:
+            await stream.incoming.put({"type": "websocket.connect"})
+            message = await stream.next_message()
+        assert message["type"] == "websocket.close" and message["code"] == 1008
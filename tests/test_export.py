@@ -0,0 +1,48 @@
+"""Export memory tests"""
+
+import tracemalloc
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.export import ndjson_lines
+from app.models.ticket import Ticket
+from app.repositories.ticket_repository import TicketRepository
+
+
+async def _seed(db_session, count: int) -> None:
+    rows = [
+        {
+            "summary": f"Ticket {i}",
+            "description": "x" * 200,
+            "created_at": datetime(2024, 1, 1),
+            "updated_at": datetime(2024, 1, 1),
+        }
+        for i in range(count)
+    ]
+    await db_session.execute(insert(Ticket), rows)
+    await db_session.commit()
+
+
+async def _export_peak(db_session) -> tuple:
+    tracemalloc.start()
+    exported = 0
+    async for _ in ndjson_lines(TicketRepository(db_session).stream_for_export(batch_size=500)):
+        exported += 1
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return exported, peak
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+class TestExportMemory:
+    async def test_export_memory_flat(self, db_session):
+        await _seed(db_session, 2_000)
+        small_count, small_peak = await _export_peak(db_session)
+        await _seed(db_session, 38_000)
+        large_count, large_peak = await _export_peak(db_session)
+        assert (small_count, large_count) == (2_000, 40_000)
+        # 20x the rows must not cost anywhere near 20x the memory
+        assert large_peak < 2 * small_peak
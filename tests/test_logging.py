@@ -0,0 +1,59 @@
+"""Tests for the queued logging pipeline"""
+
+import json
+import logging
+import queue
+
+import pytest
+
+from app.core.logging_config import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestContextFilter,
+    request_id,
+)
+
+
+def make_record(
+    level: int = logging.INFO, msg: str = "hello %s", args: tuple = ("world",)
+) -> logging.LogRecord:
+    return logging.LogRecord("helpvia", level, __file__, 1, msg, args, None)
+
+
+@pytest.mark.asyncio
+class TestRequestIds:
+    async def test_request_id_generated_and_echoed(self, client):
+        response = await client.get("/health")
+        assert len(response.headers["x-request-id"]) == 32
+        response = await client.get("/health", headers={"X-Request-ID": "abc-123"})
+        assert response.headers["x-request-id"] == "abc-123"
+
+
+class TestLoggingPipeline:
+    def test_queue_handler_renders_message_and_never_blocks(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        handler.addFilter(RequestContextFilter())
+        token = request_id.set("req-1")
+        try:
+            handler.handle(make_record())
+            handler.handle(make_record())
+        finally:
+            request_id.reset(token)
+        assert handler.dropped == 1
+        record = handler.queue.get_nowait()
+        assert record.msg == "hello world" and record.args is None
+        assert record.request_id == "req-1"
+
+    def test_json_format(self):
+        record = make_record()
+        RequestContextFilter().filter(record)
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["message"] == "hello world"
+        assert entry["level"] == "INFO"
+        assert entry["request_id"] == "-"
+
+    def test_debug_sampling_spares_other_levels(self):
+        sampler = RequestContextFilter(debug_sample_rate=0.0)
+        assert not sampler.filter(make_record(logging.DEBUG))
+        assert sampler.filter(make_record(logging.INFO))
+        assert RequestContextFilter(debug_sample_rate=1.0).filter(make_record(logging.DEBUG))
@@ -0,0 +1,95 @@
+"""Tests for /metrics and request instrumentation"""
+
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+def sample(body: str, prefix: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} not found")
+
+
+@pytest.mark.asyncio
+class TestMetrics:
+    async def test_route_latency_and_status_counts(self, client, auth_headers):
+        metrics.reset()
+        await client.get("/api/v1/tickets/", headers=auth_headers)
+        await client.get("/api/v1/tickets/999", headers=auth_headers)
+        await client.get("/api/v1/tickets/998", headers=auth_headers)
+        await client.get("/no/such/path")
+        response = await client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        # Labelled by route template, not raw path
+        assert (
+            sample(
+                body,
+                'helpvia_http_responses_total{method="GET",route="/api/v1/tickets/{ticket_id}",status="404"}',
+            )
+            == 2
+        )
+        assert (
+            sample(
+                body,
+                'helpvia_http_responses_total{method="GET",route="/api/v1/tickets/",status="200"}',
+            )
+            == 1
+        )
+        assert (
+            sample(
+                body, 'helpvia_http_responses_total{method="GET",route="unmatched",status="404"}'
+            )
+            == 1
+        )
+        assert (
+            sample(
+                body,
+                'helpvia_http_request_duration_seconds_count{method="GET",route="/api/v1/tickets/{ticket_id}"}',
+            )
+            == 2
+        )
+        assert (
+            sample(
+                body,
+                'helpvia_http_request_duration_seconds_bucket{method="GET",route="/api/v1/tickets/{ticket_id}",le="+Inf"}',
+            )
+            == 2
+        )
+        # The scrape itself is in flight
+        assert sample(body, "helpvia_http_requests_in_flight") == 1
+        assert "helpvia_auth_cache_lookups_total" in body
+        assert "helpvia_password_hash_rejected_total" in body
+
+    async def test_db_queries_counted_per_route(self, client, auth_headers):
+        await client.post(
+            "/api/v1/tickets/",
+            json={"summary": "Counted", "description": "Query counting"},
+            headers=auth_headers,
+        )
+        metrics.reset()
+        await client.get("/api/v1/tickets/1", headers=auth_headers)
+        body = (await client.get("/metrics")).text
+        # Auth is cached after the create: the version probe plus the row itself
+        assert sample(body, 'helpvia_db_queries_total{route="/api/v1/tickets/{ticket_id}"}') == 2
+        assert (
+            sample(body, 'helpvia_db_query_seconds_total{route="/api/v1/tickets/{ticket_id}"}') > 0
+        )
+
+    async def test_debug_timing_header_is_opt_in(self, client, auth_headers, monkeypatch):
+        headers = {**auth_headers, "X-Debug-Timing": "1"}
+        response = await client.get("/api/v1/tickets/", headers=headers)
+        assert "server-timing" not in response.headers
+        monkeypatch.setattr(settings, "DEBUG_TIMING_HEADER", True)
+        response = await client.get("/api/v1/tickets/", headers=auth_headers)
+        assert "server-timing" not in response.headers
+        response = await client.get("/api/v1/tickets/", headers=headers)
+        timing = response.headers["server-timing"]
+        phases = dict(part.split(";", 1)[0:2] for part in timing.split(", "))
+        assert set(phases) == {"auth", "db", "serialize", "total"}
+        # Page, total and collection version
+        assert 'desc="3 queries"' in timing
@@ -0,0 +1,180 @@
+"""Migration tests"""
+
+import json
+
+import pytest
+from sqlalchemy import inspect, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.migrations import (
+    SCHEMA_HEAD,
+    SchemaOutOfDate,
+    add_ticket_version_column,
+    current_version,
+    ensure_schema,
+    migrate_actions_json,
+    upgrade,
+)
+from app.models.ticket import Ticket
+from app.models.ticket_action import TicketActionEntry
+from tests.conftest import test_engine
+
+# The schema create_all produced at the first release, before any migration existed
+BASELINE_SCHEMA = [
+    """CREATE TABLE users (
+        id INTEGER NOT NULL,
+        username VARCHAR(50) NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        hashed_password VARCHAR(255) NOT NULL,
+        full_name VARCHAR(255),
+        is_active BOOLEAN NOT NULL,
+        is_superuser BOOLEAN NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (id)
+    )""",
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    "CREATE UNIQUE INDEX ix_users_username ON users (username)",
+    "CREATE INDEX ix_users_id ON users (id)",
+    """CREATE TABLE tickets (
+        id INTEGER NOT NULL,
+        summary VARCHAR(255) NOT NULL,
+        description TEXT,
+        status VARCHAR(11) NOT NULL,
+        priority VARCHAR(8) NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        closed_at DATETIME,
+        actions_json TEXT,
+        assigned_to_id INTEGER,
+        created_by_id INTEGER,
+        PRIMARY KEY (id),
+        FOREIGN KEY(assigned_to_id) REFERENCES users (id),
+        FOREIGN KEY(created_by_id) REFERENCES users (id)
+    )""",
+    "CREATE INDEX ix_tickets_id ON tickets (id)",
+    "CREATE INDEX ix_tickets_summary ON tickets (summary)",
+]
+
+
+@pytest.mark.asyncio
+class TestMigrations:
+    async def test_migrate_actions_json(self, db_session, test_user):
+        history = {
+            "2024-01-01T10:00:00": {
+                "action": "Opened",
+                "user": "testuser",
+                "timestamp": "2024-01-01T10:00:00",
+            },
+            "2024-01-01T11:00:00": {
+                "action": "Replied",
+                "user": "agent",
+                "timestamp": "2024-01-01T11:00:00",
+            },
+        }
+        ticket = Ticket(
+            summary="Legacy", created_by_id=test_user.id, actions_json=json.dumps(history)
+        )
+        db_session.add(ticket)
+        await db_session.commit()
+        assert await migrate_actions_json(test_engine, batch_size=1) == 2
+        assert await migrate_actions_json(test_engine) == 0
+        entries = (
+            (await db_session.execute(select(TicketActionEntry).order_by(TicketActionEntry.id)))
+            .scalars()
+            .all()
+        )
+        assert [e.action for e in entries] == ["Opened", "Replied"]
+
+    async def test_add_ticket_version_column(self, test_db):
+        assert await add_ticket_version_column(test_engine) is False
+        async with test_engine.begin() as conn:
+            await conn.execute(text("ALTER TABLE tickets DROP COLUMN version"))
+        assert await add_ticket_version_column(test_engine) is True
+
+    async def test_upgrade_creates_and_stamps_empty_database(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        try:
+            assert await current_version(engine) is None
+            assert await upgrade(engine) == []
+            assert await current_version(engine) == SCHEMA_HEAD
+            async with engine.connect() as conn:
+                tables = await conn.run_sync(
+                    lambda sync_conn: set(inspect(sync_conn).get_table_names())
+                )
+            assert {
+                "tickets",
+                "ticket_actions",
+                "ticket_counters",
+                "tickets_fts",
+                "schema_version",
+            } <= tables
+        finally:
+            await engine.dispose()
+
+    async def test_upgrade_unversioned_database(self):
+        # A database from the first release: no version stamp, no later tables or columns, history still in actions_json
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+        history = {
+            "2024-01-01T10:00:00": {
+                "action": "Opened",
+                "user": "testuser",
+                "timestamp": "2024-01-01T10:00:00",
+            }
+        }
+        try:
+            async with engine.begin() as conn:
+                for statement in BASELINE_SCHEMA:
+                    await conn.execute(text(statement))
+                await conn.execute(
+                    text(
+                        "INSERT INTO users (id, username, email, hashed_password, is_active, is_superuser, created_at, updated_at) VALUES (1, 'testuser', 'test@example.com', 'x', 1, 0, '2024-01-01 09:00:00', '2024-01-01 09:00:00')"
+                    )
+                )
+                await conn.execute(
+                    text(
+                        "INSERT INTO tickets (summary, status, priority, created_at, updated_at, actions_json, created_by_id) VALUES ('Legacy', 'OPEN', 'MEDIUM', '2024-01-01 10:00:00', '2024-01-01 10:00:00', :history, 1)"
+                    ),
+                    {"history": json.dumps(history)},
+                )
+            assert await upgrade(engine) == list(range(1, SCHEMA_HEAD + 1))
+            assert await current_version(engine) == SCHEMA_HEAD
+            assert await upgrade(engine) == []
+            async with engine.connect() as conn:
+                columns = await conn.run_sync(
+                    lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns("tickets")}
+                )
+                indexes = await conn.run_sync(
+                    lambda sync_conn: {i["name"] for i in inspect(sync_conn).get_indexes("tickets")}
+                )
+                counters = (
+                    await conn.execute(
+                        text(
+                            "SELECT count FROM ticket_counters WHERE scope = 'status' AND key = 'open'"
+                        )
+                    )
+                ).scalar()
+                actions = (await conn.execute(select(TicketActionEntry.action))).scalars().all()
+                ddl = (
+                    await conn.execute(
+                        text(
+                            "SELECT group_concat(sql) FROM sqlite_master WHERE name IN ('tickets', 'ticket_actions')"
+                        )
+                    )
+                ).scalar()
+            assert {column.name for column in Ticket.__table__.columns} <= columns
+            assert {index.name for index in Ticket.__table__.indexes} <= indexes
+            assert counters == 1
+            assert actions == ["Opened"]
+            assert ddl.count("AUTOINCREMENT") == 2
+        finally:
+            await engine.dispose()
+
+    async def test_startup_check_outside_development(self, test_db, monkeypatch):
+        monkeypatch.setattr(settings, "ENVIRONMENT", "production")
+        with pytest.raises(SchemaOutOfDate):
+            await ensure_schema(test_engine)
+        await upgrade(test_engine)
+        await ensure_schema(test_engine)
@@ -0,0 +1,197 @@
+"""Tests for the reporting rollups and /reports endpoints"""
+
+from datetime import datetime, time, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.ticket_report import TicketReportDirtyDay
+from app.repositories.report_repository import ReportRepository, close_time_percentile
+from app.repositories.ticket_repository import TicketRepository
+from tests.conftest import TestSessionLocal
+
+TODAY = datetime.utcnow().date()
+D0 = TODAY - timedelta(days=10)
+D1, D2 = D0 + timedelta(days=1), D0 + timedelta(days=2)
+RANGE = {"since": D0.isoformat(), "until": D2.isoformat()}
+
+
+def at(day, hour: int) -> datetime:
+    return datetime.combine(day, time(hour))
+
+
+@pytest.fixture
+async def tickets(db_session, test_user):
+    """A closed after 2h and B after 48h (both assigned), C and D still open; nothing updated recently."""
+    specs = [
+        ("A", TicketPriority.HIGH, at(D0, 10), at(D0, 12), test_user.id),
+        ("B", TicketPriority.LOW, at(D0, 12), at(D2, 12), test_user.id),
+        ("C", TicketPriority.HIGH, at(D1, 9), None, None),
+        ("D", TicketPriority.CRITICAL, at(D2, 9), None, None),
+    ]
+    rows = [
+        Ticket(
+            summary=summary,
+            priority=priority,
+            status=TicketStatus.CLOSED if closed_at else TicketStatus.OPEN,
+            created_at=created_at,
+            updated_at=closed_at or created_at,
+            closed_at=closed_at,
+            assigned_to_id=assignee,
+            created_by_id=test_user.id,
+        )
+        for summary, priority, created_at, closed_at, assignee in specs
+    ]
+    db_session.add_all(rows)
+    await db_session.commit()
+    return {ticket.summary: ticket.id for ticket in rows}
+
+
+async def refresh(**kwargs) -> int:
+    async with TestSessionLocal() as db:
+        return await ReportRepository(db).refresh(**kwargs)
+
+
+async def volume(client, auth_headers, **params):
+    response = await client.get(
+        "/api/v1/reports/volume", params={**RANGE, **params}, headers=auth_headers
+    )
+    return {day["day"]: (day["opened"], day["closed"]) for day in response.json()["days"]}
+
+
+@pytest.mark.asyncio
+class TestReports:
+    async def test_volume_and_backlog(self, client, auth_headers, tickets):
+        assert await refresh() == 11
+        assert await volume(client, auth_headers) == {
+            D0.isoformat(): (2, 1),
+            D1.isoformat(): (1, 0),
+            D2.isoformat(): (1, 1),
+        }
+        assert (await volume(client, auth_headers, priority="high"))[D0.isoformat()] == (1, 1)
+        backlog = (
+            await client.get(
+                "/api/v1/reports/backlog",
+                params={"since": D1.isoformat(), "until": D2.isoformat()},
+                headers=auth_headers,
+            )
+        ).json()
+        assert [day["total"] for day in backlog["days"]] == [2, 2]
+        assert backlog["days"][1]["by_priority"] == {
+            "low": 0,
+            "medium": 0,
+            "high": 1,
+            "critical": 1,
+        }
+        assert backlog["refreshed_at"] is not None
+
+    async def test_time_to_close(self, client, auth_headers, tickets, test_user):
+        await refresh()
+        body = (
+            await client.get("/api/v1/reports/time-to-close", params=RANGE, headers=auth_headers)
+        ).json()
+        assert body["assignees"] == [
+            {
+                "assigned_to_id": test_user.id,
+                "closed": 2,
+                "mean_hours": 25.0,
+                "p50_hours": 4.0,
+                "p90_hours": 62.4,
+            }
+        ]
+        # Whole calendar months are read from the monthly rollup instead
+        months = {
+            "since": D0.replace(day=1).isoformat(),
+            "until": (
+                (D2.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+            ).isoformat(),
+        }
+        assert (
+            await client.get("/api/v1/reports/time-to-close", params=months, headers=auth_headers)
+        ).json()["assignees"] == body["assignees"]
+
+    async def test_refresh_recomputes_changed_days(self, client, auth_headers, tickets):
+        await refresh()
+        assert await refresh() == 0
+        await client.patch(
+            f"/api/v1/tickets/{tickets['C']}", json={"status": "closed"}, headers=auth_headers
+        )
+        assert await refresh() == 2
+        assert (
+            await volume(client, auth_headers, since=TODAY.isoformat(), until=TODAY.isoformat())
+        )[TODAY.isoformat()] == (0, 1)
+        # Neither leaves a newer updated_at on the old days, so only the dirty-day marks bring them back
+        await client.delete(f"/api/v1/tickets/{tickets['B']}", headers=auth_headers)
+        await client.patch(
+            f"/api/v1/tickets/{tickets['A']}", json={"status": "open"}, headers=auth_headers
+        )
+        await client.patch(
+            f"/api/v1/tickets/{tickets['A']}", json={"status": "closed"}, headers=auth_headers
+        )
+        await refresh()
+        assert await volume(client, auth_headers) == {
+            D0.isoformat(): (1, 0),
+            D1.isoformat(): (1, 0),
+            D2.isoformat(): (1, 0),
+        }
+
+    async def test_put_reclose_marks_the_old_close_day(self, client, auth_headers, tickets):
+        await refresh()
+        assert (
+            await client.put(
+                f"/api/v1/tickets/{tickets['A']}", json={"status": "closed"}, headers=auth_headers
+            )
+        ).status_code == 200
+        async with TestSessionLocal() as db:
+            assert list((await db.execute(select(TicketReportDirtyDay.day))).scalars()) == [D0]
+        await refresh()
+        assert (await volume(client, auth_headers))[D0.isoformat()] == (2, 0)
+
+    async def test_archived_tickets_still_count(self, client, auth_headers, tickets):
+        async with TestSessionLocal() as db:
+            assert await TicketRepository(db).archive_closed(datetime.utcnow()) == 2
+        await refresh(full=True)
+        assert await volume(client, auth_headers) == {
+            D0.isoformat(): (2, 1),
+            D1.isoformat(): (1, 0),
+            D2.isoformat(): (1, 1),
+        }
+
+    async def test_range_validation(self, client, auth_headers):
+        assert (
+            await client.get(
+                "/api/v1/reports/volume",
+                params={"since": D2.isoformat(), "until": D0.isoformat()},
+                headers=auth_headers,
+            )
+        ).status_code == 400
+        assert (
+            await client.get(
+                "/api/v1/reports/volume",
+                params={"since": "2020-01-01", "until": "2024-01-01"},
+                headers=auth_headers,
+            )
+        ).status_code == 400
+        assert (
+            len((await client.get("/api/v1/reports/volume", headers=auth_headers)).json()["days"])
+            == 30
+        )
+
+    async def test_dirty_day_marks_without_native_insert_ignore(self, test_db):
+        # The path for dialects other than SQLite and MySQL: skip days already marked, insert the rest
+        async with TestSessionLocal() as db:
+            reports = ReportRepository(db)
+            await reports._insert_missing_days([D0, D1])
+            await reports._insert_missing_days([D1, D2])
+            await db.commit()
+            assert sorted((await db.execute(select(TicketReportDirtyDay.day))).scalars()) == [
+                D0,
+                D1,
+                D2,
+            ]
+
+    async def test_close_time_percentile(self):
+        assert close_time_percentile([0] * 7, 0.5) is None
+        assert close_time_percentile([2, 0, 0, 0, 0, 0, 0], 0.5) == 1800
+        assert close_time_percentile([0, 0, 0, 0, 0, 0, 3], 0.9) == 30 * 86400
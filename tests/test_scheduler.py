@@ -0,0 +1,216 @@
+"""Tests for the lease-coordinated scheduler and its ticket jobs"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.maintenance import (
+    close_resolved_tickets,
+    flag_sla_breaches,
+    reconcile_ticket_counters,
+    scheduled_jobs,
+)
+from app.core.scheduler import ScheduledJob, Scheduler
+from app.models.job_lease import JobLease
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.ticket_action import TicketActionEntry
+from tests.conftest import TestSessionLocal
+from tests.test_metrics import sample
+
+NOW = datetime.utcnow()
+
+
+def counting_job(name: str = "count", interval: float = 3600) -> ScheduledJob:
+    async def run(session_factory) -> int:
+        return 2
+
+    return ScheduledJob(name, run, interval)
+
+
+async def expire_lease(name: str) -> None:
+    async with TestSessionLocal() as db:
+        await db.execute(
+            update(JobLease)
+            .where(JobLease.name == name)
+            .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+        )
+        await db.commit()
+
+
+async def add_tickets(user_id: int, specs: list) -> list:
+    """specs: (status, priority, age in hours since created, hours since last updated)"""
+    async with TestSessionLocal() as db:
+        tickets = [
+            Ticket(
+                summary=f"T{i}",
+                status=status,
+                priority=priority,
+                created_by_id=user_id,
+                created_at=NOW - timedelta(hours=age),
+                updated_at=NOW - timedelta(hours=idle),
+            )
+            for i, (status, priority, age, idle) in enumerate(specs)
+        ]
+        db.add_all(tickets)
+        await db.commit()
+        ids = [ticket.id for ticket in tickets]
+    await reconcile_ticket_counters(TestSessionLocal)
+    return ids
+
+
+@pytest.mark.asyncio
+class TestLease:
+    async def test_one_worker_runs_a_due_job(self, test_db):
+        first, second = Scheduler(TestSessionLocal, [], owner="a"), Scheduler(
+            TestSessionLocal, [], owner="b"
+        )
+        job_a, job_b = counting_job(), counting_job()
+        assert await first.run_once(job_a)
+        assert not await second.run_once(job_b)
+        # Released until the next due time, so not even the holder runs it again early
+        assert not await first.run_once(job_a)
+        assert (job_a.runs, job_a.processed, job_a.skipped, job_b.runs, job_b.skipped) == (
+            1,
+            2,
+            1,
+            0,
+            1,
+        )
+        async with TestSessionLocal() as db:
+            lease = await db.get(JobLease, "count")
+            assert lease.owner == "a" and lease.last_finished_at is not None
+            assert lease.expires_at > datetime.utcnow() + timedelta(minutes=59)
+        await expire_lease("count")
+        assert await second.run_once(job_b)
+        assert job_b.runs == 1
+
+    async def test_crashed_holder_blocks_only_until_its_lease_expires(self, test_db):
+        crashed, survivor = Scheduler(TestSessionLocal, [], owner="a"), Scheduler(
+            TestSessionLocal, [], owner="b"
+        )
+        assert await crashed.acquire("count")
+        assert not await survivor.acquire("count")
+        await expire_lease("count")
+        assert await survivor.acquire("count")
+        assert not await crashed.renew("count")
+        assert await survivor.renew("count")
+
+    async def test_failed_run_is_counted_and_releases_the_lease(self, test_db):
+        async def broken(session_factory):
+            raise RuntimeError("boom")
+
+        scheduler = Scheduler(TestSessionLocal, [], owner="a")
+        job = ScheduledJob("broken", broken, interval=0)
+        assert await scheduler.run_once(job)
+        assert await scheduler.run_once(job)
+        assert (job.runs, job.failures, job.last_success, job.running) == (2, 2, None, False)
+
+    async def test_every_job_is_scheduled_by_default(self):
+        jobs = {job.name: job.interval for job in scheduled_jobs()}
+        assert jobs == {
+            "archive-closed": 86400,
+            "refresh-reports": 300,
+            "close-resolved": 3600,
+            "flag-sla-breaches": 300,
+        }
+
+    async def test_job_metrics(self, client):
+        job = counting_job("metered")
+        scheduler = Scheduler(TestSessionLocal, [job], owner="a")
+        scheduler.start()
+        for _ in range(100):
+            if job.runs:
+                break
+            await asyncio.sleep(0.01)
+        body = (await client.get("/metrics")).text
+        await scheduler.stop()
+        assert sample(body, 'helpvia_job_runs_total{job="metered",result="success"}') == 1
+        assert sample(body, 'helpvia_job_runs_total{job="metered",result="failure"}') == 0
+        assert sample(body, 'helpvia_job_processed_total{job="metered"}') == 2
+        assert sample(body, 'helpvia_job_running{job="metered"}') == 0
+        assert sample(body, 'helpvia_job_last_success_timestamp_seconds{job="metered"}') > 0
+        assert 'job="metered"' not in (await client.get("/metrics")).text
+
+
+@pytest.mark.asyncio
+class TestTicketJobs:
+    async def test_close_resolved_in_chunks(self, client, auth_headers, test_user, monkeypatch):
+        monkeypatch.setattr("app.core.maintenance.settings.SCHEDULER_BATCH_SIZE", 2)
+        week = 24 * 8
+        ids = await add_tickets(
+            test_user.id,
+            [(TicketStatus.RESOLVED, TicketPriority.LOW, week, week)] * 3
+            + [
+                (TicketStatus.RESOLVED, TicketPriority.LOW, week, 24),
+                (TicketStatus.OPEN, TicketPriority.LOW, week, week),
+            ],
+        )
+        assert await close_resolved_tickets(TestSessionLocal) == 3
+        assert await close_resolved_tickets(TestSessionLocal) == 0
+        async with TestSessionLocal() as db:
+            rows = (
+                await db.execute(select(Ticket.status, Ticket.closed_at).order_by(Ticket.id))
+            ).all()
+            assert [status for status, _ in rows] == [TicketStatus.CLOSED] * 3 + [
+                TicketStatus.RESOLVED,
+                TicketStatus.OPEN,
+            ]
+            assert all(closed_at is not None for _, closed_at in rows[:3])
+            actions = (
+                await db.execute(
+                    select(
+                        TicketActionEntry.ticket_id,
+                        TicketActionEntry.user,
+                        TicketActionEntry.action,
+                    )
+                )
+            ).all()
+            assert sorted(actions) == [
+                (ticket_id, "system", "Status changed to closed") for ticket_id in ids[:3]
+            ]
+        stats = (await client.get("/api/v1/tickets/stats", headers=auth_headers)).json()
+        assert (stats["by_status"]["closed"], stats["by_status"]["resolved"]) == (3, 1)
+
+    async def test_flag_sla_breaches_by_priority(self, client, auth_headers, test_user):
+        ids = await add_tickets(
+            test_user.id,
+            [
+                (TicketStatus.OPEN, TicketPriority.CRITICAL, 5, 5),
+                (TicketStatus.ON_HOLD, TicketPriority.CRITICAL, 5, 5),
+                (TicketStatus.OPEN, TicketPriority.CRITICAL, 3, 3),
+                (TicketStatus.OPEN, TicketPriority.LOW, 5, 5),
+                (TicketStatus.IN_PROGRESS, TicketPriority.LOW, 200, 200),
+                (TicketStatus.CLOSED, TicketPriority.CRITICAL, 200, 200),
+            ],
+        )
+        before = await client.get(f"/api/v1/tickets/{ids[0]}", headers=auth_headers)
+        assert before.json()["sla_breached_at"] is None
+        assert await flag_sla_breaches(TestSessionLocal) == 3
+        assert await flag_sla_breaches(TestSessionLocal) == 0
+        flagged = [
+            (await client.get(f"/api/v1/tickets/{ticket_id}", headers=auth_headers)).json()
+            for ticket_id in ids
+        ]
+        assert [ticket["sla_breached_at"] is not None for ticket in flagged] == [
+            True,
+            True,
+            False,
+            False,
+            True,
+            False,
+        ]
+        # A flag bumps the version, so cached copies revalidate
+        assert (
+            await client.get(
+                f"/api/v1/tickets/{ids[0]}",
+                headers={**auth_headers, "If-None-Match": before.headers["etag"]},
+            )
+        ).status_code == 200
+        actions = (
+            await client.get(f"/api/v1/tickets/{ids[4]}/actions", headers=auth_headers)
+        ).json()["items"]
+        assert [(a["user"], a["action"]) for a in actions] == [
+            ("system", "SLA breached: low tickets are due within 168h")
+        ]
@@ -0,0 +1,220 @@
+"""Tests for filtered and sorted ticket lists, /tickets/mine and the indexes behind them"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.core.maintenance import reconcile_ticket_counters
+from app.core.security import create_access_token
+from app.models.ticket import Ticket, TicketPriority, TicketStatus
+from app.models.user import User
+from app.repositories.ticket_repository import (
+    SORTS,
+    TicketListFilter,
+    TicketRepository,
+    list_statement,
+)
+from tests.conftest import TestSessionLocal, test_engine
+
+START = datetime(2024, 1, 1)
+CRITERIA = {
+    "statuses": (TicketStatus.OPEN, TicketStatus.ON_HOLD),
+    "priorities": (TicketPriority.HIGH,),
+    "assigned_to_id": 1,
+    "involving_user_id": 1,
+    "created_since": START,
+    "created_before": START,
+    "updated_since": START,
+    "updated_before": START,
+}
+# An unfiltered list walks the sort's own index; priority order is the exception, as it ranks what a filter selects
+COMBINATIONS = [(name,) for name in CRITERIA] + [
+    ("statuses", "assigned_to_id"),
+    ("statuses", "priorities"),
+    ("involving_user_id", "statuses"),
+    ("priorities", "updated_since"),
+    ("assigned_to_id", "created_since", "created_before"),
+]
+
+
+@pytest.fixture
+async def other_user(db_session):
+    user = User(username="other", email="other@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+async def tickets(db_session, test_user, other_user):
+    specs = [
+        (TicketStatus.OPEN, TicketPriority.LOW, test_user.id, other_user.id),
+        (TicketStatus.OPEN, TicketPriority.CRITICAL, other_user.id, other_user.id),
+        (TicketStatus.IN_PROGRESS, TicketPriority.HIGH, test_user.id, test_user.id),
+        (TicketStatus.ON_HOLD, TicketPriority.MEDIUM, None, test_user.id),
+        (TicketStatus.CLOSED, TicketPriority.CRITICAL, other_user.id, other_user.id),
+        (TicketStatus.OPEN, TicketPriority.HIGH, None, other_user.id),
+    ]
+    rows = [
+        Ticket(
+            summary=f"T{i}",
+            status=status,
+            priority=priority,
+            assigned_to_id=assignee,
+            created_by_id=creator,
+            created_at=START + timedelta(days=i),
+            updated_at=START + timedelta(days=10 - i),
+        )
+        for i, (status, priority, assignee, creator) in enumerate(specs)
+    ]
+    db_session.add_all(rows)
+    await db_session.commit()
+    await reconcile_ticket_counters(TestSessionLocal)
+    return [ticket.id for ticket in rows]
+
+
+def summaries(response) -> list:
+    assert response.status_code == 200, response.text
+    return [item["summary"] for item in response.json()["items"]]
+
+
+@pytest.mark.asyncio
+class TestTicketFilters:
+    async def test_combined_filters(self, client, auth_headers, tickets, test_user):
+        url = "/api/v1/tickets/"
+        response = await client.get(
+            url, params=[("status", "open"), ("status", "on_hold")], headers=auth_headers
+        )
+        assert summaries(response) == ["T5", "T3", "T1", "T0"]
+        assert response.json()["total"] == 4
+        response = await client.get(
+            url,
+            params=[("status", "open"), ("priority", "high"), ("priority", "critical")],
+            headers=auth_headers,
+        )
+        assert summaries(response) == ["T5", "T1"]
+        assert response.json()["total"] == 2
+        response = await client.get(
+            url,
+            params={
+                "assigned_to_id": test_user.id,
+                "created_since": (START + timedelta(days=1)).isoformat(),
+            },
+            headers=auth_headers,
+        )
+        assert summaries(response) == ["T2"]
+        response = await client.get(
+            url,
+            params={"updated_before": (START + timedelta(days=8)).isoformat(), "order": "asc"},
+            headers=auth_headers,
+        )
+        assert summaries(response) == ["T3", "T4", "T5"]
+
+    async def test_sorts(self, client, auth_headers, tickets):
+        url = "/api/v1/tickets/"
+        assert summaries(
+            await client.get(url, params={"sort": "updated_at"}, headers=auth_headers)
+        ) == ["T0", "T1", "T2", "T3", "T4", "T5"]
+        # Most urgent first, newest first within a priority
+        assert summaries(
+            await client.get(url, params={"sort": "priority"}, headers=auth_headers)
+        ) == ["T4", "T1", "T5", "T2", "T3", "T0"]
+        assert summaries(
+            await client.get(url, params={"sort": "priority", "order": "asc"}, headers=auth_headers)
+        ) == ["T0", "T3", "T2", "T5", "T1", "T4"]
+        assert (
+            await client.get(url, params={"sort": "summary"}, headers=auth_headers)
+        ).status_code == 422
+
+    async def test_cursor_follows_sort(self, client, auth_headers, tickets):
+        for sort in SORTS:
+            full = summaries(
+                await client.get("/api/v1/tickets/", params={"sort": sort}, headers=auth_headers)
+            )
+            seen, cursor = [], None
+            while True:
+                params = {"sort": sort, "page_size": 4, **({"cursor": cursor} if cursor else {})}
+                response = await client.get("/api/v1/tickets/", params=params, headers=auth_headers)
+                seen += summaries(response)
+                cursor = response.json()["next_cursor"]
+                if not cursor:
+                    break
+            assert seen == full
+        response = await client.get(
+            "/api/v1/tickets/", params={"sort": "priority", "page_size": 4}, headers=auth_headers
+        )
+        response = await client.get(
+            "/api/v1/tickets/",
+            params={"sort": "created_at", "cursor": response.json()["next_cursor"]},
+            headers=auth_headers,
+        )
+        assert response.status_code == 400
+
+    async def test_mine(self, client, auth_headers, tickets):
+        response = await client.get("/api/v1/tickets/mine", headers=auth_headers)
+        # Assigned to the caller (T0, T2) or created by them (T2, T3)
+        assert summaries(response) == ["T3", "T2", "T0"]
+        assert response.json()["total"] == 3
+        response = await client.get(
+            "/api/v1/tickets/mine", params={"status": "open"}, headers=auth_headers
+        )
+        assert summaries(response) == ["T0"]
+
+    async def test_mine_etag_is_per_user(self, client, auth_headers, tickets, other_user):
+        mine = await client.get("/api/v1/tickets/mine", headers=auth_headers)
+        assert (
+            await client.get(
+                "/api/v1/tickets/mine",
+                headers={**auth_headers, "If-None-Match": mine.headers["etag"]},
+            )
+        ).status_code == 304
+        other_headers = {
+            "Authorization": f"Bearer {create_access_token({'sub': other_user.username})}",
+            "If-None-Match": mine.headers["etag"],
+        }
+        response = await client.get("/api/v1/tickets/mine", headers=other_headers)
+        assert summaries(response) == ["T5", "T4", "T1", "T0"]
+
+    async def test_statement_shapes_are_reused(self):
+        one = list_statement(
+            TicketListFilter(statuses=(TicketStatus.OPEN,), assigned_to_id=1), keyset=False
+        )
+        many = list_statement(
+            TicketListFilter(statuses=(TicketStatus.OPEN, TicketStatus.CLOSED), assigned_to_id=7),
+            keyset=False,
+        )
+        assert one is many
+        assert (
+            list_statement(TicketListFilter(statuses=(TicketStatus.OPEN,)), keyset=False) is not one
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", SORTS)
+@pytest.mark.parametrize("names", COMBINATIONS, ids=["+".join(names) for names in COMBINATIONS])
+async def test_filters_use_an_index(db_session, names, sort):
+    filters = TicketListFilter(**{name: CRITERIA[name] for name in names}, sort=sort)
+    after = (1, START, 5) if sort == "priority" else (START, 5)
+    for keyset in (False, True):
+        captured = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany, captured=captured):
+            captured.append((statement, parameters))
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", listener)
+        try:
+            await TicketRepository(db_session).find(filters, after=after if keyset else None)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", listener)
+        statement, parameters = captured[-1]
+        connection = await db_session.connection()
+        plan = [
+            row[3]
+            for row in (
+                await connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+            ).all()
+        ]
+        # A bare "SCAN tickets" is a full table scan; every filter must narrow through an index
+        assert "SCAN tickets" not in plan, plan
+        assert any("USING INDEX" in step for step in plan), plan
@@ -1,6 +1,19 @@
 """Ticket tests"""
+
+import csv
+import io
+import json
+import re
+from datetime import datetime, timedelta
+
 import pytest
-from app.models.ticket import Ticket
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.maintenance import reconcile_ticket_counters
+from app.models.ticket import Ticket, TicketStatus
+from app.repositories.ticket_counter_repository import TicketCounterRepository
+from tests.conftest import TestSessionLocal, test_engine
 
 @pytest.mark.asyncio
 class TestTickets:
@@ -22,3 +35,558 @@ class TestTickets:
         response = await client.get(f"/api/v1/tickets/{ticket.id}", headers=auth_headers)
         assert response.status_code == 200
         assert response.json()["id"] == ticket.id
+
+    async def test_cursor_pagination(self, client, auth_headers, db_session, test_user):
+        created = datetime(2024, 1, 1)
+        db_session.add_all(
+            [
+                Ticket(
+                    summary=f"T{i}",
+                    created_by_id=test_user.id,
+                    created_at=created + timedelta(minutes=i // 2),
+                )
+                for i in range(5)
+            ]
+        )
+        await db_session.commit()
+        response = await client.get(
+            "/api/v1/tickets/", params={"page_size": 2}, headers=auth_headers
+        )
+        seen = [t["id"] for t in response.json()["items"]]
+        cursor = response.json()["next_cursor"]
+        while cursor:
+            response = await client.get(
+                "/api/v1/tickets/", params={"page_size": 2, "cursor": cursor}, headers=auth_headers
+            )
+            assert response.json()["page"] is None
+            seen += [t["id"] for t in response.json()["items"]]
+            cursor = response.json()["next_cursor"]
+        assert len(seen) == len(set(seen)) == 5
+
+    async def test_invalid_cursor(self, client, auth_headers):
+        response = await client.get(
+            "/api/v1/tickets/open", params={"cursor": "not-a-cursor"}, headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    async def test_ticket_actions(self, client, auth_headers, db_session, test_user):
+        ticket = Ticket(summary="Test", created_by_id=test_user.id)
+        db_session.add(ticket)
+        await db_session.commit()
+        for text in ("First", "Second", "Third"):
+            response = await client.post(
+                f"/api/v1/tickets/{ticket.id}/actions", json={"action": text}, headers=auth_headers
+            )
+            assert response.status_code == 201
+        response = await client.get(
+            f"/api/v1/tickets/{ticket.id}/actions", params={"page_size": 2}, headers=auth_headers
+        )
+        assert response.json()["total"] == 3
+        assert [a["action"] for a in response.json()["items"]] == ["First", "Second"]
+        assert (await client.get(f"/api/v1/tickets/{ticket.id}", headers=auth_headers)).json()[
+            "actions"
+        ] is None
+        response = await client.get(
+            f"/api/v1/tickets/{ticket.id}", params={"include_actions": True}, headers=auth_headers
+        )
+        assert len(response.json()["actions"]) == 3
+
+    async def test_status_change_logs_action(self, client, auth_headers):
+        ticket_id = (
+            await client.post("/api/v1/tickets/", json={"summary": "Test"}, headers=auth_headers)
+        ).json()["id"]
+        await client.put(
+            f"/api/v1/tickets/{ticket_id}", json={"status": "closed"}, headers=auth_headers
+        )
+        response = await client.get(f"/api/v1/tickets/{ticket_id}/actions", headers=auth_headers)
+        assert response.json()["items"][0]["action"] == "Status changed to closed"
+
+    async def test_bulk_create_json_array(self, client, auth_headers):
+        rows = [{"summary": "One"}, {"summary": ""}, {"summary": "Three", "priority": "high"}]
+        response = await client.post("/api/v1/tickets/bulk", json=rows, headers=auth_headers)
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["created"], body["failed"]) == (2, 1)
+        assert body["results"][1]["error"] and body["results"][1]["id"] is None
+        ticket = (
+            await client.get(f"/api/v1/tickets/{body['results'][2]['id']}", headers=auth_headers)
+        ).json()
+        assert ticket["summary"] == "Three" and ticket["priority"] == "high"
+
+    async def test_bulk_create_ndjson(self, client, auth_headers):
+        body = "\n".join(['{"summary": "A"}', "not json", '{"summary": "B"}']) + "\n"
+        response = await client.post(
+            "/api/v1/tickets/bulk",
+            content=body,
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        )
+        assert [r["error"] is None for r in response.json()["results"]] == [True, False, True]
+
+    async def test_export_ndjson_updated_since(self, client, auth_headers, db_session, test_user):
+        db_session.add_all(
+            [
+                Ticket(summary="Old", created_by_id=test_user.id, updated_at=datetime(2024, 1, 1)),
+                Ticket(summary="New", created_by_id=test_user.id, updated_at=datetime(2024, 6, 1)),
+            ]
+        )
+        await db_session.commit()
+        response = await client.get(
+            "/api/v1/tickets/export",
+            params={"updated_since": "2024-03-01T00:00:00"},
+            headers=auth_headers,
+        )
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["summary"] for row in rows] == ["New"]
+
+    async def test_export_matches_the_list(self, client, auth_headers):
+        rows = [
+            {"summary": f"T{i}", "priority": priority}
+            for i, priority in enumerate(["low", "high", "critical", "high"])
+        ]
+        await client.post("/api/v1/tickets/bulk", json=rows, headers=auth_headers)
+        params = {"priority": ["high", "critical"], "sort": "priority", "order": "desc"}
+        listed = (await client.get("/api/v1/tickets/", params=params, headers=auth_headers)).json()
+        exported = await client.get("/api/v1/tickets/export", params=params, headers=auth_headers)
+        assert [json.loads(line)["id"] for line in exported.text.splitlines()] == [
+            ticket["id"] for ticket in listed["items"]
+        ]
+        assert len(listed["items"]) == 3
+
+    async def test_export_csv(self, client, auth_headers):
+        await client.post(
+            "/api/v1/tickets/", json={"summary": "Test, with comma"}, headers=auth_headers
+        )
+        response = await client.get(
+            "/api/v1/tickets/export", params={"format": "csv"}, headers=auth_headers
+        )
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0][:2] == ["id", "summary"]
+        assert rows[1][1] == "Test, with comma"
+
+    async def test_stats_track_changes(self, client, auth_headers, test_user):
+        ids = [
+            (
+                await client.post(
+                    "/api/v1/tickets/", json={"summary": f"T{i}"}, headers=auth_headers
+                )
+            ).json()["id"]
+            for i in range(3)
+        ]
+        await client.post(
+            "/api/v1/tickets/bulk",
+            json=[{"summary": "Bulk", "status": "on_hold"}],
+            headers=auth_headers,
+        )
+        await client.put(
+            f"/api/v1/tickets/{ids[0]}",
+            json={"status": "in_progress", "assigned_to_id": test_user.id},
+            headers=auth_headers,
+        )
+        await client.delete(f"/api/v1/tickets/{ids[1]}", headers=auth_headers)
+        stats = (await client.get("/api/v1/tickets/stats", headers=auth_headers)).json()
+        assert stats["total"] == 3
+        assert stats["by_status"] == {"open": 1, "in_progress": 1, "on_hold": 1}
+        assert stats["by_assignee"] == {str(test_user.id): 1, "none": 2}
+        assert (await client.get("/api/v1/tickets/open", headers=auth_headers)).json()["total"] == 2
+
+    async def test_stats_track_changes_without_native_upsert(
+        self, client, auth_headers, test_user, monkeypatch
+    ):
+        # Dialects other than SQLite and MySQL fall back to UPDATE, then INSERT in a savepoint
+        monkeypatch.setattr(
+            TicketCounterRepository, "_upsert", lambda self, scope, key, delta: None
+        )
+        await self.test_stats_track_changes(client, auth_headers, test_user)
+
+    async def test_reconcile_counters(self, client, auth_headers, db_session, test_user):
+        db_session.add_all(
+            [
+                Ticket(summary="Direct", created_by_id=test_user.id),
+                Ticket(summary="Direct", status=TicketStatus.CLOSED, created_by_id=test_user.id),
+            ]
+        )
+        await db_session.commit()
+        assert (await client.get("/api/v1/tickets/stats", headers=auth_headers)).json()[
+            "total"
+        ] == 0
+        await reconcile_ticket_counters(TestSessionLocal)
+        stats = (await client.get("/api/v1/tickets/stats", headers=auth_headers)).json()
+        assert stats["by_status"] == {"open": 1, "closed": 1}
+
+    async def test_search(self, client, auth_headers):
+        for summary, description, priority in [
+            ("Printer jammed", "Paper stuck in tray", "high"),
+            ("VPN down", "Cannot reach printer share", "low"),
+            ("Email bounce", None, "high"),
+        ]:
+            await client.post(
+                "/api/v1/tickets/",
+                json={"summary": summary, "description": description, "priority": priority},
+                headers=auth_headers,
+            )
+        response = await client.get(
+            "/api/v1/tickets/search", params={"q": "printer"}, headers=auth_headers
+        )
+        assert response.json()["total"] == 2
+        assert response.json()["items"][0]["summary"] == "Printer jammed"
+        response = await client.get(
+            "/api/v1/tickets/search",
+            params={"q": "printer", "priority": "low"},
+            headers=auth_headers,
+        )
+        assert [t["summary"] for t in response.json()["items"]] == ["VPN down"]
+
+    async def test_search_follows_updates_and_deletes(self, client, auth_headers):
+        ticket_id = (
+            await client.post(
+                "/api/v1/tickets/", json={"summary": "Laptop broken"}, headers=auth_headers
+            )
+        ).json()["id"]
+        await client.put(
+            f"/api/v1/tickets/{ticket_id}",
+            json={"summary": "Monitor flickering"},
+            headers=auth_headers,
+        )
+        assert (
+            await client.get("/api/v1/tickets/search", params={"q": "laptop"}, headers=auth_headers)
+        ).json()["total"] == 0
+        assert (
+            await client.get(
+                "/api/v1/tickets/search", params={"q": "monitor"}, headers=auth_headers
+            )
+        ).json()["total"] == 1
+        await client.delete(f"/api/v1/tickets/{ticket_id}", headers=auth_headers)
+        assert (
+            await client.get(
+                "/api/v1/tickets/search", params={"q": "monitor"}, headers=auth_headers
+            )
+        ).json()["total"] == 0
+
+    async def test_search_escapes_query_syntax(self, client, auth_headers):
+        response = await client.get(
+            "/api/v1/tickets/search", params={"q": 'printer" OR NEAR('}, headers=auth_headers
+        )
+        assert response.status_code == 200
+
+    async def test_search_needs_a_term(self, client, auth_headers):
+        for q in (" ", "\t\n"):
+            response = await client.get(
+                "/api/v1/tickets/search", params={"q": q}, headers=auth_headers
+            )
+            assert response.status_code == 400
+
+    async def test_ticket_etag(self, client, auth_headers):
+        ticket_id = (
+            await client.post("/api/v1/tickets/", json={"summary": "Test"}, headers=auth_headers)
+        ).json()["id"]
+        etag = (await client.get(f"/api/v1/tickets/{ticket_id}", headers=auth_headers)).headers[
+            "ETag"
+        ]
+        response = await client.get(
+            f"/api/v1/tickets/{ticket_id}", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        await client.put(
+            f"/api/v1/tickets/{ticket_id}", json={"priority": "high"}, headers=auth_headers
+        )
+        response = await client.get(
+            f"/api/v1/tickets/{ticket_id}", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    async def test_list_etag(self, client, auth_headers):
+        await client.post("/api/v1/tickets/", json={"summary": "Test"}, headers=auth_headers)
+        etag = (await client.get("/api/v1/tickets/open", headers=auth_headers)).headers["ETag"]
+        assert (
+            await client.get(
+                "/api/v1/tickets/open", headers={**auth_headers, "If-None-Match": etag}
+            )
+        ).status_code == 304
+        assert (
+            await client.get(
+                "/api/v1/tickets/open",
+                params={"page_size": 5},
+                headers={**auth_headers, "If-None-Match": etag},
+            )
+        ).status_code == 200
+        await client.post("/api/v1/tickets/", json={"summary": "Another"}, headers=auth_headers)
+        assert (
+            await client.get(
+                "/api/v1/tickets/open", headers={**auth_headers, "If-None-Match": etag}
+            )
+        ).status_code == 200
+
+    async def test_fast_list_serialization_matches_schema(self, client, auth_headers, monkeypatch):
+        await client.post(
+            "/api/v1/tickets/",
+            json={"summary": "Test", "description": "Body", "priority": "critical"},
+            headers=auth_headers,
+        )
+        fast = await client.get("/api/v1/tickets/", headers=auth_headers)
+        monkeypatch.setattr(settings, "FAST_LIST_SERIALIZATION", False)
+        slow = await client.get("/api/v1/tickets/", headers=auth_headers)
+        assert fast.content == slow.content
+        assert fast.headers["ETag"] == slow.headers["ETag"]
+
+    async def test_expand_users_constant_queries(self, client, auth_headers, db_session, test_user):
+        db_session.add_all(
+            [
+                Ticket(summary=f"T{i}", created_by_id=test_user.id, assigned_to_id=test_user.id)
+                for i in range(12)
+            ]
+        )
+        await db_session.commit()
+        await client.get("/api/v1/auth/me", headers=auth_headers)
+        counts = []
+        for page_size in (2, 12):
+            queries = []
+
+            def listener(*args, queries=queries):
+                queries.append(args[2])
+
+            event.listen(test_engine.sync_engine, "before_cursor_execute", listener)
+            try:
+                response = await client.get(
+                    "/api/v1/tickets/",
+                    params={"page_size": page_size, "expand": "assigned_to,created_by"},
+                    headers=auth_headers,
+                )
+            finally:
+                event.remove(test_engine.sync_engine, "before_cursor_execute", listener)
+            assert len(response.json()["items"]) == page_size
+            assert response.json()["items"][0]["assigned_to"]["username"] == "testuser"
+            counts.append(len(queries))
+        assert counts[0] == counts[1]
+
+    async def test_expand_detail_and_unknown(self, client, auth_headers, db_session, test_user):
+        ticket = Ticket(summary="Test", created_by_id=test_user.id)
+        db_session.add(ticket)
+        await db_session.commit()
+        body = (
+            await client.get(
+                f"/api/v1/tickets/{ticket.id}",
+                params={"expand": "created_by"},
+                headers=auth_headers,
+            )
+        ).json()
+        assert body["created_by"] == {
+            "id": test_user.id,
+            "username": "testuser",
+            "full_name": "Test User",
+        }
+        assert body["assigned_to"] is None
+        assert (
+            await client.get(
+                f"/api/v1/tickets/{ticket.id}", params={"expand": "secrets"}, headers=auth_headers
+            )
+        ).status_code == 400
+
+    async def test_patch_with_if_match(self, client, auth_headers):
+        ticket_id = (
+            await client.post("/api/v1/tickets/", json={"summary": "Test"}, headers=auth_headers)
+        ).json()["id"]
+        etag = (await client.get(f"/api/v1/tickets/{ticket_id}", headers=auth_headers)).headers[
+            "ETag"
+        ]
+        response = await client.patch(
+            f"/api/v1/tickets/{ticket_id}",
+            json={"status": "closed"},
+            headers={**auth_headers, "If-Match": etag},
+        )
+        assert response.status_code == 200
+        assert response.json()["status"] == "closed" and response.json()["closed_at"]
+        assert response.headers["ETag"] != etag
+        stale = await client.patch(
+            f"/api/v1/tickets/{ticket_id}",
+            json={"summary": "Lost update"},
+            headers={**auth_headers, "If-Match": etag},
+        )
+        assert stale.status_code == 409
+        actions = (
+            await client.get(f"/api/v1/tickets/{ticket_id}/actions", headers=auth_headers)
+        ).json()["items"]
+        assert [a["action"] for a in actions] == ["Status changed to closed"]
+        stats = (await client.get("/api/v1/tickets/stats", headers=auth_headers)).json()
+        assert stats["by_status"] == {"closed": 1}
+
+    async def test_patch_missing_ticket(self, client, auth_headers):
+        assert (
+            await client.patch(
+                "/api/v1/tickets/999", json={"summary": "Nope"}, headers=auth_headers
+            )
+        ).status_code == 404
+
+    async def test_patch_rejects_null_for_required_fields(self, client, auth_headers):
+        ticket_id = (
+            await client.post("/api/v1/tickets/", json={"summary": "Keep"}, headers=auth_headers)
+        ).json()["id"]
+        for field in ("summary", "status", "priority"):
+            response = await client.patch(
+                f"/api/v1/tickets/{ticket_id}", json={field: None}, headers=auth_headers
+            )
+            assert response.status_code == 422, field
+        # Nullable fields may still be cleared
+        assert (
+            await client.patch(
+                f"/api/v1/tickets/{ticket_id}",
+                json={"description": None, "assigned_to_id": None},
+                headers=auth_headers,
+            )
+        ).status_code == 200
+
+    async def test_bulk_update_rejects_null_status_and_priority(self, client, auth_headers):
+        await client.post("/api/v1/tickets/", json={"summary": "Keep"}, headers=auth_headers)
+        for field in ("status", "priority"):
+            response = await client.post(
+                "/api/v1/tickets/bulk-update",
+                json={"filter": {"status": "open"}, "changes": {field: None}},
+                headers=auth_headers,
+            )
+            assert response.status_code == 422, field
+        response = await client.post(
+            "/api/v1/tickets/bulk-update",
+            json={"filter": {"status": "open"}, "changes": {"assigned_to_id": None}},
+            headers=auth_headers,
+        )
+        assert response.json() == {"affected": 1}
+
+    async def test_bulk_update_by_filter(self, client, auth_headers, monkeypatch):
+        monkeypatch.setattr(settings, "BULK_MUTATION_CHUNK_SIZE", 2)
+        rows = [{"summary": f"T{i}", "priority": "high" if i < 5 else "low"} for i in range(7)]
+        await client.post("/api/v1/tickets/bulk", json=rows, headers=auth_headers)
+        response = await client.post(
+            "/api/v1/tickets/bulk-update",
+            json={"filter": {"priority": "high"}, "changes": {"status": "closed"}},
+            headers=auth_headers,
+        )
+        assert response.json() == {"affected": 5}
+        stats = (await client.get("/api/v1/tickets/stats", headers=auth_headers)).json()
+        assert stats["by_status"] == {"open": 2, "closed": 5}
+        closed = (
+            await client.get("/api/v1/tickets/", params={"status": "closed"}, headers=auth_headers)
+        ).json()["items"]
+        assert all(t["closed_at"] for t in closed)
+        actions = (
+            await client.get(f"/api/v1/tickets/{closed[0]['id']}/actions", headers=auth_headers)
+        ).json()["items"]
+        assert actions[0]["action"] == "Status changed to closed"
+
+    async def test_bulk_delete_by_ids(self, client, auth_headers):
+        ids = [
+            r["id"]
+            for r in (
+                await client.post(
+                    "/api/v1/tickets/bulk", json=[{"summary": "Printer"}] * 3, headers=auth_headers
+                )
+            ).json()["results"]
+        ]
+        response = await client.post(
+            "/api/v1/tickets/bulk-delete", json={"ids": ids[:2]}, headers=auth_headers
+        )
+        assert response.json() == {"affected": 2}
+        assert (await client.get("/api/v1/tickets/stats", headers=auth_headers)).json()[
+            "total"
+        ] == 1
+        assert (
+            await client.get(
+                "/api/v1/tickets/search", params={"q": "printer"}, headers=auth_headers
+            )
+        ).json()["total"] == 1
+
+    async def test_bulk_ids_are_bound_a_chunk_at_a_time(self, client, auth_headers, monkeypatch):
+        monkeypatch.setattr(settings, "BULK_MUTATION_CHUNK_SIZE", 2)
+        ids = [
+            r["id"]
+            for r in (
+                await client.post(
+                    "/api/v1/tickets/bulk", json=[{"summary": "Fan"}] * 5, headers=auth_headers
+                )
+            ).json()["results"]
+        ]
+        in_lists = []
+
+        def listener(*args, in_lists=in_lists):
+            in_lists.extend(group.count("?") for group in re.findall(r"IN \(([^)]*)\)", args[2]))
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", listener)
+        try:
+            response = await client.post(
+                "/api/v1/tickets/bulk-update",
+                json={"ids": ids, "changes": {"status": "closed"}},
+                headers=auth_headers,
+            )
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", listener)
+        assert response.json() == {"affected": 5}
+        assert in_lists and max(in_lists) == 2
+        monkeypatch.setattr(settings, "BULK_MUTATION_MAX_IDS", 4)
+        assert (
+            await client.post(
+                "/api/v1/tickets/bulk-delete", json={"ids": ids}, headers=auth_headers
+            )
+        ).status_code == 400
+
+    async def test_bulk_selection_validation(self, client, auth_headers):
+        assert (
+            await client.post(
+                "/api/v1/tickets/bulk-delete", json={"filter": {}}, headers=auth_headers
+            )
+        ).status_code == 422
+        assert (
+            await client.post(
+                "/api/v1/tickets/bulk-delete",
+                json={"ids": [1], "filter": {"status": "open"}},
+                headers=auth_headers,
+            )
+        ).status_code == 422
+
+    async def test_batch_get_in_request_order(self, client, auth_headers):
+        ids = [
+            r["id"]
+            for r in (
+                await client.post(
+                    "/api/v1/tickets/bulk",
+                    json=[{"summary": f"T{i}"} for i in range(3)],
+                    headers=auth_headers,
+                )
+            ).json()["results"]
+        ]
+        requested = [ids[2], 9999, ids[0], ids[2]]
+        body = (
+            await client.get(
+                "/api/v1/tickets/batch",
+                params={"ids": ",".join(map(str, requested))},
+                headers=auth_headers,
+            )
+        ).json()
+        assert [item["id"] for item in body["items"]] == requested
+        assert [item["ticket"]["summary"] if item["found"] else None for item in body["items"]] == [
+            "T2",
+            None,
+            "T0",
+            "T2",
+        ]
+        assert (body["found"], body["missing"]) == (3, [9999])
+        posted = await client.post(
+            "/api/v1/tickets/batch", json={"ids": requested}, headers=auth_headers
+        )
+        assert posted.json() == body
+
+    async def test_batch_get_limits(self, client, auth_headers, monkeypatch):
+        monkeypatch.setattr(settings, "BATCH_GET_MAX_IDS", 2)
+        assert (
+            await client.get("/api/v1/tickets/batch", params={"ids": "1,2,3"}, headers=auth_headers)
+        ).status_code == 400
+        assert (
+            await client.post(
+                "/api/v1/tickets/batch", json={"ids": [1, 2, 3]}, headers=auth_headers
+            )
+        ).status_code == 400
+        assert (
+            await client.get("/api/v1/tickets/batch", params={"ids": "1,x"}, headers=auth_headers)
+        ).status_code == 400
+        assert (
+            await client.post("/api/v1/tickets/batch", json={"ids": []}, headers=auth_headers)
+        ).status_code == 422